@@ -8,9 +8,11 @@ Adds:
 - If islands.F_max_by_wstar and islands.bundle_hist_by_wstar are present:
   - prints mean/median/IQR for F_max at each threshold
   - prints bundle_hist frequency per threshold
+- If islands.F_max_curve is present (full step curve F_max(w*) / N_bund(w*)):
+  - prints mean/median/IQR for F_max and mean N_bund at any thresholds given on the command line
 
 Usage:
-  python3 analysis/pathA_summary.py <run_root_dir>
+  python3 analysis/pathA_summary.py <run_root_dir> [w_star ...]
 """
 from __future__ import annotations
 
@@ -62,6 +64,12 @@ def quantile(xs, q):
     return xs[lo] * (1 - w) + xs[hi] * w
 
 
+def curve_at(curve, w_star):
+    """(F_max, N_bund) of an islands.F_max_curve at threshold w_star (links need overlap > w_star)."""
+    k = sum(1 for b in curve["w"] if b > w_star)
+    return curve["F_max"][k], curve["N_bund"][k]
+
+
 def fmt(mu, sd, digits=3):
     if math.isnan(mu):
         return "nan"
@@ -69,9 +77,10 @@ def fmt(mu, sd, digits=3):
 
 
 def main():
-    if len(sys.argv) != 2:
-        raise SystemExit("Usage: python3 analysis/pathA_summary.py <run_root_dir>")
+    if len(sys.argv) < 2:
+        raise SystemExit("Usage: python3 analysis/pathA_summary.py <run_root_dir> [w_star ...]")
     root = Path(sys.argv[1])
+    w_query = [float(x) for x in sys.argv[2:]]
     ms = load_metrics(root)
 
     Sperc, Sj, hub, maxdeg, clust, Fmax = [], [], [], [], [], []
@@ -80,6 +89,8 @@ def main():
     # Multi-wstar collectors
     f_by_w = defaultdict(list)  # w -> list of F_max
     bh_by_w = defaultdict(Counter)  # w -> Counter of bundle_hist json strings
+    curve_f = defaultdict(list)  # queried w -> list of F_max read from F_max_curve
+    curve_nb = defaultdict(list)  # queried w -> list of N_bund
 
     for m in ms:
         sp = m.get("space_state", {})
@@ -115,6 +126,12 @@ def main():
                 for w, bhdict in bws.items():
                     if isinstance(bhdict, dict):
                         bh_by_w[w][json.dumps(bhdict, sort_keys=True)] += 1
+            curve = isl.get("F_max_curve")
+            if isinstance(curve, dict):
+                for w in w_query:
+                    f, nb = curve_at(curve, w)
+                    curve_f[w].append(f)
+                    curve_nb[w].append(nb)
 
     n = len(ms)
     print(f"count: {n}")
@@ -167,6 +184,17 @@ def main():
             for k, c in bh_by_w[w].most_common():
                 print(f"    {k}: {c}")
 
+    if w_query:
+        print()
+        print("F_max_curve at requested thresholds:")
+        for w in sorted(w_query):
+            if not curve_f[w]:
+                print(f"  w={w:g}: (no F_max_curve present)")
+                continue
+            mu, sd = mean_std(curve_f[w]); med = median(curve_f[w]); q1 = quantile(curve_f[w],0.25); q3 = quantile(curve_f[w],0.75)
+            nb_mu, nb_sd = mean_std(curve_nb[w])
+            print(f"  w={w:g}: F_max mean±std {fmt(mu,sd)}; median {med:.3g} [Q1,Q3]=[{q1:.3g},{q3:.3g}]; N_bund mean±std {fmt(nb_mu,nb_sd)}")
+
 
 if __name__ == "__main__":
     main()
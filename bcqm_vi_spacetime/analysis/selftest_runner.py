@@ -8,7 +8,7 @@ Run from Desktop:
   python3 bcqm_vi_spacetime/analysis/selftest_runner.py
 
 It will:
-- run 4 configs (nospace, space-on, glueoff+space, geometry)
+- run 5 configs (nospace, space-on, glueoff+space, geometry, batched nospace)
 - write a consolidated log to outputs/analysis/<timestamp>_selftest.txt
 - exit nonzero if any checks fail
 """
@@ -58,6 +58,794 @@ def assert_true(cond: bool, msg: str, logfile: Path) -> None:
     logfile.write_text(logfile.read_text(encoding="utf-8") + f"OK: {msg}\n", encoding="utf-8")
 
 
+def _metrics_by_name(out_dir: Path) -> dict:
+    out = {}
+    for p in sorted(out_dir.rglob("RUN_METRICS_*.json")):
+        d = read_json(p)
+        d.pop("elapsed_seconds", None)
+        out[p.name] = d
+    return out
+
+
+def _grow_window_graph(seed: int, W: int, N: int, p_new: float, ticks: int, domain=0,
+                       evict_every: int = 0, evict_at: int = 0, hold=(0, 0), g=None):
+    """
+    Random growth of an empty event graph (g, or a new EventGraph) for the window-structure
+    checks, from N frontiers created at t = 0; yields (t, g, frontiers, nxt) once
+    the tick's edges frontiers[i] -> nxt[i] are in the graph. Each frontier steps to a new event
+    with probability p_new, else to a uniform pick from v_active(t, W, frontiers) (a new event
+    instead of itself); frontier 0 stays put, without an edge, for hold[0] <= t < hold[1]. After
+    the yield frontiers become nxt and, with evict_every, events older than t - W are evicted at
+    t % evict_every == evict_at.
+    """
+    import random
+    from bcqm_vi_spacetime.event_graph import EventGraph
+
+    rnd = random.Random(seed)
+    if g is None:
+        g = EventGraph()
+    frontiers = [g.new_event(0, domain=domain) for _ in range(N)]
+    for t in range(ticks):
+        pick = list(g.v_active(t, W, frontiers))
+        nxt = [g.new_event(t + 1) if rnd.random() < p_new else rnd.choice(pick) for _ in frontiers]
+        nxt = [e if e != f else g.new_event(t + 1) for e, f in zip(nxt, frontiers)]
+        if hold[0] <= t < hold[1]:
+            nxt[0] = frontiers[0]
+        for f, e in zip(frontiers, nxt):
+            if e != f:
+                g.add_edge(f, e, t + 1)
+        yield t, g, frontiers, nxt
+        frontiers = nxt
+        if evict_every and t % evict_every == evict_at:
+            g.evict(t - W, frontiers)
+
+
+def check_sweep_parity(log: Path) -> None:
+    """Vectorised sweep over mixed (W_coh, N, n, seed) must reproduce the per-run engine exactly."""
+    import copy
+    import tempfile
+    import yaml
+    from bcqm_vi_spacetime.runner import run_from_config, sweep_from_configs
+
+    base = yaml.safe_load(Path("configs/selftests/selftest_vglue_nospace.yml").read_text(encoding="utf-8"))
+    base.update({"sizes": [2, 4, 5], "seeds": [11, 12], "scan": {"n_values": [0.0, 0.5]},
+                 "steps_total": 300, "burn_in_epochs": 50, "measure_epochs": 250})
+    with tempfile.TemporaryDirectory() as tmp:
+        cfgs = []
+        for W in (20, 50):
+            c = copy.deepcopy(base)
+            c["W_coh"] = W
+            c["experiment_id"] = f"selftest_sweep_W{W}"
+            c["output"]["out_dir"] = str(Path(tmp) / "single" / f"W{W}")
+            cfgs.append(c)
+            run_from_config(c)
+        swept = copy.deepcopy(cfgs)
+        for c in swept:
+            c["output"]["out_dir"] = c["output"]["out_dir"].replace("single", "sweep")
+        sweep_from_configs(swept)
+        a = _metrics_by_name(Path(tmp) / "single")
+        b = _metrics_by_name(Path(tmp) / "sweep")
+    assert_true(len(a) == 24 and a == b, "vectorised sweep (W_coh, N, n, seed) identical to per-run engine", log)
+
+
+def check_blocked_rng(log: Path) -> None:
+    """Layout-v1 block streams leave uniform-only (nospace) runs bit-identical to the legacy stream."""
+    import copy
+    import tempfile
+    import yaml
+    from bcqm_vi_spacetime.runner import run_from_config
+
+    base = yaml.safe_load(Path("configs/selftests/selftest_vglue_nospace.yml").read_text(encoding="utf-8"))
+    with tempfile.TemporaryDirectory() as tmp:
+        out = {}
+        for tag, rng in (("legacy", {"mode": "legacy"}), ("blocked", {"mode": "blocked", "block_ticks": 3})):
+            c = copy.deepcopy(base)
+            c["engine"]["rng"] = rng
+            c["output"]["out_dir"] = str(Path(tmp) / tag)
+            run_from_config(c)
+            out[tag] = _metrics_by_name(Path(tmp) / tag)
+    assert_true(len(out["legacy"]) == 1 and out["legacy"] == out["blocked"],
+                "blocked RNG streams (layout v1) reproduce legacy nospace run", log)
+
+
+def check_fused_parity(log: Path) -> None:
+    """Fused glue step must reproduce the ancestor kernel sequence tick for tick (fixed seed)."""
+    import numpy as np
+    from bcqm_vi_spacetime.engine_vglue import _load_v_blocks, _compute_q_base, _ancestor_glue_step
+    from bcqm_vi_spacetime.glue_dynamics import initialise_cadence
+    from bcqm_vi_spacetime.kernels_fused import FusedWorkspace, fused_glue_step
+    from bcqm_vi_spacetime.state import ThreadState, BundleState
+
+    v_config = {
+        "hop_coherence": {"form": "power_law", "alpha": 1.0, "k_prefactor": 2.0},
+        "shared_bias": {"enabled": True, "lambda_bias": 0.05},
+        "phase_lock": {"enabled": True, "lambda_phase": 0.25, "omega_0": 0.1, "noise_sigma": 0.05},
+        "domains": {"enabled": True, "n_initial_domains": 3, "lambda_domain": 0.25},
+        "cadence": {"enabled": True, "distribution": "lognormal", "mean_T": 1.0, "sigma_T": 0.2,
+                    "lambda_cadence": 0.15},
+    }
+    N = 8
+    traj = {}
+    for backend in ("ancestor", "fused"):
+        b = _load_v_blocks({"provenance": {"v_config": v_config}}, 0.0)
+        b["hop"].q_base = _compute_q_base(b["hop"], 50)
+        np.random.seed(7)  # ancestor domain kernel draws from the global stream
+        rng = np.random.default_rng(2024)
+        th = ThreadState(v=rng.choice([-1.0, 1.0], size=N), theta=rng.uniform(0.0, 2.0 * np.pi, size=N),
+                         domain=rng.integers(0, 3, size=N, endpoint=False), history_v=None)
+        initialise_cadence(rng, th, b["cadence"])
+        bundle = BundleState(X=0.0, m=float(np.mean(th.v)),
+                             theta_mean=float(np.angle(np.mean(np.exp(1j * th.theta)))))
+        ws = FusedWorkspace.for_run(th, bundle, b["domains"]) if backend == "fused" else None
+        rows = []
+        for _ in range(500):
+            args = (b["hop"], b["shared"], b["phase"], b["domains"], b["cadence"])
+            if ws is None:
+                _ancestor_glue_step(rng, th, bundle, *args)
+            else:
+                fused_glue_step(rng, th, bundle, ws, *args)
+            rows.append(np.concatenate([th.v, th.theta, th.T, th.phi, th.active,
+                                        [bundle.m, bundle.theta_mean, bundle.X]]))
+        traj[backend] = np.array(rows)
+    assert_true(np.array_equal(traj["ancestor"], traj["fused"]),
+                "fused glue kernel trajectory identical to ancestor kernels (500 ticks)", log)
+
+
+def check_streaming_metrics(log: Path) -> None:
+    """Streaming lockstep accumulators agree with the batch FFT path within rounding tolerance."""
+    import copy
+    import tempfile
+    import numpy as np
+    import yaml
+    from bcqm_vi_spacetime.metrics import StreamingLockstepMetrics, compute_lockstep_metrics
+    from bcqm_vi_spacetime.metrics_v_ancestor import _autocorrelation
+    from bcqm_vi_spacetime.runner import run_from_config
+
+    # Offset AR(1) series, two rows, chunk boundaries not aligned with max_lag.
+    rng = np.random.default_rng(5)
+    n = 6000
+    x = np.empty((2, n))
+    x[:, 0] = 0.7
+    eps = 0.05 * rng.normal(size=(2, n))
+    for t in range(1, n):
+        x[:, t] = 0.7 + 0.95 * (x[:, t - 1] - 0.7) + eps[:, t]
+    keys = ("Q_clock", "ell_lock", "L_inst")
+    for max_lag in (n, 400):
+        s = StreamingLockstepMetrics(rows=2, max_lag=max_lag, chunk=777)
+        for t in range(n):
+            s.push(x[:, t], x[:, t])
+        for r in (0, 1):
+            ref = compute_lockstep_metrics(x[r:r + 1], x[r:r + 1])
+            ref["ell_lock"] = float(np.sum(np.maximum(_autocorrelation(x[r])[:max_lag + 1], 0.0)))
+            got = s.result(r)
+            assert_true(all(np.isclose(got[k], ref[k], rtol=1e-9, atol=1e-12) for k in keys),
+                        f"streaming lockstep metrics match batch FFT (max_lag={max_lag}, row {r})", log)
+        ref = compute_lockstep_metrics(x, x) if max_lag >= n else None
+        if ref is not None:
+            got = s.result()
+            assert_true(all(np.isclose(got[k], ref[k], rtol=1e-9, atol=1e-12) for k in keys),
+                        "streaming lockstep metrics match batch FFT (ensemble)", log)
+
+    # End to end: nospace run with max_lag >= T_eff.
+    base = yaml.safe_load(Path("configs/selftests/selftest_vglue_nospace.yml").read_text(encoding="utf-8"))
+    with tempfile.TemporaryDirectory() as tmp:
+        out = {}
+        for tag, mcfg in (("batch", {"mode": "batch"}), ("streaming", {"mode": "streaming", "max_lag": 1000, "chunk": 64})):
+            c = copy.deepcopy(base)
+            c["engine"]["metrics"] = mcfg
+            c["output"]["out_dir"] = str(Path(tmp) / tag)
+            run_from_config(c)
+            out[tag] = _metrics_by_name(Path(tmp) / tag)
+    ok = len(out["batch"]) == 1 and out["batch"].keys() == out["streaming"].keys()
+    for name in out["batch"]:
+        a, b = out["batch"][name], out["streaming"][name]
+        ok = ok and all(np.isclose(a[k], b[k], rtol=1e-9, atol=1e-12) for k in keys)
+    assert_true(ok, "streaming metrics mode reproduces nospace run metrics", log)
+
+
+def check_checkpoint_resume(log: Path) -> None:
+    """Resuming from a mid-run checkpoint reproduces RUN_METRICS (v_glue space-on and scaffold)."""
+    import copy
+    import tempfile
+    import yaml
+    from bcqm_vi_spacetime.runner import run_from_config, resume_from_checkpoint
+
+    space_on = yaml.safe_load(Path("configs/selftests/selftest_space_on.yml").read_text(encoding="utf-8"))
+    scaffold = copy.deepcopy(space_on)
+    scaffold["engine"] = {"mode": "scaffold"}
+    for name, base in (("v_glue", space_on), ("scaffold", scaffold)):
+        with tempfile.TemporaryDirectory() as tmp:
+            ref = copy.deepcopy(base)
+            ref["output"]["out_dir"] = str(Path(tmp) / "ref")
+            run_from_config(ref)
+            c = copy.deepcopy(base)
+            c["output"]["out_dir"] = str(Path(tmp) / "ck")
+            c["engine"]["checkpoint"] = {"every": int(c["steps_total"]) // 2 - 1, "keep": True}
+            run_from_config(c)
+            for p in (Path(tmp) / "ck").glob("RUN_METRICS_*.json"):
+                p.unlink()
+            cks = sorted((Path(tmp) / "ck").glob("CHECKPOINT_*.npz"))
+            for ck in cks:
+                resume_from_checkpoint(ck)
+            a = _metrics_by_name(Path(tmp) / "ref")
+            b = _metrics_by_name(Path(tmp) / "ck")
+        assert_true(len(cks) == len(a) > 0 and a == b, f"checkpoint resume reproduces {name} RUN_METRICS", log)
+    # the vectorised engine cannot checkpoint: batched points with checkpoint.every run one by one
+    batched = yaml.safe_load(Path("configs/selftests/selftest_vglue_batch.yml").read_text(encoding="utf-8"))
+    batched["engine"]["checkpoint"] = {"every": 250, "keep": True}
+    with tempfile.TemporaryDirectory() as tmp:
+        batched["output"]["out_dir"] = tmp
+        run_from_config(batched)
+        cks = sorted(Path(tmp).glob("CHECKPOINT_*.npz"))
+        runs = _metrics_by_name(Path(tmp))
+    assert_true(len(cks) == len(runs) == 3, "batched config with engine.checkpoint writes a checkpoint per run", log)
+
+
+def check_active_window_index(log: Path) -> None:
+    """Recency-bucketed v_active returns the full-scan set, in the same iteration order."""
+    import random
+    from bcqm_vi_spacetime.event_graph import EventGraph
+
+    rnd = random.Random(3)
+    g = EventGraph()
+    frontiers = [g.new_event(0, domain=i % 2) for i in range(6)]
+    ok = True
+    for t in range(300):
+        frontiers = [g.new_event(t + 1) if rnd.random() < 0.4 else f for f in frontiers]
+        for W in (10, 10, 25):  # repeated and widened windows exercise the fallback path
+            got = list(g.v_active(t, W, frontiers))
+            ref = {eid for eid, nd in g.nodes.items() if nd.created_at >= t - W}
+            ref.update(frontiers)
+            ok = ok and got == list(ref)
+    assert_true(ok, "recency-bucketed v_active matches full scan (set and order)", log)
+
+
+def check_candidate_pools(log: Path) -> None:
+    """Per-domain candidate pools track v_active membership as the window slides."""
+    import random
+    from bcqm_vi_spacetime.event_graph import ActiveDomainPools, EventGraph
+
+    rnd = random.Random(4)
+    g = EventGraph()
+    frontiers = [g.new_event(0, domain=i % 3) for i in range(9)]
+    pools = ActiveDomainPools(g)
+    ok = True
+    for t in range(400):
+        pools.sync(t, 15, frontiers)
+        ok = ok and set(g._nbrs) == set(pools.all.items)  # sync expires the window adjacency too
+        active = g.v_active(t, 15, frontiers)
+        ok = ok and set(pools.all.items) == active and len(pools.all.items) == len(active)
+        for d in range(3):
+            ok = ok and set(pools.domain(d).items) == {e for e in active if g.nodes[e].domain == d}
+        pick = sorted(active)
+        frontiers = [g.new_event(t + 1, domain=i % 3) if rnd.random() < 0.5 else rnd.choice(pick)
+                     for i in range(9)]
+    assert_true(ok, "per-domain candidate pools match v_active membership (window adjacency expired with them)", log)
+
+
+def check_eviction(log: Path) -> None:
+    """Window eviction (drop / archive) leaves space-on RUN_METRICS unchanged apart from its own block."""
+    import copy
+    import tempfile
+    import yaml
+    from bcqm_vi_spacetime.runner import run_from_config
+
+    base = yaml.safe_load(Path("configs/selftests/selftest_space_on.yml").read_text(encoding="utf-8"))
+    base["output"]["write_timeseries"] = True
+    out = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in ("off", "drop", "archive"):
+            c = copy.deepcopy(base)
+            c["space"]["eviction"] = {"mode": mode, "every": 7}
+            c["output"]["out_dir"] = str(Path(tmp) / mode)
+            run_from_config(c)
+            out[mode] = _metrics_by_name(Path(tmp) / mode)
+            for d in out[mode].values():
+                d["space_state"].pop("eviction", None)
+        archived = len(list((Path(tmp) / "archive").glob("EVICTED_*_nodes.csv")))
+    assert_true(len(out["off"]) == 1 and out["off"] == out["drop"] == out["archive"] and archived == 1,
+                "EventGraph window eviction preserves space-on metrics", log)
+
+
+def check_graph_core(log: Path) -> None:
+    """Columnar EventGraph agrees with a plain dict / list model through growth, eviction and a round trip."""
+    import random
+    import numpy as np
+    from bcqm_vi_spacetime.event_graph import EventGraph
+
+    rnd = random.Random(5)
+    g = EventGraph()
+    ref_nodes = {}  # eid -> [created_at, domain, indeg, outdeg]
+    ref_edges = []
+    frontiers = []
+    for i in range(6):
+        frontiers.append(g.new_event(0, domain=i % 2))
+        ref_nodes[frontiers[-1]] = [0, i % 2, 0, 0]
+    for t in range(600):
+        nxt = []
+        for f in frontiers:
+            if rnd.random() < 0.5 or len(ref_nodes) < 2:
+                e = g.new_event(t + 1, domain=ref_nodes[f][1])
+                ref_nodes[e] = [t + 1, ref_nodes[f][1], 0, 0]
+            else:
+                e = rnd.choice(sorted(ref_nodes))
+            if e == f:
+                continue
+            g.add_edge(f, e, t + 1)
+            ref_edges.append((f, e, t + 1))
+            ref_nodes[f][3] += 1
+            ref_nodes[e][2] += 1
+            nxt.append(e)
+        frontiers = nxt or frontiers
+        if t % 50 == 49:
+            cutoff = t - 20
+            g.evict(cutoff, frontiers)
+            dead = {e for e, nd in ref_nodes.items() if nd[0] < cutoff and e not in frontiers}
+            ref_nodes = {e: nd for e, nd in ref_nodes.items() if e not in dead}
+            ref_edges = [(u, v, tt) for u, v, tt in ref_edges if u not in dead and v not in dead]
+    g2 = EventGraph.from_arrays({k: np.array(v) for k, v in g.to_arrays().items()})
+    ok = True
+    for h in (g, g2):
+        ok = ok and list(h.edges) == ref_edges
+        ok = ok and {e: [nd.created_at, nd.domain, nd.indeg, nd.outdeg] for e, nd in h.nodes.items()} == ref_nodes
+        active = h.v_active(600, 30, frontiers)
+        ok = ok and h.indegrees(active) == [ref_nodes[e][2] for e in active]
+    # edges to evicted or never-created events raise KeyError and leave the graph untouched
+    live = g.core.live_ids()
+    dead_id = int(live[0]) - 1
+    for us, vs in (([dead_id], [frontiers[0]]), ([frontiers[0]], [dead_id]), ([frontiers[0]], [g.core.n_nodes])):
+        for add in (lambda: g.add_edge(us[0], vs[0], 601), lambda: g.add_edges(us, vs, 601)):
+            try:
+                add()
+                ok = False
+            except KeyError:
+                pass
+    ok = ok and list(g.edges) == ref_edges
+    ok = ok and {e: [nd.created_at, nd.domain, nd.indeg, nd.outdeg] for e, nd in g.nodes.items()} == ref_nodes
+    small = EventGraph()
+    ids = [small.new_event(t) for t in range(10)]
+    small.evict(7, [ids[-1]])
+    for u, v in ((ids[0], ids[-1]), (ids[-1], 999)):
+        try:
+            small.add_edge(u, v, 9)
+            ok = False
+        except KeyError:
+            pass
+    ok = ok and small.core.n_edges == 0 and small.nodes[ids[-1]].indeg == 0
+    assert_true(ok, "columnar EventGraph matches dict/list reference (growth, eviction, checkpoint round trip)", log)
+
+
+def check_window_adjacency(log: Path) -> None:
+    """Incremental window adjacency gives the same neighbour sets (and order) as the full edge scan."""
+    ok = True
+    for t, g, _, frontiers in _grow_window_graph(6, 12, 5, 0.4, 400):
+        if t % 20 == 0:
+            active = g.v_active(t + 1, 12, frontiers)
+            fast = g._adj_undirected(active)
+            sub = set(list(active)[::2])
+            fast_sub = g._adj_undirected(sub)
+            g._adj_ok = False  # force the edge-scan path
+            ref, ref_sub = g._adj_undirected(active), g._adj_undirected(sub)
+            g._adj_ok = True
+            ok = ok and all(list(fast[e]) == list(ref[e]) for e in active) and list(fast) == list(ref)
+            ok = ok and all(list(fast_sub[e]) == list(ref_sub[e]) for e in sub)
+    ok = ok and len(g._nbrs) < 0.25 * len(g.nodes)
+    assert_true(ok, "incremental window adjacency matches full edge scan (sets, order, bounded size)", log)
+
+
+def check_window_components(log: Path) -> None:
+    """Incremental component tracker reports the DFS S_perc / largest component at every tick."""
+    from bcqm_vi_spacetime.event_graph import EventGraph
+    from bcqm_vi_spacetime.window_components import WindowComponents
+
+    ok = True
+    for W, N, p_new, seed in ((12, 5, 0.4, 7), (40, 4, 0.1, 8)):
+        g = EventGraph()
+        comps = WindowComponents(g, W)
+        for t, g, frontiers, nxt in _grow_window_graph(seed, W, N, p_new, 500, evict_every=37, evict_at=5, g=g):
+            comps.add_edges(zip(frontiers, nxt))
+            active = g.v_active(t, W, nxt)
+            ok = ok and comps.query(t, nxt) == (len(active), len(g.largest_component_nodes(active)))
+            ok = ok and comps.s_perc(t, nxt) == g.s_perc(active)
+        ok = ok and comps.n_rebuilds <= 500 // comps.block + 1
+    assert_true(ok, "incremental window components match DFS S_perc / comp_size every tick", log)
+
+
+def check_window_snapshot(log: Path) -> None:
+    """WindowSnapshot observables equal the per-call EventGraph methods and per-w* bundle scans."""
+    from bcqm_vi_spacetime.engine_vglue import _histories_init, _histories_push
+    from bcqm_vi_spacetime.window_snapshot import WindowSnapshot
+
+    def bundles_ref(hist, w_star):
+        sets = [set(h) for h in hist]
+        N = len(sets)
+        parent = list(range(N))
+
+        def find(x):
+            while parent[x] != x:
+                x = parent[x]
+            return x
+
+        for i in range(N):
+            for j in range(i + 1, N):
+                if len(sets[i] & sets[j]) / float(len(sets[i] | sets[j])) > w_star:
+                    parent[find(i)] = find(j)
+        sizes = sorted((sum(1 for k in range(N) if find(k) == r) for r in set(map(find, range(N)))), reverse=True)
+        return sizes
+
+    W = 15
+    histories = None
+    ok = True
+    for t, g, prev, frontiers in _grow_window_graph(9, W, 6, 0.3, 300):
+        if histories is None:
+            histories = _histories_init(6, W, prev)
+        _histories_push(histories, frontiers)
+        if t % 25 == 24:
+            snap = WindowSnapshot(g, t, W, frontiers, histories)
+            a = g.v_active(t, W, frontiers)
+            ok = ok and snap.s_perc() == g.s_perc(a) and snap.largest_component == g.largest_component_nodes(a)
+            ok = ok and snap.s_junc_w(1.5) == g.s_junc_w(a, 1.5) and snap.hubshare() == g.hubshare(a)
+            ok = ok and snap.max_indegree() == g.max_indegree(a) and snap.clustering() == g.clustering_coeff(a)
+            ok = ok and snap.ball_growth_profile(r_max=8, samples=5, seed=1) == g.ball_growth_profile(a, 8, 5, 1)
+            for w in (0.1, 0.2, 0.3):
+                ok = ok and snap.bundles(w)["bundle_sizes"] == bundles_ref(histories.lists, w)
+    assert_true(ok, "window snapshot observables match per-call EventGraph methods and bundle scans", log)
+
+
+def check_vectorized_selection(log: Path) -> None:
+    """space.selection: vectorized equals a per-thread reference reading the same uniform layout."""
+    import numpy as np
+    from bcqm_vi_spacetime.engine_vglue import _select_next_events
+    from bcqm_vi_spacetime.event_graph import ActiveDomainPools, EventGraph
+
+    N, W, T, p = 12, 10, 200, 0.7
+    dom = np.arange(N, dtype=np.int64) % 3
+    ok = True
+    for use_pools in (False, True):
+        for domain_match in (False, True):
+            ga, gb = EventGraph(), EventGraph()
+            fa = [ga.new_event(0, domain=int(d)) for d in dom]
+            fb = [gb.new_event(0, domain=int(d)) for d in dom]
+            pa = ActiveDomainPools(ga) if use_pools else None
+            pb = ActiveDomainPools(gb) if use_pools else None
+            ra, rb = np.random.default_rng(5), np.random.default_rng(5)
+            for t in range(T):
+                if use_pools:
+                    n_a, la = pa.sync(t, W, fa), None
+                    pb.sync(t, W, fb)
+                else:
+                    la = list(ga.v_active(t, W, fa))
+                    n_a = len(la)
+                nxt_a = _select_next_events(ra, ga, t, fa, dom, p, domain_match, pa, la, n_a)
+                u = rb.random(2 * N)
+                lb = list(gb.v_active(t, W, fb))
+                nxt_b = []
+                for i in range(N):
+                    d = int(dom[i])
+                    if use_pools:
+                        cand = list((pb.domain(d) if domain_match else pb.all).items)
+                    else:
+                        cand = [e for e in lb if gb.nodes[e].domain == d] if domain_match else lb
+                    e = -1
+                    if u[i] < p and lb and cand:
+                        e = cand[min(int(u[N + i] * len(cand)), len(cand) - 1)]
+                    nxt_b.append(-1 if e == fb[i] else e)
+                nxt_b = [e if e >= 0 else gb.new_event(t + 1, domain=int(dom[i])) for i, e in enumerate(nxt_b)]
+                ga.add_edges(fa, nxt_a, t + 1)
+                for f, e in zip(fb, nxt_b):
+                    gb.add_edge(f, e, t + 1)
+                ok = ok and nxt_a == nxt_b
+                fa, fb = nxt_a, nxt_b
+            ok = ok and ga.core.n_nodes == gb.core.n_nodes
+            ok = ok and np.array_equal(ga.core.src, gb.core.src) and np.array_equal(ga.core.dst, gb.core.dst)
+            ok = ok and np.array_equal(ga.indegrees(ga.v_active(T, W, fa)), gb.indegrees(gb.v_active(T, W, fb)))
+            ok = ok and ga._adj_undirected(ga.v_active(T, W, fa)) == gb._adj_undirected(gb.v_active(T, W, fb))
+    assert_true(ok, "vectorized thread-to-event selection matches the per-thread reference", log)
+
+
+def check_history_overlap(log: Path) -> None:
+    """Incremental ThreadHistories overlaps equal Jaccard overlaps recomputed from the history sets."""
+    import random
+    import numpy as np
+    from bcqm_vi_spacetime.thread_histories import ThreadHistories
+
+    def overlap_ref(lists):
+        sets = [set(h) for h in lists]
+        N = len(sets)
+        ov = np.zeros((N, N))
+        for i in range(N):
+            for j in range(i + 1, N):
+                uni = len(sets[i] | sets[j])
+                ov[i, j] = ov[j, i] = len(sets[i] & sets[j]) / float(uni) if uni else 0.0
+        return ov
+
+    rnd = random.Random(4)
+    N, W = 7, 9
+    h = ThreadHistories(N, W, list(range(N)))
+    ref = [[i] for i in range(N)]
+    ok = True
+    for t in range(400):
+        # small event pool, so threads share events and revisit them within their window
+        events = [rnd.randrange(25) for _ in range(N)]
+        h.push(events)
+        for i, e in enumerate(events):
+            ref[i].append(e)
+            if len(ref[i]) > W:
+                del ref[i][0]
+        if t % 20 == 0:
+            ok = ok and h.lists == ref and np.array_equal(h.overlap(), overlap_ref(ref))
+    ok = ok and np.array_equal(ThreadHistories.from_lists(W, ref).overlap(), h.overlap())
+    assert_true(ok, "incremental thread-history overlaps match Jaccard overlaps of the history sets", log)
+
+
+def check_bundle_sweep(log: Path) -> None:
+    """One union-find sweep gives the same bundles as a DFS per threshold, and its curve matches."""
+    import numpy as np
+    from bcqm_vi_spacetime.window_snapshot import bundle_sweep, curve_at
+
+    def bundles_ref(ov, w):
+        N = ov.shape[0]
+        seen = [False] * N
+        sizes = []
+        for i in range(N):
+            if seen[i]:
+                continue
+            stack, seen[i], size = [i], True, 0
+            while stack:
+                x = stack.pop()
+                size += 1
+                for nb in np.flatnonzero(ov[x] > w).tolist():
+                    if not seen[nb]:
+                        seen[nb] = True
+                        stack.append(nb)
+            sizes.append(size)
+        return sorted(sizes, reverse=True)
+
+    rng = np.random.default_rng(11)
+    ok = True
+    for N in (1, 2, 5, 12):
+        # coarse values so ties and zero overlaps occur
+        ov = np.triu(np.round(rng.random((N, N)) * 8) / 10.0 * (rng.random((N, N)) < 0.5), 1)
+        ov = ov + ov.T
+        ws = sorted(set(np.unique(ov).tolist() + [-0.1, 0.05, 0.25, 0.95]))
+        curve, by_w = bundle_sweep(ov, ws)
+        for w in ws:
+            ref = bundles_ref(ov, w)
+            ok = ok and by_w[w]["bundle_sizes"] == ref and by_w[w]["F_max"] == ref[0] / float(N)
+            ok = ok and curve_at(curve, w) == (ref[0] / float(N), len(ref))
+    assert_true(ok, "threshold sweep bundles and F_max(w*) curve match per-threshold component scans", log)
+
+
+def check_sparse_bundles(log: Path) -> None:
+    """Sparse (inverted-index pair) overlaps give the same pairs, overlaps and bundles as dense."""
+    import random
+    import numpy as np
+    from bcqm_vi_spacetime.thread_histories import ThreadHistories
+    from bcqm_vi_spacetime.window_snapshot import sweep_pairs
+
+    rnd = random.Random(21)
+    N, W = 30, 12
+    dense = ThreadHistories(N, W, list(range(N)))
+    sparse = ThreadHistories(N, W, list(range(N)), sparse=True)
+    ok = True
+    for t in range(300):
+        events = [rnd.randrange(60) if rnd.random() < 0.4 else 1000 + t * N + i for i in range(N)]
+        dense.push(events)
+        sparse.push(events)
+        if t % 30 == 0:
+            pd, ps = dense.pairs(), sparse.pairs()
+            ok = ok and all(np.array_equal(a, b) for a, b in zip(pd, ps))
+            ok = ok and np.array_equal(dense.overlap(), sparse.overlap())
+            ws = (0.0, 0.05, 0.1, 0.2)
+            ok = ok and sweep_pairs(N, *pd, queries=ws) == sweep_pairs(N, *ps, queries=ws)
+    ok = ok and ThreadHistories.from_lists(W, sparse.lists, sparse=True)._pair == sparse._pair
+    assert_true(ok, "sparse thread-pair overlaps and bundles match the dense overlap matrix", log)
+
+
+def check_ball_counts(log: Path) -> None:
+    """Bit-parallel multi-source BFS gives the exact |B(r)| of a queue-based BFS from each root."""
+    import random
+    from collections import deque
+    import numpy as np
+    from bcqm_vi_spacetime.csr_geometry import CSRGraph, ball_counts
+
+    rnd = random.Random(19)
+    n = 300
+    adj = {v: set() for v in range(n)}
+    for v in range(1, n):
+        u = rnd.randrange(v)  # random tree plus a few chords: long and uneven distances
+        adj[u].add(v)
+        adj[v].add(u)
+    for _ in range(40):
+        u, v = rnd.randrange(n), rnd.randrange(n)
+        if u != v:
+            adj[u].add(v)
+            adj[v].add(u)
+    csr = CSRGraph.from_adjacency(range(n), adj)
+    roots = np.array([rnd.randrange(n) for _ in range(150)], dtype=np.int64)  # > 64: several words
+    r_max = 12
+    balls = ball_counts(csr, roots, r_max)
+    ok = balls.shape == (150, r_max + 1)
+    for k, root in enumerate(roots.tolist()):
+        dist = {root: 0}
+        q = deque([root])
+        while q:
+            v = q.popleft()
+            for nb in adj[v]:
+                if nb not in dist:
+                    dist[nb] = dist[v] + 1
+                    q.append(nb)
+        ref = [sum(1 for d in dist.values() if d <= r) for r in range(r_max + 1)]
+        ok = ok and balls[k].tolist() == ref
+    assert_true(ok, "bit-parallel BFS ball counts match per-root breadth-first search", log)
+
+
+def check_walk_returns(log: Path) -> None:
+    """Vectorized CSR walkers: reproducible, and return statistics of a cycle are as expected."""
+    import numpy as np
+    from bcqm_vi_spacetime.csr_geometry import CSRGraph, walk_returns
+
+    n = 40
+    adj = {v: {(v - 1) % n, (v + 1) % n} for v in range(n)}
+    csr = CSRGraph.from_adjacency(range(n), adj)
+    W = 20000
+    ret = walk_returns(csr, W, 12, np.random.default_rng(3))
+    ok = np.array_equal(ret, walk_returns(csr, W, 12, np.random.default_rng(3)))
+    # even cycle is bipartite: no returns at odd t; P0(2) = 1/2, P0(4) = 3/8 exactly
+    ok = ok and ret[0] == W and not ret[1::2].any()
+    ok = ok and abs(ret[2] / W - 0.5) < 0.02 and abs(ret[4] / W - 0.375) < 0.02
+    assert_true(ok, "vectorized random-walk returns are reproducible and match cycle return probabilities", log)
+
+
+def check_diffusion_returns(log: Path) -> None:
+    """Exact diffusion P0(t) matches closed forms; the Hutchinson trace estimate is close to it."""
+    import numpy as np
+    from bcqm_vi_spacetime.csr_geometry import CSRGraph, diffusion_returns, trace_returns
+
+    m = 9  # complete graph K_m: P0(t) = (1 + (m - 1) * (-1 / (m - 1))^t) / m
+    csr = CSRGraph.from_adjacency(range(m), {v: set(range(m)) - {v} for v in range(m)})
+    p0 = diffusion_returns(csr, np.arange(m), 10)
+    ref = np.array([(1 + (m - 1) * (-1.0 / (m - 1)) ** t) / m for t in range(11)])
+    ok = bool(np.allclose(p0, ref, rtol=0, atol=1e-12))
+    n = 40  # even cycle: P0(2) = 1/2, P0(4) = 3/8, no returns at odd t
+    csr = CSRGraph.from_adjacency(range(n), {v: {(v - 1) % n, (v + 1) % n} for v in range(n)})
+    p0 = diffusion_returns(csr, np.array([0, 7, 21]), 12)
+    ok = ok and p0[0] == 1.0 and abs(p0[2] - 0.5) < 1e-12 and abs(p0[4] - 0.375) < 1e-12 and not p0[1::2].any()
+    tr = trace_returns(csr, 400, 12, np.random.default_rng(2))
+    ok = ok and float(np.max(np.abs(tr - p0))) < 0.05
+    assert_true(ok, "diffusion return probabilities match closed forms and the Hutchinson trace", log)
+
+
+def check_kpm_density(log: Path) -> None:
+    """KPM integrated density of states follows the exact spectrum; a ring gives ds close to 1."""
+    import numpy as np
+    from bcqm_vi_spacetime.csr_geometry import CSRGraph, kpm_cumulative, kpm_moments
+    from bcqm_vi_spacetime.event_graph import EventGraph
+
+    rng = np.random.default_rng(25)
+    n = 200
+    adj = {v: set() for v in range(n)}
+    for v in range(1, n):
+        for u in {int(rng.integers(v)), v - 1}:
+            adj[u].add(v)
+            adj[v].add(u)
+    A = np.zeros((n, n))
+    for v, nbs in adj.items():
+        A[v, list(nbs)] = 1.0
+    d = A.sum(axis=1)
+    eig = np.linalg.eigvalsh(np.eye(n) - A / np.sqrt(np.outer(d, d)))
+    mu = kpm_moments(CSRGraph.from_adjacency(range(n), adj), 128, 64, np.random.default_rng(1))
+    lam = np.array([0.3, 0.7, 1.0, 1.3, 1.7])
+    ok = bool(np.max(np.abs(kpm_cumulative(mu, lam) - np.searchsorted(np.sort(eig), lam) / n)) < 0.03)
+
+    g = EventGraph()
+    ring = [g.new_event(0) for _ in range(2000)]
+    for i, e in enumerate(ring):
+        g.add_edge(e, ring[(i + 1) % len(ring)], 1)
+    out = g.spectral_density_kpm(g.v_active(1, 10, []), seed=3)
+    ok = ok and out["ds_valid"] and abs(float(out["ds_est"]) - 1.0) < 0.15
+    assert_true(ok, "KPM density of states matches the exact spectrum and gives ds ~ 1 on a ring", log)
+
+
+def check_triangle_clustering(log: Path) -> None:
+    """Vectorized triangle counts give the clustering of the neighbour-pair loop, sampled or exact."""
+    import random
+    import numpy as np
+    from bcqm_vi_spacetime.csr_geometry import CSRGraph, local_clustering
+    from bcqm_vi_spacetime.event_graph import EventGraph
+    from bcqm_vi_spacetime.observables import clustering_coefficient_undirected
+
+    def pair_loop(adj, v):
+        nbrs = list(adj[v])
+        k = len(nbrs)
+        links = sum(1 for i in range(k) for j in range(i + 1, k) if nbrs[j] in adj[nbrs[i]])
+        return (2.0 * links) / (k * (k - 1)) if k >= 2 else None
+
+    rnd = random.Random(23)
+    n = 700
+    adj = {v: set() for v in range(n)}
+    for v in range(n):
+        for u in rnd.sample(range(max(0, v - 12), v + 1), min(v + 1, 3)):  # local triangles + self-loops
+            adj[u].add(v)
+            adj[v].add(u)
+    for v in rnd.sample(range(n), 150):  # one hub
+        adj[0].add(v)
+        adj[v].add(0)
+    coeff, valid = local_clustering(CSRGraph.from_adjacency(range(n), adj))
+    ref = [pair_loop(adj, v) for v in range(n)]
+    ok = [c if m else None for c, m in zip(coeff.tolist(), valid.tolist())] == ref
+    exact = [c for c in ref if c is not None]
+    ok = ok and clustering_coefficient_undirected(adj) == float(sum(exact)) / float(len(exact))
+    g = EventGraph()
+    ok = ok and g.clustering_coeff(set(range(n)), sample=None, adj=adj) == sum(exact) / len(exact)
+    stride = [c for c in ref[:500] if c is not None]  # step 700 // 500 = 1
+    ok = ok and g.clustering_coeff(set(range(n)), sample=500, adj=adj) == sum(stride) / len(stride)
+    picked = np.random.default_rng(0).choice(n, size=300, replace=False).tolist()
+    drawn = [ref[i] for i in picked if ref[i] is not None]
+    ok = ok and clustering_coefficient_undirected(adj, sample=300) == float(sum(drawn)) / float(len(drawn))
+    assert_true(ok, "triangle-count clustering equals the neighbour-pair loop (local, sampled, exact)", log)
+
+
+def check_component_view(log: Path) -> None:
+    """Memoized window view: one adjacency build per (active set, graph version); same values."""
+    import random
+    from bcqm_vi_spacetime.engine_vglue import _observables_cfg
+    from bcqm_vi_spacetime.event_graph import EventGraph
+
+    rnd = random.Random(24)
+    g = EventGraph()
+    ev = [g.new_event(0) for _ in range(400)]
+    for v in range(1, 400):
+        g.add_edge(ev[rnd.randrange(v)], ev[v], 1)
+        g.add_edge(ev[v], ev[max(0, v - rnd.randrange(1, 6))], 1)
+    a = g.v_active(1, 10, [])
+    build = g._adj_undirected
+    calls = []
+    g._adj_undirected = lambda active: calls.append(1) or build(active)  # type: ignore[method-assign]
+    got = (g.largest_component_nodes(a), g.s_perc(a), g.clustering_coeff(a, sample=None),
+           g.ball_growth_profile(a, 8, 50, 1), g.estimate_spectral_dimension(a, method="walk_csr", seed=2),
+           g.spectral_density_kpm(a, moments=64, probes=4, seed=3))
+    ok = len(calls) == 1
+    adj = build(a)
+    ref = (g.components(a, adj)[1], g.s_perc(a, adj), g.clustering_coeff(a, sample=None, adj=adj),
+           g.ball_growth_profile(a, 8, 50, 1, adj=adj),
+           g.estimate_spectral_dimension(a, method="walk_csr", seed=2, adj=adj),
+           g.spectral_density_kpm(a, moments=64, probes=4, seed=3, adj=adj))
+    ok = ok and got == ref
+    g.add_edge(ev[0], ev[399], 2)  # new graph version: the view is rebuilt
+    ok = ok and g.s_perc(a) == 1.0 and len(calls) == 2
+    ok = ok and _observables_cfg({}) == {"S_perc", "S_junc_w", "hubshare", "max_indegree", "clustering", "islands"}
+    ok = ok and _observables_cfg({"observables": {"select": ["hubshare"]}}) == {"hubshare"}
+    try:
+        _observables_cfg({"observables": {"select": ["S_percolation"]}})
+        ok = False
+    except ValueError:
+        pass
+    assert_true(ok, "memoized component view: one adjacency build per window and graph version", log)
+
+
+def check_window_indegrees(log: Path) -> None:
+    """Incremental window indegree histogram: junction statistics equal the EventGraph ones every tick."""
+    import math
+    from bcqm_vi_spacetime.event_graph import EventGraph
+    from bcqm_vi_spacetime.window_indegrees import WindowIndegrees
+
+    W = 12
+    g = EventGraph()
+    juncs = WindowIndegrees(g.core, W)
+    ok = True
+    # frontier 0 stays put for t in [100, 130) and ages out of the recency window (pinned)
+    for t, g, frontiers, nxt in _grow_window_graph(25, W, 8, 0.35, 250, domain=None, evict_every=30,
+                                                   evict_at=29, hold=(100, 130), g=g):
+        juncs.add_edges(zip(frontiers, nxt))
+        a = g.v_active(t, W, nxt)
+        ok = ok and juncs.query(t, nxt) == len(a)
+        ok = ok and juncs.hubshare() == g.hubshare(a) and juncs.max_indegree() == g.max_indegree(a)
+        ok = ok and math.isclose(juncs.s_junc_w(1.5), g.s_junc_w(a, 1.5), rel_tol=1e-12, abs_tol=1e-15)
+    ok = ok and juncs.n_rebuilds == 1
+    assert_true(ok, "window indegree histogram matches S_junc_w / hubshare / max_indegree on V_active", log)
+
+
 def main() -> None:
     root = Path.cwd()
     outdir = root / "outputs" / "analysis"
@@ -127,6 +915,7 @@ def main() -> None:
         ("space_on", "configs/selftests/selftest_space_on.yml"),
         ("glueoff", "configs/selftests/selftest_glueoff_space_on.yml"),
         ("geometry", "configs/selftests/selftest_geometry.yml"),
+        ("batch", "configs/selftests/selftest_vglue_batch.yml"),
     ]
 
     for tag, cfg in configs:
@@ -168,6 +957,84 @@ def main() -> None:
     mj = read_json(m)
     assert_true("geometry" in mj and mj["geometry"] is not None, "geometry block present in RUN_METRICS", log)
 
+    # 5) ensemble-batched engine: seed-11 row must reproduce the single-seed nospace run
+    m = newest("outputs/selftest/selftest_vglue_batch/RUN_METRICS_*seed11.json")
+    m_ref = newest("outputs/selftest/selftest_vglue_nospace/RUN_METRICS_*seed11.json")
+    n_batch = len(glob("outputs/selftest/selftest_vglue_batch/RUN_METRICS_*.json"))
+    assert_true(m is not None and m_ref is not None and n_batch >= 3, "batch outputs exist (one RUN_METRICS per seed)", log)
+    mj = read_json(m) ; rj = read_json(m_ref)
+    keys = ("Q_clock", "ell_lock", "L_inst", "L", "glue_state")
+    assert_true(all(mj.get(k) == rj.get(k) for k in keys), "batch seed-11 metrics identical to single-seed engine", log)
+
+    # 6) heterogeneous vectorised sweep parity (in-process, temp outputs)
+    check_sweep_parity(log)
+
+    # 7) block-drawn RNG streams (in-process, temp outputs)
+    check_blocked_rng(log)
+
+    # 8) fused glue kernel backend vs ancestor kernels (in-process)
+    check_fused_parity(log)
+
+    # 9) streaming lockstep metrics vs batch FFT (tolerance)
+    check_streaming_metrics(log)
+
+    # 10) checkpoint / resume
+    check_checkpoint_resume(log)
+
+    # 11) EventGraph active-window index
+    check_active_window_index(log)
+
+    # 12) per-domain candidate pools
+    check_candidate_pools(log)
+
+    # 13) bounded-memory EventGraph eviction
+    check_eviction(log)
+
+    # 14) columnar graph storage
+    check_graph_core(log)
+
+    # 15) incremental window adjacency
+    check_window_adjacency(log)
+
+    # 16) incremental window components (per-tick S_perc)
+    check_window_components(log)
+
+    # 17) shared window snapshot for sampled observables
+    check_window_snapshot(log)
+
+    # 18) vectorized thread-to-event selection
+    check_vectorized_selection(log)
+
+    # 19) incremental thread-history overlaps
+    check_history_overlap(log)
+
+    # 20) F_max(w*) curve from one threshold sweep
+    check_bundle_sweep(log)
+
+    # 21) sparse bundle detection via the event inverted index
+    check_sparse_bundles(log)
+
+    # 22) level-synchronous multi-source BFS for ball growth
+    check_ball_counts(log)
+
+    # 23) vectorized random-walk engine for the spectral dimension
+    check_walk_returns(log)
+
+    # 24) deterministic diffusion estimator for P0(t)
+    check_diffusion_returns(log)
+
+    # 25) KPM spectral density of the normalized Laplacian
+    check_kpm_density(log)
+
+    # 26) exact vectorized triangle counting for the clustering coefficient
+    check_triangle_clustering(log)
+
+    # 27) memoized component view + observables.select
+    check_component_view(log)
+
+    # 28) incremental window indegree histogram for the junction statistics
+    check_window_indegrees(log)
+
     log.write_text(log.read_text(encoding="utf-8") + "\nSELFTEST PASSED\n", encoding="utf-8")
     print(f"Wrote {log}")
 
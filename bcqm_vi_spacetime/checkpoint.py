@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+"""
+checkpoint.py (BCQM VI)
+
+Periodic checkpoints for long single runs (v_glue engine and the scaffold engine in runner.py).
+
+File format (CHECKPOINT_<run_id>.npz, format 1):
+- a compressed numpy .npz archive (no pickles);
+- entry "meta": a JSON document stored as uint8 bytes, holding the run identity (engine, cfg, N,
+  n, seed), the loop position, bit-generator states and small Python-side records;
+- every other entry is a numpy array (thread state, graph arrays, histories, accumulators,
+  pre-drawn RNG blocks).
+Writes go to a temporary file that is then moved into place, so a crash during a write leaves the
+previous checkpoint intact.
+
+A resumed run continues from the saved state exactly: RUN_METRICS matches the uninterrupted run
+except for elapsed_seconds (wall clock; the resumed run reports the sum of both segments).
+
+YAML:
+  engine:
+    checkpoint:
+      every: 100000     # ticks between checkpoints (0 = off, default)
+      keep: false       # keep the checkpoint after the run completes
+
+Resume:
+  python -m bcqm_vi_spacetime.cli resume --checkpoint <out_dir>/CHECKPOINT_<run_id>.npz
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+
+CHECKPOINT_FORMAT = 1
+
+
+def checkpoint_cfg(cfg: Dict[str, Any]) -> Dict[str, Any]:
+    engine = cfg.get("engine", {}) or {}
+    ck = engine.get("checkpoint", {}) or {}
+    return {"every": max(0, int(ck.get("every", 0))), "keep": bool(ck.get("keep", False))}
+
+
+def checkpoint_path(out_dir: Path, run_id: str) -> Path:
+    return Path(out_dir) / f"CHECKPOINT_{run_id}.npz"
+
+
+def save_checkpoint(path: Path, meta: Dict[str, Any], arrays: Dict[str, np.ndarray]) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    doc = dict(meta)
+    doc["format"] = CHECKPOINT_FORMAT
+    payload = {k: np.asarray(v) for k, v in arrays.items()}
+    payload["meta"] = np.frombuffer(json.dumps(doc, sort_keys=True).encode("utf-8"), dtype=np.uint8)
+    tmp = path.with_name(path.name + ".tmp")
+    with tmp.open("wb") as f:
+        np.savez_compressed(f, **payload)
+    os.replace(tmp, path)
+
+
+def load_checkpoint(path: Path) -> Tuple[Dict[str, Any], Dict[str, np.ndarray]]:
+    with np.load(Path(path), allow_pickle=False) as z:
+        arrays = {k: z[k] for k in z.files}
+    meta = json.loads(arrays.pop("meta").tobytes().decode("utf-8"))
+    if int(meta.get("format", -1)) != CHECKPOINT_FORMAT:
+        raise ValueError(f"Unsupported checkpoint format in {path}: {meta.get('format')}")
+    return meta, arrays
+
+
+class Checkpointer:
+    """Writes a run's checkpoint every `every` completed ticks; removes it when the run finishes."""
+
+    def __init__(self, cfg: Dict[str, Any], out_dir: Path, run_id: str) -> None:
+        ck = checkpoint_cfg(cfg)
+        self.every = ck["every"]
+        self.keep = ck["keep"]
+        self.path = checkpoint_path(out_dir, run_id)
+
+    def due(self, done: int, total: int) -> bool:
+        """True after `done` completed ticks (of `total`) if a checkpoint should be written."""
+        return self.every > 0 and done < total and done % self.every == 0
+
+    def save(self, meta: Dict[str, Any], arrays: Dict[str, np.ndarray]) -> None:
+        save_checkpoint(self.path, meta, arrays)
+
+    def finish(self) -> None:
+        if not self.keep and self.path.exists():
+            self.path.unlink()
+
+
+def check_resume(meta: Dict[str, Any], engine: str, run_id: str) -> None:
+    if meta.get("engine") != engine or meta.get("run_id") != run_id:
+        raise ValueError(f"Checkpoint is for {meta.get('engine')}:{meta.get('run_id')}, not {engine}:{run_id}")
+
+
+def pack_lists(prefix: str, lists: List[List[int]]) -> Dict[str, np.ndarray]:
+    """Ragged int lists as (lengths, flat values) arrays."""
+    lens = np.array([len(x) for x in lists], dtype=np.int64)
+    flat = np.array([v for x in lists for v in x], dtype=np.int64)
+    return {f"{prefix}_len": lens, f"{prefix}_val": flat}
+
+
+def unpack_lists(prefix: str, arrays: Dict[str, np.ndarray]) -> List[List[int]]:
+    lens = arrays[f"{prefix}_len"].tolist()
+    flat = arrays[f"{prefix}_val"].tolist()
+    out: List[List[int]] = []
+    i = 0
+    for k in lens:
+        out.append(flat[i:i + k])
+        i += k
+    return out
@@ -4,7 +4,7 @@ import argparse
 from pathlib import Path
 
 from .io import load_yaml
-from .runner import run_from_config, scan_from_config
+from .runner import run_from_config, scan_from_config, sweep_from_configs, resume_from_checkpoint
 from .compat_v5_v6 import import_bcqm_v_config, ImportOptions
 
 
@@ -18,6 +18,15 @@ def main() -> None:
     p_scan = sub.add_parser("scan", help="Run a scan over n, sizes, seeds as defined in YAML")
     p_scan.add_argument("--config", required=True, type=str, help="Path to YAML config")
 
+    p_sweep = sub.add_parser("sweep", help="Run several v_glue configs as one vectorised nospace sweep")
+    p_sweep.add_argument("--config", required=True, action="append", type=str,
+                         help="Path to YAML config (repeat for each config)")
+    p_sweep.add_argument("--max_rows", type=int, default=None,
+                         help="Max runs per vectorised job (default: all)")
+
+    p_resume = sub.add_parser("resume", help="Resume a single run from a CHECKPOINT_*.npz file")
+    p_resume.add_argument("--checkpoint", required=True, type=str, help="Path to checkpoint file")
+
     p_import = sub.add_parser("import_v", help="Import a BCQM V YAML config and emit an import manifest")
     p_import.add_argument("--config_v", required=True, type=str, help="Path to BCQM V YAML config")
     p_import.add_argument("--out", required=True, type=str, help="Output directory for IMPORT_MANIFEST_*.json")
@@ -38,6 +47,15 @@ def main() -> None:
             scan_from_config(cfg)
         return
 
+    if args.cmd == "sweep":
+        cfgs = [load_yaml(Path(p)) for p in args.config]
+        sweep_from_configs(cfgs, size=args.max_rows)
+        return
+
+    if args.cmd == "resume":
+        resume_from_checkpoint(Path(args.checkpoint))
+        return
+
     if args.cmd == "import_v":
         opts = ImportOptions(
             respect_store_states=bool(args.respect_store_states),
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+"""
+component_view.py (BCQM VI)
+
+Memoized structural view of one active set of an EventGraph, shared by every spatial observable.
+
+ComponentView(g, active) builds, on first use and at most once each:
+- the undirected adjacency induced on active (g._adj_undirected),
+- component labels and the largest component (g.components),
+- the CSR view of the largest component (ball growth / spectral dimension kernels),
+- the CSR view of the whole window (triangle counts for the clustering coefficient),
+- the indegree array of active (set order).
+
+EventGraph.view(active) keeps the last view and returns it again while both the active set (same
+events in the same iteration order) and the graph version (EventGraph.version, which changes with
+every added event or edge and every eviction) are unchanged. The EventGraph observables that are
+called without precomputed adj / comp / csr (s_perc, components / largest_component_nodes,
+clustering_coeff, ball_growth_profile, estimate_spectral_dimension, spectral_density_kpm) read
+from it, so e.g. the end-of-run comp_size, ball growth, spectral dimension, S_perc and clustering
+of one window cost one adjacency build and one component search between them. WindowSnapshot
+reads its event-window structures from the same view.
+"""
+
+from typing import TYPE_CHECKING, Dict, Hashable, Optional, Set, Tuple
+
+import numpy as np
+
+from .csr_geometry import CSRGraph
+
+if TYPE_CHECKING:
+    from .event_graph import Adjacency, EventGraph
+
+
+class ComponentView:
+    def __init__(self, g: "EventGraph", active: Set[int], key: Tuple[int, ...], version: Hashable) -> None:
+        self.g = g
+        self.active = active
+        self.key = key
+        self.version = version
+        self._adj: Optional["Adjacency"] = None
+        self._labels: Optional[Dict[int, int]] = None
+        self._largest: Optional[Set[int]] = None
+        self._csr: Optional[CSRGraph] = None
+        self._window_csr: Optional[CSRGraph] = None
+        self._indeg: Optional[np.ndarray] = None
+
+    def matches(self, key: Tuple[int, ...], version: Hashable) -> bool:
+        return self.version == version and self.key == key
+
+    @property
+    def adj(self) -> "Adjacency":
+        if self._adj is None:
+            self._adj = self.g._adj_undirected(self.active)
+        return self._adj
+
+    def _components(self) -> None:
+        self._labels, self._largest = self.g.components(self.active, self.adj)
+
+    @property
+    def labels(self) -> Dict[int, int]:
+        if self._labels is None:
+            self._components()
+        return self._labels  # type: ignore[return-value]
+
+    @property
+    def largest_component(self) -> Set[int]:
+        if self._largest is None:
+            self._components()
+        return self._largest  # type: ignore[return-value]
+
+    @property
+    def csr(self) -> CSRGraph:
+        if self._csr is None:
+            self._csr = CSRGraph.from_adjacency(self.largest_component, self.adj)
+        return self._csr
+
+    @property
+    def window_csr(self) -> CSRGraph:
+        if self._window_csr is None:
+            self._window_csr = CSRGraph.from_adjacency(self.active, self.adj)
+        return self._window_csr
+
+    @property
+    def indeg(self) -> np.ndarray:
+        if self._indeg is None:
+            self._indeg = self.g.core.indeg_of(np.array(self.key, dtype=np.int64))
+        return self._indeg
@@ -0,0 +1,326 @@
+from __future__ import annotations
+
+"""
+csr_geometry.py (BCQM VI)
+
+Array kernels for the geometry probes of EventGraph (ball growth, spectral dimension) on a
+compressed-sparse-row (CSR) view of an undirected component.
+
+CSRGraph.from_adjacency(nodes, adj) numbers the component's events 0..n-1 in the order of
+`nodes`; row i lists the neighbours of nodes[i] in adjacency order.
+
+ball_counts(csr, roots, r_max): exact |B(r)| for every root with a level-synchronous BFS that
+runs 64 roots per uint64 word (bit b of word w at node v = "root 64 w + b has reached v").
+One level is a segmented OR of the neighbours' frontier words (np.bitwise_or.reduceat), so a
+level costs O(edges * words) array work however many roots share the word.
+
+walk_returns(csr, walkers, t_max, rng): simple random walks for all walkers at once. Each step
+draws one uniform per walker and moves it to neighbour indptr[v] + floor(u * deg(v)); walkers on
+isolated nodes stay. Returns to the start are counted with one comparison per step.
+
+Deterministic return probabilities (no walkers), through the symmetric S = D^-1/2 A D^-1/2,
+which has the same diagonal powers as the walk operator P = D^-1 A (P^t(r, r) = S^t(r, r)).
+With v_k = S^k x: x.S^2k x = |v_k|^2 and x.S^(2k+1) x = v_k . v_(k+1), so t_max steps cost
+about t_max / 2 segmented-sum mat-vecs.
+- diffusion_returns(csr, roots, t_max): exact P^t(root, root) (x = e_root), averaged over the
+  roots, all roots propagated together.
+- trace_returns(csr, probes, t_max, rng): Hutchinson estimate of tr(P^t) / n, the return
+  probability averaged over all start nodes (x = Rademacher probes z).
+
+Kernel polynomial method (KPM) for the normalized Laplacian L = I - S (spectrum in [0, 2]):
+- kpm_moments(csr, moments, probes, rng): Chebyshev moments mu_m = tr T_m(H) / n of H = L - I = -S
+  (spectrum in [-1, 1]) from Rademacher probes, with the doubling relations
+  mu_2m = 2 a_m . a_m - mu_0 and mu_2m+1 = 2 a_m+1 . a_m - mu_1 (a_m = T_m(H) z), so M moments cost
+  about M / 2 mat-vecs; cost is linear in edges.
+- kpm_cumulative(mu, lam): Jackson-damped integrated density of states N(lambda) = fraction of
+  eigenvalues of L <= lambda, in closed form from the moments.
+
+Triangles / clustering (compact-forward):
+- triangle_counts(csr): exact number of triangles through every node. Nodes are ranked by degree
+  and each edge is kept once, from the lower to the higher rank, so a triangle is found exactly
+  once, at its lowest-ranked corner, as a pair of forward neighbours (a wedge) whose closing edge
+  exists. Wedges are generated as index arrays (a bounded number per pass) and closed with one
+  np.searchsorted over the sorted forward edge keys; the degree ordering bounds the work by
+  O(edges^1.5) whatever the hubs.
+- local_clustering(csr): (C_v, k_v >= 2 mask), C_v = 2 links_v / (k_v (k_v - 1)), where links_v
+  counts the linked neighbour pairs; a self-loop makes the node its own neighbour, and is then
+  linked to each of its other k_v - 1 neighbours, as in the neighbour-pair loops it replaces.
+- mean_clustering(csr, rows): average C_v over the given rows (all by default) with k_v >= 2.
+- sampled_clustering(nodes, adj): the same average over a sample of events, straight from the
+  adjacency sets: links_v = (sum over neighbours a of |adj[a] & N(v) - {a}|) / 2, one C-level set
+  intersection per neighbour. Only the sampled events' wedges are closed and no CSR is built, so
+  the cost does not grow with the window.
+The clustering observables sample 500 events by default (same values as before); null or 0 makes
+them exact over the whole window:
+  space:
+    clustering_sample: null      # v_glue engine
+  observables:
+    clustering_sample: null      # scaffold runner
+"""
+
+from itertools import chain
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+import numpy as np
+
+# Roots handled per pass of ball_counts (bounds the (n, words) bitset arrays).
+_BFS_WORDS_PER_PASS = 16
+
+
+class CSRGraph:
+    def __init__(self, nodes: np.ndarray, indptr: np.ndarray, indices: np.ndarray) -> None:
+        self.nodes = nodes
+        self.indptr = indptr
+        self.indices = indices
+        self.n = int(nodes.shape[0])
+        self.deg = np.diff(indptr)
+        self.rows = np.repeat(np.arange(self.n, dtype=np.int64), self.deg)  # row of each CSR entry
+
+    @classmethod
+    def from_adjacency(cls, nodes: Iterable[int], adj: Dict[int, Set[int]]) -> "CSRGraph":
+        node_arr = np.fromiter(nodes, dtype=np.int64)
+        n = int(node_arr.shape[0])
+        lens = np.fromiter((len(adj.get(e, ())) for e in node_arr.tolist()), dtype=np.int64, count=n)
+        flat = np.fromiter(chain.from_iterable(adj.get(e, ()) for e in node_arr.tolist()), dtype=np.int64,
+                           count=int(lens.sum()))
+        # neighbour ids -> rows; neighbours outside nodes are dropped
+        order = np.argsort(node_arr, kind="stable")
+        pos = np.minimum(np.searchsorted(node_arr[order], flat), max(0, n - 1))
+        keep = node_arr[order][pos] == flat if n else np.zeros(0, dtype=bool)
+        kept = np.bincount(np.repeat(np.arange(n), lens)[keep], minlength=n)
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(kept, out=indptr[1:])
+        return cls(node_arr, indptr, order[pos[keep]])
+
+    def index_of(self, ids: Iterable[int]) -> np.ndarray:
+        """CSR row of each event id."""
+        index = {int(e): i for i, e in enumerate(self.nodes.tolist())}
+        return np.array([index[int(e)] for e in ids], dtype=np.int64)
+
+    def gather_sum(self, x: np.ndarray) -> np.ndarray:
+        """out[v] = sum_{u ~ v} x[u] for x of shape (n,) or (k, n) (one vector per row)."""
+        if x.ndim == 1:
+            return np.bincount(self.rows, weights=x[self.indices], minlength=self.n)
+        out = np.empty_like(x)
+        for r in range(x.shape[0]):
+            out[r] = np.bincount(self.rows, weights=x[r][self.indices], minlength=self.n)
+        return out
+
+    def gather_or(self, x: np.ndarray) -> np.ndarray:
+        """Row-wise OR over neighbours: out[v] = OR_{u ~ v} x[u] (x: (n, k) unsigned ints)."""
+        out = np.zeros_like(x)
+        has = self.deg > 0
+        if self.indices.size:
+            red = np.bitwise_or.reduceat(x[self.indices], self.indptr[:-1][has], axis=0)
+            out[has] = red
+        return out
+
+
+def _popcount_columns(bits: np.ndarray, k: int) -> np.ndarray:
+    """Per-root counts of set bits over nodes for (n, words) uint64 bitsets; first k roots."""
+    as_bytes = bits.view(np.uint8).reshape(bits.shape[0], -1)
+    unpacked = np.unpackbits(as_bytes, axis=1, bitorder="little")
+    return unpacked.sum(axis=0, dtype=np.int64)[:k]
+
+
+def ball_counts(csr: CSRGraph, roots: np.ndarray, r_max: int) -> np.ndarray:
+    """(len(roots), r_max + 1) array of |B(r)| = #events within graph distance r of each root."""
+    roots = np.asarray(roots, dtype=np.int64)
+    R = int(roots.shape[0])
+    r_max = int(r_max)
+    out = np.zeros((R, r_max + 1), dtype=np.int64)
+    per_pass = 64 * _BFS_WORDS_PER_PASS
+    for s in range(0, R, per_pass):
+        chunk = roots[s:s + per_pass]
+        k = int(chunk.shape[0])
+        words = (k + 63) // 64
+        lane = np.arange(k)
+        frontier = np.zeros((csr.n, words), dtype=np.uint64)
+        np.bitwise_or.at(frontier, (chunk, lane // 64), np.left_shift(np.uint64(1), (lane % 64).astype(np.uint64)))
+        visited = frontier.copy()
+        cum = np.ones(k, dtype=np.int64)
+        out[s:s + k, 0] = cum
+        for r in range(1, r_max + 1):
+            if frontier.any():
+                frontier = csr.gather_or(frontier) & ~visited
+                visited |= frontier
+                cum = cum + _popcount_columns(frontier, k)
+            out[s:s + k, r] = cum
+    return out
+
+
+def walk_returns(csr: CSRGraph, walkers: int, t_max: int, rng: np.random.Generator) -> np.ndarray:
+    """Number of walkers at their start node after t = 0..t_max steps (uniform random starts)."""
+    walkers = int(walkers)
+    starts = rng.integers(0, csr.n, size=walkers)
+    pos = starts.copy()
+    returns = np.zeros(int(t_max) + 1, dtype=np.int64)
+    returns[0] = walkers
+    indptr, indices, deg = csr.indptr, csr.indices, csr.deg
+    last = max(0, int(indices.shape[0]) - 1)
+    for t in range(1, int(t_max) + 1):
+        d = deg[pos]
+        off = indptr[pos] + np.minimum((rng.random(walkers) * d).astype(np.int64), np.maximum(d - 1, 0))
+        pos = np.where(d > 0, indices[np.minimum(off, last)], pos) if indices.size else pos
+        returns[t] = np.count_nonzero(pos == starts)
+    return returns
+
+
+# Root vectors propagated per pass of diffusion_returns (bounds the (roots, n) arrays).
+_DIFFUSION_ROOTS_PER_PASS = 64
+
+
+def _sym_quadratic_forms(csr: CSRGraph, x: np.ndarray, t_max: int) -> np.ndarray:
+    """Sums over the rows of x of x . S^t x for t = 0..t_max (x: (k, n))."""
+    stay = csr.deg == 0  # isolated nodes: the walker stays (S(v, v) = 1)
+    inv_sqrt = np.divide(1.0, np.sqrt(csr.deg.astype(float)), out=np.zeros(csr.n), where=~stay)
+    out = np.zeros(int(t_max) + 1)
+    v = x
+    for k in range((int(t_max) + 1) // 2 + 1):
+        if 2 * k <= t_max:
+            out[2 * k] = float((v * v).sum())
+        if 2 * k + 1 > t_max:
+            break
+        w = inv_sqrt * csr.gather_sum(inv_sqrt * v)
+        w[:, stay] += v[:, stay]
+        out[2 * k + 1] = float((v * w).sum())
+        v = w
+    return out
+
+
+def diffusion_returns(csr: CSRGraph, roots: np.ndarray, t_max: int) -> np.ndarray:
+    """Mean over roots of the exact return probability P^t(root, root), t = 0..t_max."""
+    roots = np.asarray(roots, dtype=np.int64)
+    total = np.zeros(int(t_max) + 1)
+    for s in range(0, int(roots.shape[0]), _DIFFUSION_ROOTS_PER_PASS):
+        chunk = roots[s:s + _DIFFUSION_ROOTS_PER_PASS]
+        x = np.zeros((chunk.shape[0], csr.n))
+        x[np.arange(chunk.shape[0]), chunk] = 1.0
+        total += _sym_quadratic_forms(csr, x, t_max)
+    return total / max(1, int(roots.shape[0]))
+
+
+def trace_returns(csr: CSRGraph, probes: int, t_max: int, rng: np.random.Generator) -> np.ndarray:
+    """Hutchinson estimate of tr(P^t) / n for t = 0..t_max (P = D^-1 A, isolated nodes stay)."""
+    z = rng.choice(np.array([-1.0, 1.0]), size=(int(probes), csr.n))
+    return _sym_quadratic_forms(csr, z, t_max) / (csr.n * int(probes))
+
+
+def kpm_moments(csr: CSRGraph, moments: int, probes: int, rng: np.random.Generator) -> np.ndarray:
+    """Chebyshev moments mu_0..mu_(moments-1) of H = -D^-1/2 A D^-1/2, stochastic trace / n."""
+    M = max(2, int(moments))
+    stay = csr.deg == 0
+    inv_sqrt = np.divide(1.0, np.sqrt(csr.deg.astype(float)), out=np.zeros(csr.n), where=~stay)
+
+    def H(v: np.ndarray) -> np.ndarray:
+        w = -inv_sqrt * csr.gather_sum(inv_sqrt * v)
+        w[:, stay] -= v[:, stay]  # isolated node: S(v, v) = 1, so H(v, v) = -1
+        return w
+
+    z = rng.choice(np.array([-1.0, 1.0]), size=(int(probes), csr.n))
+    norm = float(csr.n * int(probes))
+    mu = np.zeros(M)
+    a_prev, a_cur = z, H(z)
+    mu[0] = float((z * z).sum()) / norm
+    mu[1] = float((z * a_cur).sum()) / norm
+    m = 1
+    while 2 * m < M:
+        mu[2 * m] = 2.0 * float((a_cur * a_cur).sum()) / norm - mu[0]
+        if 2 * m + 1 >= M:
+            break
+        a_next = 2.0 * H(a_cur) - a_prev
+        mu[2 * m + 1] = 2.0 * float((a_next * a_cur).sum()) / norm - mu[1]
+        a_prev, a_cur = a_cur, a_next
+        m += 1
+    return mu
+
+
+def jackson_kernel(M: int) -> np.ndarray:
+    m = np.arange(M)
+    q = np.pi / (M + 1)
+    return ((M - m + 1) * np.cos(q * m) + np.sin(q * m) / np.tan(q)) / (M + 1)
+
+
+def kpm_cumulative(mu: np.ndarray, lam: np.ndarray) -> np.ndarray:
+    """N(lambda): Jackson-damped fraction of eigenvalues of L = I + H at or below lambda."""
+    M = int(mu.shape[0])
+    gmu = jackson_kernel(M) * mu
+    theta = np.arccos(np.clip(np.asarray(lam, dtype=float) - 1.0, -1.0, 1.0))
+    m = np.arange(1, M)
+    series = (gmu[1:, None] * np.sin(m[:, None] * theta[None, :]) / m[:, None]).sum(axis=0)
+    return (gmu[0] * (np.pi - theta) - 2.0 * series) / np.pi
+
+
+# Wedges (pairs of forward neighbours) checked per pass of triangle_counts.
+_WEDGES_PER_PASS = 1 << 21
+
+
+def triangle_counts(csr: CSRGraph) -> np.ndarray:
+    """Triangles through each node (self-loops and isolated nodes contribute none)."""
+    n = csr.n
+    tri = np.zeros(n, dtype=np.int64)
+    if n < 3 or not csr.indices.size:
+        return tri
+    rank = np.empty(n, dtype=np.int64)
+    rank[np.argsort(csr.deg, kind="stable")] = np.arange(n)
+    fwd = rank[csr.indices] > rank[csr.rows]
+    src, dst = csr.rows[fwd], csr.indices[fwd]  # forward edges, grouped by src
+    keys = np.sort(rank[src] * n + rank[dst])
+    fptr = np.concatenate(([0], np.cumsum(np.bincount(src, minlength=n))))
+    m = int(src.shape[0])
+    later = fptr[src + 1] - np.arange(m) - 1  # forward neighbours after entry p in its row
+    cum = np.cumsum(later)
+    p0 = 0
+    while p0 < m:
+        base = int(cum[p0 - 1]) if p0 else 0
+        p1 = max(p0 + 1, int(np.searchsorted(cum, base + _WEDGES_PER_PASS, side="right")))
+        cnt = later[p0:p1]
+        tot = int(cnt.sum())
+        if tot:
+            p = np.repeat(np.arange(p0, p1), cnt)
+            q = p + 1 + np.arange(tot) - np.repeat(np.cumsum(cnt) - cnt, cnt)
+            a, b = dst[p], dst[q]
+            ra, rb = rank[a], rank[b]
+            key = np.minimum(ra, rb) * n + np.maximum(ra, rb)
+            pos = np.minimum(np.searchsorted(keys, key), keys.shape[0] - 1)
+            hit = keys[pos] == key
+            for corner in (src[p[hit]], a[hit], b[hit]):
+                tri += np.bincount(corner, minlength=n)
+        p0 = p1
+    return tri
+
+
+def local_clustering(csr: CSRGraph) -> Tuple[np.ndarray, np.ndarray]:
+    """(C_v per node, mask of nodes with k_v >= 2); C_v = 0 where the mask is False."""
+    k = csr.deg
+    loops = np.bincount(csr.rows[csr.rows == csr.indices], minlength=csr.n)
+    links = triangle_counts(csr) + loops * np.maximum(k - 1, 0)
+    valid = k >= 2
+    coeff = np.zeros(csr.n)
+    coeff[valid] = (2.0 * links[valid]) / (k[valid] * (k[valid] - 1))
+    return coeff, valid
+
+
+def mean_clustering(csr: CSRGraph, rows: Optional[np.ndarray] = None) -> float:
+    """Mean of C_v over rows (default: every node), skipping nodes with k_v < 2."""
+    coeff, valid = local_clustering(csr)
+    if rows is not None:
+        coeff, valid = coeff[rows], valid[rows]
+    vals = coeff[valid].tolist()
+    return sum(vals) / len(vals) if vals else 0.0
+
+
+def sampled_clustering(nodes: Iterable[int], adj: Dict[int, Set[int]]) -> float:
+    """Mean C_v over nodes with k_v >= 2 (adj undirected); no CSR, only these nodes' neighbourhoods."""
+    vals = []
+    for v in nodes:
+        nbrs = adj.get(v, set())
+        k = len(nbrs)
+        if k < 2:
+            continue
+        twice = 0
+        for a in nbrs:
+            na = adj.get(a, set())
+            twice += len(na & nbrs) - (a in na)
+        vals.append((2.0 * (twice // 2)) / (k * (k - 1)))
+    return sum(vals) / len(vals) if vals else 0.0
@@ -34,8 +34,15 @@ from .glue_dynamics import (
     initialise_cadence,
     cadence_step,
 )
-from .metrics import compute_lockstep_metrics
-from .event_graph import EventGraph
+from .metrics import StreamingLockstepMetrics, compute_lockstep_metrics, metrics_cfg, metrics_provenance
+from .event_graph import ActiveDomainPools, EventArchive, EventGraph
+from .rng_streams import wrap_rng, rng_provenance, stream_state, restore_stream, global_random_state, restore_global_random
+from .kernels_fused import FusedWorkspace, fused_glue_step, kernels_backend
+from .window_components import WindowComponents
+from .window_indegrees import WindowIndegrees
+from .thread_histories import ThreadHistories
+from .window_snapshot import WindowSnapshot, curve_at, sweep_pairs
+from .checkpoint import Checkpointer, check_resume, load_checkpoint, pack_lists, unpack_lists
 
 
 _DEFAULT_HOP = {"form": "power_law", "alpha": 1.0, "k_prefactor": 2.0, "memory_depth": 1}
@@ -225,6 +232,17 @@ def _cadence_stats(threads: ThreadState) -> Dict[str, Any]:
 
 def _space_cfg(cfg: Dict[str, Any]) -> Dict[str, Any]:
     sp = cfg.get("space", {}) or {}
+    ev = sp.get("eviction", {}) or {}
+    ev_mode = str(ev.get("mode", "off")).lower()
+    if ev_mode not in ("off", "drop", "archive"):
+        raise ValueError("space.eviction.mode must be off | drop | archive")
+    bundle_overlap = str(sp.get("bundle_overlap", "dense")).lower()
+    if bundle_overlap not in ("dense", "sparse"):
+        raise ValueError("space.bundle_overlap must be dense | sparse")
+    selection = str(sp.get("selection", "loop")).lower()
+    if selection not in ("loop", "vectorized"):
+        raise ValueError("space.selection must be loop | vectorized")
+    clustering_sample = sp.get("clustering_sample", 500)
     return {
         "enabled": bool(sp.get("enabled", False)),
         "p_reuse": sp.get("p_reuse", None),  # fixed value if provided
@@ -234,9 +252,84 @@ def _space_cfg(cfg: Dict[str, Any]) -> Dict[str, Any]:
         "beta_junc": float(sp.get("beta_junc", 1.5)),
         "w_star": float(sp.get("w_star", 0.3)),
         "log_island_timeseries": bool(sp.get("log_island_timeseries", False)),
+        # Per-domain indexed candidate pools (O(1) reuse draws; draws differ from the legacy list pick).
+        "candidate_pools": bool(sp.get("candidate_pools", False)),
+        # Bounded memory: evict events that left the window every `every` ticks (default W_coh).
+        "eviction": {"mode": ev_mode, "every": ev.get("every", None)},
+        # Thread-to-event selection: per-thread loop (default) or one vectorized stage per tick.
+        "selection": selection,
+        # Thread-history overlaps: dense N x N counts (default) or only pairs sharing an event.
+        "bundle_overlap": bundle_overlap,
+        # End-of-run clustering over a stride sample of this many events (null or 0: whole window, exact).
+        "clustering_sample": int(clustering_sample) if clustering_sample else None,
     }
 
 
+# End-of-run spatial observables of a space-on run, selectable with observables.select.
+_SPATIAL_OBSERVABLES = ("S_perc", "S_junc_w", "hubshare", "max_indegree", "clustering", "islands")
+
+
+def _opt(x: Any, cast) -> Any:
+    return None if x is None else cast(x)
+
+
+def _observables_cfg(cfg: Dict[str, Any]) -> Set[str]:
+    """
+    Spatial observables to compute at the end of a space-on run (default: all of them):
+      observables:
+        select: [S_perc, hubshare, islands]
+    Unselected scalars are reported as null and unselected islands as {"enabled": false}; the
+    geometry block keeps its own geometry.enabled switch.
+    """
+    sel = (cfg.get("observables", {}) or {}).get("select", None)
+    if sel is None:
+        return set(_SPATIAL_OBSERVABLES)
+    sel = [str(x) for x in sel]
+    unknown = sorted(set(sel) - set(_SPATIAL_OBSERVABLES))
+    if unknown:
+        raise ValueError(f"observables.select: unknown {unknown}; choose from {list(_SPATIAL_OBSERVABLES)}")
+    return set(sel)
+
+
+def _select_next_events(rng, g: EventGraph, t: int, frontiers: List[int], thread_dom: np.ndarray,
+                        p_reuse: float, domain_match: bool, pools: Optional[ActiveDomainPools],
+                        active_list: Optional[List[int]], n_active: int) -> List[int]:
+    """
+    Vectorized space-layer selection (space.selection: vectorized) for all N threads at once.
+
+    Draws: one rng.random(2N) block per tick; u[:N] are the reuse decisions (u_i < p_reuse) and
+    u[N:] the candidate positions (thread i picks cand[floor(u[N+i] * len(cand))] from its
+    domain's candidates, or from all of V_active without domain_match). Threads that do not reuse,
+    have no candidate, or would pick their own frontier get new events, created at t + 1 in thread
+    order with consecutive ids. Same rules as the per-thread loop, different draw layout.
+    """
+    N = len(frontiers)
+    u = rng.random(2 * N)
+    nxt = np.full(N, -1, dtype=np.int64)
+    reuse = u[:N] < p_reuse
+    if n_active > 0 and reuse.any():
+        pick = u[N:]
+        if pools is None:
+            active_arr = np.array(active_list, dtype=np.int64)
+            active_dom = g.core.domain_of(active_arr) if domain_match else None
+        for d in (np.unique(thread_dom[reuse]) if domain_match else (None,)):
+            sel = reuse if d is None else reuse & (thread_dom == d)
+            if pools is not None:
+                pool = pools.all if d is None else pools.domain(int(d))
+                if len(pool):
+                    nxt[sel] = pool.pick_many(pick[sel])
+                continue
+            cand = active_arr if d is None else active_arr[active_dom == d]
+            if cand.size:
+                nxt[sel] = cand[np.minimum((pick[sel] * cand.size).astype(np.int64), cand.size - 1)]
+    # Self-loop guard: a pick equal to the current frontier becomes a new event
+    nxt[nxt == np.asarray(frontiers, dtype=np.int64)] = -1
+    new = nxt < 0
+    if new.any():
+        nxt[new] = g.new_events(t + 1, thread_dom[new])
+    return nxt.tolist()
+
+
 def _derive_p_reuse(space: Dict[str, Any], threads: ThreadState, n_value: float) -> float:
     mode = str(space.get("p_reuse_mode", "fixed")).lower()
     # Fixed: honour explicit p_reuse if provided
@@ -256,61 +349,36 @@ def _derive_p_reuse(space: Dict[str, Any], threads: ThreadState, n_value: float)
     return float(max(0.0, min(0.95, p)))
 
 
-def _histories_init(N: int, W: int, init_ids: List[int]) -> List[List[int]]:
-    return [[init_ids[i]] for i in range(N)]
+def _histories_init(N: int, W: int, init_ids: List[int], sparse: bool = False) -> ThreadHistories:
+    return ThreadHistories(N, W, init_ids, sparse=sparse)
 
 
-def _histories_push(hist: List[List[int]], W: int, events: List[int]) -> None:
-    for i, e in enumerate(events):
-        h = hist[i]
-        h.append(int(e))
-        if len(h) > W:
-            del h[0]
+def _histories_push(hist: ThreadHistories, events: List[int]) -> None:
+    hist.push(events)
 
 
-def _overlap_w(hist_i: Set[int], hist_j: Set[int]) -> float:
-    if not hist_i and not hist_j:
-        return 0.0
-    inter = len(hist_i.intersection(hist_j))
-    uni = len(hist_i.union(hist_j))
-    return inter / float(uni) if uni else 0.0
-
-
-def _bundles_from_histories(hist: List[List[int]], w_star: float) -> Dict[str, Any]:
-    N = len(hist)
-    sets = [set(h) for h in hist]
-    # build adjacency on threads
-    adj = {i: set() for i in range(N)}
-    for i in range(N):
-        for j in range(i + 1, N):
-            w = _overlap_w(sets[i], sets[j])
-            if w > w_star:
-                adj[i].add(j)
-                adj[j].add(i)
-    # connected components
-    seen = set()
-    sizes = []
-    for i in range(N):
-        if i in seen:
-            continue
-        stack = [i]
-        seen.add(i)
-        size = 0
-        while stack:
-            x = stack.pop()
-            size += 1
-            for nb in adj[x]:
-                if nb not in seen:
-                    seen.add(nb)
-                    stack.append(nb)
-        sizes.append(size)
-    sizes.sort(reverse=True)
-    fmax = (sizes[0] / float(N)) if sizes else 0.0
-    # histogram
-    histo = {}
-    for sz in sizes:
-        histo[str(sz)] = histo.get(str(sz), 0) + 1
-    return {"F_max": fmax, "bundle_sizes": sizes, "bundle_hist": histo}
+def _bundles_from_histories(hist: ThreadHistories, w_star: float) -> Dict[str, Any]:
+    return sweep_pairs(len(hist), *hist.pairs(), queries=(w_star,))[1][float(w_star)]
+
+
+def _ancestor_glue_step(rng, threads: ThreadState, bundle: BundleState,
+                        cfg_hop, cfg_shared, cfg_phase, cfg_domains, cfg_cadence) -> float:
+    """One tick of the verbatim BCQM V kernel sequence; updates bundle and returns dX."""
+    cadence_step(rng, threads, cfg_cadence)
+    hop_coherence_step(rng, threads, cfg_hop)
+
+    bundle.m = float(np.mean(threads.v))
+    bundle.theta_mean = float(np.angle(np.mean(np.exp(1j * threads.theta))))
+
+    shared_bias_step(rng, threads, bundle, cfg_shared)
+    phase_lock_step(rng, threads, bundle, cfg_phase)
+    domain_glue_step(rng, threads, cfg_domains)
+
+    bundle.m = float(np.mean(threads.v))
+    bundle.theta_mean = float(np.angle(np.mean(np.exp(1j * threads.theta))))
+    dX = float(np.mean(threads.v))
+    bundle.X += dX
+    return dX
 
 
 def _ts_config(cfg: Dict[str, Any], steps_total: int, burn_in: int) -> Dict[str, Any]:
@@ -318,6 +386,8 @@ def _ts_config(cfg: Dict[str, Any], steps_total: int, burn_in: int) -> Dict[str,
     Time-series logging config.
     Controlled by cfg["output"]["write_timeseries"] and cfg["output"]["timeseries_bins"].
     Bins are placed across the measurement window [burn_in, steps_total).
+    cfg["output"]["sperc_every"] = k > 0 also logs S_perc / comp_size every k measured ticks.
+    cfg["output"]["junction_every"] = k > 0 also logs S_junc_w / hubshare / max_indegree every k measured ticks.
     """
     out = cfg.get("output", {}) or {}
     enabled = bool(out.get("write_timeseries", False))
@@ -325,16 +395,65 @@ def _ts_config(cfg: Dict[str, Any], steps_total: int, burn_in: int) -> Dict[str,
     bins = max(10, min(500, bins))
     T_eff = max(1, steps_total - burn_in)
     interval = max(1, T_eff // bins)
-    return {"enabled": enabled, "bins": bins, "interval": interval}
+    sperc_every = max(0, int(out.get("sperc_every", 0) or 0))
+    junction_every = max(0, int(out.get("junction_every", 0) or 0))
+    return {"enabled": enabled, "bins": bins, "interval": interval, "sperc_every": sperc_every,
+            "junction_every": junction_every}
+
+
+_THREAD_FIELDS = ("v", "theta", "domain", "T", "phi", "active")
+
+
+def _checkpoint_state(run_id: str, cfg: Dict[str, Any], N: int, n: float, seed: int,
+                      t_done: int, t_eff: int, elapsed: float, rng,
+                      threads: ThreadState, bundle: BundleState,
+                      stream: Optional[StreamingLockstepMetrics], m_all, dX_all,
+                      g: Optional[EventGraph], pools: Optional[ActiveDomainPools],
+                      frontiers: List[int], histories: Optional[ThreadHistories],
+                      ts: Dict[str, Any], island_ts: Dict[str, Any]):
+    """(meta, arrays) checkpoint of run_single_v_glue after t_done ticks."""
+    rng_meta, arrays = stream_state(rng)
+    np_meta, np_arrays = global_random_state()
+    arrays.update(np_arrays)
+    for name in _THREAD_FIELDS:
+        val = getattr(threads, name)
+        if val is not None:
+            arrays[f"th_{name}"] = np.asarray(val)
+    if stream is not None:
+        arrays.update(stream.get_state())
+    else:
+        arrays["m_all"] = m_all[:, :t_eff]
+        arrays["dX_all"] = dX_all[:, :t_eff]
+    if g is not None:
+        arrays.update(g.to_arrays())
+        arrays["frontiers"] = np.array(frontiers, dtype=np.int64)
+        arrays.update(pack_lists("hist", histories.lists))
+    if pools is not None:
+        arrays.update(pools.to_arrays())
+    meta = {
+        "engine": "v_glue",
+        "run_id": run_id,
+        "cfg": cfg,
+        "N": int(N),
+        "n": float(n),
+        "seed": int(seed),
+        "t_done": int(t_done),
+        "t_eff": int(t_eff),
+        "elapsed": float(elapsed),
+        "rng": rng_meta,
+        "np_random": np_meta,
+        "bundle": {"X": bundle.X, "m": bundle.m, "theta_mean": bundle.theta_mean},
+        "timeseries": ts,
+        "island_ts": island_ts,
+    }
+    return meta, arrays
 
 
-def run_single_v_glue(cfg: Dict[str, Any], N: int, n: float, seed: int) -> None:
-    variant = cfg["variant"]
-    experiment_id = cfg["experiment_id"]
+def run_single_v_glue(cfg: Dict[str, Any], N: int, n: float, seed: int,
+                      resume: Optional[Path] = None) -> None:
     out_dir = Path(cfg["output"]["out_dir"])
     ensure_dir(out_dir)
-
-    run_id = _run_id(experiment_id, variant, N, n, seed)
+    run_id = _run_id(cfg["experiment_id"], cfg["variant"], N, n, seed)
 
     steps_total = int(cfg["steps_total"])
     burn_in = int(cfg["burn_in_epochs"])
@@ -370,18 +489,27 @@ def run_single_v_glue(cfg: Dict[str, Any], N: int, n: float, seed: int) -> None:
 
     threads = ThreadState(v=v0, theta=theta0, domain=domain0, history_v=None)
     initialise_cadence(rng, threads, cfg_cadence)
+    # Tick-loop draws: legacy Generator calls, or layout-v1 block streams (engine.rng.mode: blocked).
+    rng = wrap_rng(rng, cfg, N)
 
     bundle = BundleState(X=0.0, m=float(np.mean(threads.v)),
                          theta_mean=float(np.angle(np.mean(np.exp(1j * threads.theta)))))
 
-    m_all = np.zeros((1, T_eff), dtype=float)
-    dX_all = np.zeros((1, T_eff), dtype=float)
+    # Lockstep metrics: full m(t)/dX(t) arrays + FFT (batch), or online accumulators (streaming).
+    mc = metrics_cfg(cfg)
+    if mc["mode"] == "streaming":
+        stream = StreamingLockstepMetrics(rows=1, max_lag=mc["max_lag"], chunk=mc["chunk"])
+    else:
+        stream = None
+        m_all = np.zeros((1, T_eff), dtype=float)
+        dX_all = np.zeros((1, T_eff), dtype=float)
 
     # Optional space layer
     space = _space_cfg(cfg)
+    selected = _observables_cfg(cfg)
     g = EventGraph() if space["enabled"] else None
     frontiers: List[int] = []
-    histories: List[List[int]] = []
+    histories: Optional[ThreadHistories] = None
     
     # Time-series logging (binned) across measurement window
     ts_cfg = _ts_config(cfg, steps_total, burn_in)
@@ -391,10 +519,25 @@ def run_single_v_glue(cfg: Dict[str, Any], N: int, n: float, seed: int) -> None:
             "interval": int(ts_cfg["interval"]),
             "records": [],  # list of per-sample dicts
         })
+    if space["enabled"] and ts_cfg["sperc_every"]:
+        ts["sperc"] = {"every": int(ts_cfg["sperc_every"]), "t": [], "V_active_size": [],
+                       "comp_size": [], "S_perc": []}
+    if space["enabled"] and ts_cfg["junction_every"]:
+        ts["junction"] = {"every": int(ts_cfg["junction_every"]), "beta_junc": float(space["beta_junc"]), "t": [],
+                          "V_active_size": [], "S_junc_w": [], "hubshare": [], "max_indegree": []}
     if space["enabled"]:
         # one initial event per thread
         frontiers = [g.new_event(0, domain=int(threads.domain[i])) for i in range(N)]  # type: ignore
-        histories = _histories_init(N, W_coh, frontiers)
+        histories = _histories_init(N, W_coh, frontiers, sparse=space["bundle_overlap"] == "sparse")
+    pools = ActiveDomainPools(g) if (space["enabled"] and space["candidate_pools"]) else None
+    evict_every = 0
+    archive: Optional[EventArchive] = None
+    if space["enabled"] and space["eviction"]["mode"] != "off":
+        evict_every = max(1, int(space["eviction"]["every"] or W_coh))
+        if space["eviction"]["mode"] == "archive":
+            archive = EventArchive(out_dir / f"EVICTED_{run_id}")
+            if resume is None:
+                archive.start()
 
     t_eff = 0
     t0_wall = time.time()
@@ -402,52 +545,104 @@ def run_single_v_glue(cfg: Dict[str, Any], N: int, n: float, seed: int) -> None:
     # Optional island time-series (binned) — minimal: record at end-of-run unless enabled
     island_ts = {"t": [], "F_max": [], "N_bund": []}
 
-    for t in range(steps_total):
-        cadence_step(rng, threads, cfg_cadence)
-        hop_coherence_step(rng, threads, cfg_hop)
-
-        bundle.m = float(np.mean(threads.v))
-        bundle.theta_mean = float(np.angle(np.mean(np.exp(1j * threads.theta))))
-
-        shared_bias_step(rng, threads, bundle, cfg_shared)
-        phase_lock_step(rng, threads, bundle, cfg_phase)
-        domain_glue_step(rng, threads, cfg_domains)
-
-        bundle.m = float(np.mean(threads.v))
-        bundle.theta_mean = float(np.angle(np.mean(np.exp(1j * threads.theta))))
-        dX = float(np.mean(threads.v))
-        bundle.X += dX
+    # Checkpoint/resume (engine.checkpoint): restore the loop state saved after t_start ticks.
+    ckpt = Checkpointer(cfg, out_dir, run_id)
+    t_start = 0
+    elapsed_prior = 0.0
+    if resume is not None:
+        meta, arrays = load_checkpoint(resume)
+        check_resume(meta, "v_glue", run_id)
+        restore_stream(rng, meta["rng"], arrays)
+        restore_global_random(meta["np_random"], arrays)
+        for name in _THREAD_FIELDS:
+            setattr(threads, name, arrays.get(f"th_{name}"))
+        bundle = BundleState(**meta["bundle"])
+        if stream is not None:
+            stream.set_state(arrays)
+        else:
+            m_all[:, :meta["t_eff"]] = arrays["m_all"]
+            dX_all[:, :meta["t_eff"]] = arrays["dX_all"]
+        if g is not None:
+            g = EventGraph.from_arrays(arrays)
+            if pools is not None:
+                pools = ActiveDomainPools.from_arrays(g, arrays)
+            frontiers = arrays["frontiers"].tolist()
+            histories = ThreadHistories.from_lists(W_coh, unpack_lists("hist", arrays),
+                                                   sparse=space["bundle_overlap"] == "sparse")
+            if archive is not None:
+                archive.truncate(meta["archive_sizes"])
+        ts = meta["timeseries"]
+        island_ts = meta["island_ts"]
+        t_start = int(meta["t_done"])
+        t_eff = int(meta["t_eff"])
+        elapsed_prior = float(meta["elapsed"])
+
+    # Per-tick S_perc from the incremental component tracker (output.sperc_every); it rebuilds itself
+    # from the graph on first use, so it needs no checkpoint state.
+    comps = WindowComponents(g, W_coh) if (g is not None and ts_cfg["sperc_every"]) else None
+    # Per-tick junction statistics from the incremental window indegree histogram (output.junction_every)
+    juncs = WindowIndegrees(g.core, W_coh) if (g is not None and ts_cfg["junction_every"]) else None
+
+    # Glue kernels: verbatim ancestor sequence, or the fused single-pass step (engine.kernels: fused).
+    fused_ws = FusedWorkspace.for_run(threads, bundle, cfg_domains) if kernels_backend(cfg) == "fused" else None
+
+    for t in range(t_start, steps_total):
+        if fused_ws is not None:
+            dX = fused_glue_step(rng, threads, bundle, fused_ws,
+                                 cfg_hop, cfg_shared, cfg_phase, cfg_domains, cfg_cadence)
+        else:
+            dX = _ancestor_glue_step(rng, threads, bundle,
+                                     cfg_hop, cfg_shared, cfg_phase, cfg_domains, cfg_cadence)
 
         # Space layer step: select next events and add edges
         if space["enabled"]:
             assert g is not None
             p_reuse = _derive_p_reuse(space, threads, n)
-            # Build V_active from recency
-            active = g.v_active(t, W_coh, frontiers)
-            active_list = list(active)
+            if pools is not None:
+                n_active = pools.sync(t, W_coh, frontiers)
+            else:
+                # Build V_active from recency
+                active = g.v_active(t, W_coh, frontiers)
+                active_list = list(active)
+                n_active = len(active_list)
+                active_dom = None
 
             next_events: List[int] = []
-            for i in range(N):
-                use_reuse = (rng.random() < p_reuse) and len(active_list) > 0
-                if use_reuse:
-                    # domain match filter if requested
-                    if space["domain_match"]:
-                        dom_i = int(threads.domain[i])
-                        cand = [e for e in active_list if g.nodes[e].domain == dom_i]  # type: ignore
-                        if cand:
-                            e_next = int(rng.choice(cand))
+            if space["selection"] == "vectorized":
+                next_events = _select_next_events(
+                    rng, g, t, frontiers, np.asarray(threads.domain, dtype=np.int64), p_reuse,
+                    space["domain_match"], pools, None if pools is not None else active_list, n_active)
+            else:
+                for i in range(N):
+                    use_reuse = (rng.random() < p_reuse) and n_active > 0
+                    if use_reuse and pools is not None:
+                        pool = pools.domain(int(threads.domain[i])) if space["domain_match"] else pools.all
+                        if len(pool):
+                            e_next = pool.pick(rng)
                         else:
-                            e_next = g.new_event(t + 1, domain=int(dom_i))
+                            e_next = g.new_event(t + 1, domain=int(threads.domain[i]))
+                    elif use_reuse:
+                        # domain match filter if requested
+                        if space["domain_match"]:
+                            dom_i = int(threads.domain[i])
+                            if active_dom is None:
+                                active_arr = np.array(active_list, dtype=np.int64)
+                                active_dom = g.core.domain_of(active_arr)
+                            cand = active_arr[active_dom == dom_i].tolist()
+                            if cand:
+                                e_next = int(rng.choice(cand))
+                            else:
+                                e_next = g.new_event(t + 1, domain=int(dom_i))
+                        else:
+                            e_next = int(rng.choice(active_list))
                     else:
-                        e_next = int(rng.choice(active_list))
-                else:
-                    e_next = g.new_event(t + 1, domain=int(threads.domain[i]))
+                        e_next = g.new_event(t + 1, domain=int(threads.domain[i]))
 
-                # Self-loop guard: if chosen equals current frontier, force new
-                if e_next == frontiers[i]:
-                    e_next = g.new_event(t + 1, domain=int(threads.domain[i]))
+                    # Self-loop guard: if chosen equals current frontier, force new
+                    if e_next == frontiers[i]:
+                        e_next = g.new_event(t + 1, domain=int(threads.domain[i]))
 
-                next_events.append(e_next)
+                    next_events.append(e_next)
 
             # Optional co-create merge (default off): if enabled, merge all NEW choices into one node per domain
             if space["allow_cocreate_merge"]:
@@ -463,25 +658,55 @@ def run_single_v_glue(cfg: Dict[str, Any], N: int, n: float, seed: int) -> None:
                             next_events[i] = dom_to_new[dom]
 
             # Commit edges and update frontiers/histories
-            for i in range(N):
-                g.add_edge(frontiers[i], next_events[i], t + 1)
+            if space["selection"] == "vectorized":
+                g.add_edges(frontiers, next_events, t + 1)
+            else:
+                for i in range(N):
+                    g.add_edge(frontiers[i], next_events[i], t + 1)
+            if comps is not None:
+                comps.add_edges(zip(frontiers, next_events))
+            if juncs is not None:
+                juncs.add_edges(zip(frontiers, next_events))
             frontiers = next_events
-            _histories_push(histories, W_coh, frontiers)
+            _histories_push(histories, frontiers)
+            if evict_every and (t + 1) % evict_every == 0:
+                g.evict(t - W_coh, frontiers, archive)
+
+            comp_t = None
+            if comps is not None and (t >= burn_in) and ((t - burn_in) % ts_cfg["sperc_every"] == 0):
+                comp_t = comps.query(t, frontiers)
+                sp = ts["sperc"]
+                sp["t"].append(int(t))
+                sp["V_active_size"].append(int(comp_t[0]))
+                sp["comp_size"].append(int(comp_t[1]))
+                sp["S_perc"].append(comp_t[1] / float(comp_t[0]) if comp_t[0] else 0.0)
+
+            if juncs is not None and (t >= burn_in) and ((t - burn_in) % ts_cfg["junction_every"] == 0):
+                jc = ts["junction"]
+                jc["t"].append(int(t))
+                jc["V_active_size"].append(int(juncs.query(t, frontiers)))
+                jc["S_junc_w"].append(juncs.s_junc_w(space["beta_junc"]))
+                jc["hubshare"].append(juncs.hubshare())
+                jc["max_indegree"].append(int(juncs.max_indegree()))
 
             # Optional binned time series record
             if ts_cfg["enabled"] and (t >= burn_in) and ((t - burn_in) % ts_cfg["interval"] == 0):
-                active_ts = g.v_active(t, W_coh, frontiers)
-                s_perc_t = g.s_perc(active_ts)
-                s_junc_t = g.s_junc_w(active_ts, beta=space["beta_junc"])
-                comp_ts = g.largest_component_nodes(active_ts)
-                comp_size_t = len(comp_ts)
+                snap = WindowSnapshot(g, t, W_coh, frontiers, histories)
+                if comps is not None:
+                    n_act_t, comp_size_t = comp_t if comp_t is not None else comps.query(t, frontiers)
+                    s_perc_t = comp_size_t / float(n_act_t) if n_act_t else 0.0
+                else:
+                    s_perc_t = snap.s_perc()
+                    comp_size_t = len(snap.largest_component)
+                s_junc_t = snap.s_junc_w(beta=space["beta_junc"])
                 wstars = [0.10, 0.20, 0.30]
+                curve = snap.bundle_curve()
                 f_by_w = {}
                 for w in wstars:
-                    f_by_w[f"{w:.2f}"] = float(_bundles_from_histories(histories, w)["F_max"])
+                    f_by_w[f"{w:.2f}"] = float(curve_at(curve, w)[0])
                 ts["records"].append({
                     "t": int(t),
-                    "V_active_size": int(len(active_ts)),
+                    "V_active_size": int(len(snap.active)),
                     "comp_size": int(comp_size_t),
                     "S_perc": float(s_perc_t),
                     "S_junc_w": float(s_junc_t),
@@ -495,18 +720,26 @@ def run_single_v_glue(cfg: Dict[str, Any], N: int, n: float, seed: int) -> None:
                 island_ts["N_bund"].append(int(len(b["bundle_sizes"])))
 
         if t >= burn_in:
-            m_all[0, t_eff] = bundle.m
-            dX_all[0, t_eff] = dX
+            if stream is not None:
+                stream.push(bundle.m, dX)
+            else:
+                m_all[0, t_eff] = bundle.m
+                dX_all[0, t_eff] = dX
             t_eff += 1
 
-    elapsed = time.time() - t0_wall
+        if ckpt.due(t + 1, steps_total):
+            meta, arrays = _checkpoint_state(
+                run_id, cfg, N, n, seed, t + 1, t_eff, elapsed_prior + time.time() - t0_wall, rng,
+                threads, bundle, stream, None if stream is not None else m_all,
+                None if stream is not None else dX_all, g, pools, frontiers, histories, ts, island_ts)
+            if archive is not None:
+                meta["archive_sizes"] = archive.sizes()
+            ckpt.save(meta, arrays)
+
+    elapsed = elapsed_prior + time.time() - t0_wall
     assert t_eff == T_eff
 
-    met = compute_lockstep_metrics(m_all, dX_all)
-    Q_clock = float(met.get("Q_clock", 0.0))
-    ell_lock = float(met.get("ell_lock", 0.0))
-    L_inst = float(met.get("L_inst", 0.0))
-    L = Q_clock / (math.sqrt(N) if N > 0 else 1.0)
+    met = stream.result() if stream is not None else compute_lockstep_metrics(m_all, dX_all)
 
     diag = {
         "cadence": _cadence_stats(threads),
@@ -519,12 +752,14 @@ def run_single_v_glue(cfg: Dict[str, Any], N: int, n: float, seed: int) -> None:
     space_out = {"enabled": bool(space["enabled"])}
     if space["enabled"]:
         assert g is not None
-        active_end = g.v_active(steps_total, W_coh, frontiers)
-        S_perc = g.s_perc(active_end)
-        S_junc_w = g.s_junc_w(active_end, beta=space["beta_junc"])
-        hub = g.hubshare(active_end)
-        max_indeg = g.max_indegree(active_end)
-        clust = g.clustering_coeff(active_end)
+        # One memoized adjacency / component view of the final window serves every observable below
+        snap = WindowSnapshot(g, steps_total, W_coh, frontiers, histories)
+        active_end = snap.active
+        S_perc = snap.s_perc() if "S_perc" in selected else None
+        S_junc_w = snap.s_junc_w(beta=space["beta_junc"]) if "S_junc_w" in selected else None
+        hub = snap.hubshare() if "hubshare" in selected else None
+        max_indeg = snap.max_indegree() if "max_indegree" in selected else None
+        clust = snap.clustering(sample=space["clustering_sample"]) if "clustering" in selected else None
         # Geometry probe: spectral dimension estimate on largest component (optional)
         geom_cfg = cfg.get('geometry', {}) or {}
         geom_enabled = bool(geom_cfg.get('enabled', False))
@@ -534,12 +769,11 @@ def run_single_v_glue(cfg: Dict[str, Any], N: int, n: float, seed: int) -> None:
             if geom_mode == 'ball_growth_only':
                 # Ball-growth only: skip ds fitting; always attach ball-growth profile for structural geometry.
                 try:
-                    geometry_out['comp_size'] = int(len(g.largest_component_nodes(active_end)))
+                    geometry_out['comp_size'] = int(len(snap.largest_component))
                 except Exception:
                     geometry_out['comp_size'] = None
                 try:
-                    geometry_out['ball_growth'] = g.ball_growth_profile(
-                        active_end,
+                    geometry_out['ball_growth'] = snap.ball_growth_profile(
                         r_max=int(geom_cfg.get('ball_r_max', 30)),
                         samples=int(geom_cfg.get('ball_samples', 40)),
                         seed=int(seed) + 54321,
@@ -548,19 +782,37 @@ def run_single_v_glue(cfg: Dict[str, Any], N: int, n: float, seed: int) -> None:
                     geometry_out['ball_growth'] = {'error': type(e).__name__}
             else:
                 req = float(geom_cfg.get('require_sperc', 0.8))
-                if float(S_perc) >= req:
-                    geometry_out.update(g.estimate_spectral_dimension(
-                        active_end,
+                if float(snap.s_perc()) >= req:
+                    ds_method = str(geom_cfg.get('ds_method', 'walk'))
+                    ds_kwargs = {}
+                    if ds_method != 'walk':
+                        # The array methods take the walker count from geometry.n_walkers
+                        ds_kwargs = {'method': ds_method, 'walkers': int(geom_cfg.get('n_walkers', 300))}
+                    if ds_method == 'diffusion':
+                        ds_kwargs.update(roots=int(geom_cfg.get('ds_roots', 64)),
+                                         probes=int(geom_cfg.get('ds_probes', 0)))
+                    geometry_out.update(snap.estimate_spectral_dimension(
                         t_max=int(geom_cfg.get('t_max', 60)),
                         n_walkers=int(geom_cfg.get('n_walkers', 300)),
                         fit_t_min=int(geom_cfg.get('fit_t_min', 5)),
                         fit_t_max=int(geom_cfg.get('fit_t_max', 30)),
                         seed=int(seed) + 12345,
+                        **ds_kwargs,
                     ))
+                    # Second, independent ds estimate from the KPM density of states (optional)
+                    kpm_cfg = geom_cfg.get('kpm', False)
+                    if kpm_cfg:
+                        kpm_cfg = kpm_cfg if isinstance(kpm_cfg, dict) else {}
+                        geometry_out['kpm'] = snap.spectral_density_kpm(
+                            moments=int(kpm_cfg.get('moments', 256)),
+                            probes=int(kpm_cfg.get('probes', 16)),
+                            lambda_min=kpm_cfg.get('lambda_min', None),
+                            lambda_max=float(kpm_cfg.get('lambda_max', 0.1)),
+                            seed=int(seed) + 23456,
+                        )
                     # Also attach ball-growth profile if available (diagnostic)
                     try:
-                        geometry_out['ball_growth'] = g.ball_growth_profile(
-                            active_end,
+                        geometry_out['ball_growth'] = snap.ball_growth_profile(
                             r_max=int(geom_cfg.get('ball_r_max', 30)),
                             samples=int(geom_cfg.get('ball_samples', 40)),
                             seed=int(seed) + 54321,
@@ -571,33 +823,48 @@ def run_single_v_glue(cfg: Dict[str, Any], N: int, n: float, seed: int) -> None:
                     geometry_out['reason'] = f'below_sperc_threshold({req})'
         else:
             geometry_out['reason'] = 'disabled'
-                # Multi-threshold island diagnostics (Option A): report F_max at w_star in {0.10, 0.20, 0.30}
-        wstars = [0.10, 0.20, 0.30]
-        bundles_by_w = {f"{w:.2f}": _bundles_from_histories(histories, w) for w in wstars}
-        # Primary (configured) threshold
-        bundles = _bundles_from_histories(histories, space["w_star"])
         space_out.update({
             "V_active_size": int(len(active_end)),
-            "S_perc": float(S_perc),
-            "S_junc_w": float(S_junc_w),
-            "hubshare": float(hub),
-            "max_indegree": int(max_indeg),
-            "clustering": float(clust),
+            "S_perc": _opt(S_perc, float),
+            "S_junc_w": _opt(S_junc_w, float),
+            "hubshare": _opt(hub, float),
+            "max_indegree": _opt(max_indeg, int),
+            "clustering": _opt(clust, float),
             "p_reuse_policy": str(space.get("p_reuse_mode","fixed")),
             "p_reuse_value_last": float(_derive_p_reuse(space, threads, n)),
             "domain_match": bool(space["domain_match"]),
             "allow_cocreate_merge": bool(space["allow_cocreate_merge"]),
         })
-        islands_out = {
-            "w_star": float(space["w_star"]),
-            "F_max_by_wstar": {k: float(v["F_max"]) for k, v in bundles_by_w.items()},
-            "bundle_hist_by_wstar": {k: v["bundle_hist"] for k, v in bundles_by_w.items()},
-            "F_max": float(bundles["F_max"]),
-            "bundle_hist": bundles["bundle_hist"],
-            "bundle_sizes": bundles["bundle_sizes"],
-        }
-        if space["log_island_timeseries"]:
-            islands_out["timeseries"] = island_ts
+        if evict_every:
+            space_out["eviction"] = {
+                "mode": space["eviction"]["mode"],
+                "every": int(evict_every),
+                "evicted_nodes": int(g.n_evicted_nodes),
+                "evicted_edges": int(g.n_evicted_edges),
+                "retained_nodes": int(len(g.nodes)),
+                "retained_edges": int(len(g.edges)),
+            }
+        if "islands" not in selected:
+            islands_out = {"enabled": False}
+        else:
+            # Multi-threshold island diagnostics (Option A): report F_max at w_star in {0.10, 0.20, 0.30}
+            wstars = [0.10, 0.20, 0.30]
+            curve, by_w = snap.bundle_sweep(wstars + [space["w_star"]])
+            bundles_by_w = {f"{w:.2f}": by_w[w] for w in wstars}
+            # Primary (configured) threshold
+            bundles = by_w[float(space["w_star"])]
+            islands_out = {
+                "w_star": float(space["w_star"]),
+                "F_max_by_wstar": {k: float(v["F_max"]) for k, v in bundles_by_w.items()},
+                "bundle_hist_by_wstar": {k: v["bundle_hist"] for k, v in bundles_by_w.items()},
+                "F_max": float(bundles["F_max"]),
+                "bundle_hist": bundles["bundle_hist"],
+                "bundle_sizes": bundles["bundle_sizes"],
+                # Full step curve F_max(w*) / N_bund(w*); read any threshold with window_snapshot.curve_at
+                "F_max_curve": curve,
+            }
+            if space["log_island_timeseries"]:
+                islands_out["timeseries"] = island_ts
     else:
         S_perc = 0.0
         S_junc_w = 0.0
@@ -606,6 +873,67 @@ def run_single_v_glue(cfg: Dict[str, Any], N: int, n: float, seed: int) -> None:
         clust = None
         islands_out = {"enabled": False}
 
+    spatial = {
+        "space_state": space_out,
+        "geometry": geometry_out,
+        "islands": islands_out,
+        "timeseries": ts,
+        "S_perc": _opt(S_perc, float),
+        "S_junc_w": _opt(S_junc_w, float),
+        "hubshare": _opt(hub, float),
+        "max_indegree": _opt(max_indeg, int),
+        "clustering": _opt(clust, float),
+    }
+    extra: Dict[str, Any] = {}
+    if rng_provenance(cfg) is not None:
+        extra["rng_stream"] = rng_provenance(cfg)
+    if fused_ws is not None:
+        extra["kernels"] = "fused"
+    if metrics_provenance(cfg) is not None:
+        extra["metrics"] = metrics_provenance(cfg)
+    _write_run_outputs(cfg, N, n, seed, blocks, W_coh, met, diag, spatial, elapsed, v_glue_extra=extra)
+    ckpt.finish()
+
+
+def _nospace_spatial(ts: Dict[str, Any]) -> Dict[str, Any]:
+    """Spatial/island blocks of RUN_METRICS for a run with the space layer disabled."""
+    return {
+        "space_state": {"enabled": False},
+        "geometry": {"enabled": False},
+        "islands": {"enabled": False},
+        "timeseries": ts,
+        "S_perc": 0.0,
+        "S_junc_w": 0.0,
+        "hubshare": 0.0,
+        "max_indegree": 0,
+        "clustering": None,
+    }
+
+
+def _write_run_outputs(
+    cfg: Dict[str, Any],
+    N: int,
+    n: float,
+    seed: int,
+    blocks: Dict[str, Any],
+    W_coh: int,
+    met: Dict[str, float],
+    diag: Dict[str, Any],
+    spatial: Dict[str, Any],
+    elapsed: float,
+    v_glue_extra: Optional[Dict[str, Any]] = None,
+) -> None:
+    """Write RUN_CONFIG_*.json and RUN_METRICS_*.json for one (N, n, seed) run."""
+    variant = cfg["variant"]
+    experiment_id = cfg["experiment_id"]
+    out_dir = Path(cfg["output"]["out_dir"])
+    run_id = _run_id(experiment_id, variant, N, n, seed)
+
+    Q_clock = float(met.get("Q_clock", 0.0))
+    ell_lock = float(met.get("ell_lock", 0.0))
+    L_inst = float(met.get("L_inst", 0.0))
+    L = Q_clock / (math.sqrt(N) if N > 0 else 1.0)
+
     metrics_obj: Dict[str, Any] = {
         "run_id": run_id,
         "variant": variant,
@@ -613,23 +941,23 @@ def run_single_v_glue(cfg: Dict[str, Any], N: int, n: float, seed: int) -> None:
         "N": int(N),
         "n": float(n),
         "seed": int(seed),
-        "steps_total": steps_total,
-        "burn_in_epochs": burn_in,
-        "measure_epochs": measure,
+        "steps_total": int(cfg["steps_total"]),
+        "burn_in_epochs": int(cfg["burn_in_epochs"]),
+        "measure_epochs": int(cfg["measure_epochs"]),
         "Q_clock": Q_clock,
         "L": float(L),
         "ell_lock": ell_lock,
         "L_inst": L_inst,
         "glue_state": diag,
-        "space_state": space_out,
-        "geometry": geometry_out,
-        "islands": islands_out,
-        "timeseries": ts,
-        "S_perc": float(S_perc),
-        "S_junc_w": float(S_junc_w),
-        "hubshare": float(hub),
-        "max_indegree": int(max_indeg),
-        "clustering": None if clust is None else float(clust),
+        "space_state": spatial["space_state"],
+        "geometry": spatial["geometry"],
+        "islands": spatial["islands"],
+        "timeseries": spatial["timeseries"],
+        "S_perc": spatial["S_perc"],
+        "S_junc_w": spatial["S_junc_w"],
+        "hubshare": spatial["hubshare"],
+        "max_indegree": spatial["max_indegree"],
+        "clustering": spatial["clustering"],
         "anomaly_flags": {
             "star_collapse": False,
             "runaway_hubbing": False,
@@ -638,6 +966,20 @@ def run_single_v_glue(cfg: Dict[str, Any], N: int, n: float, seed: int) -> None:
         "elapsed_seconds": float(elapsed),
     }
 
+    v_glue_obj: Dict[str, Any] = {
+        "used_provenance_v_config": bool(blocks["used_provenance"]),
+        "scaled_fallback_by_n": bool(blocks["scaled_fallback_by_n"]),
+        "W_coh": int(W_coh),
+        "ablation": cfg.get("ablation", {}),
+        "hop_coherence": vars(blocks["hop"]),
+        "shared_bias": vars(blocks["shared"]),
+        "phase_lock": vars(blocks["phase"]),
+        "domains": vars(blocks["domains"]),
+        "cadence": vars(blocks["cadence"]),
+    }
+    if v_glue_extra:
+        v_glue_obj.update(v_glue_extra)
+
     cfg_obj: Dict[str, Any] = {
         "run_id": run_id,
         "schema_version": cfg.get("schema_version"),
@@ -649,17 +991,7 @@ def run_single_v_glue(cfg: Dict[str, Any], N: int, n: float, seed: int) -> None:
         "n": float(n),
         "seed": int(seed),
         "resolved": cfg,
-        "v_glue": {
-            "used_provenance_v_config": bool(blocks["used_provenance"]),
-            "scaled_fallback_by_n": bool(blocks["scaled_fallback_by_n"]),
-            "W_coh": int(W_coh),
-            "ablation": cfg.get("ablation", {}),
-            "hop_coherence": vars(cfg_hop),
-            "shared_bias": vars(cfg_shared),
-            "phase_lock": vars(cfg_phase),
-            "domains": vars(cfg_domains),
-            "cadence": vars(cfg_cadence),
-        },
+        "v_glue": v_glue_obj,
         "platform": {"python": os.sys.version.split()[0]},
     }
 
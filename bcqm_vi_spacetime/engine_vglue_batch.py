@@ -0,0 +1,397 @@
+from __future__ import annotations
+
+"""
+engine_vglue_batch.py (BCQM VI)
+
+Vectorised nospace v_glue engine: many runs advanced in lockstep as 2-D (row × thread) arrays.
+
+Why:
+- For small N (4, 8) the single-seed engine spends almost all of its time in NumPy call
+  overhead on length-N arrays. Moving many runs together amortises that overhead.
+
+Rows:
+- One row per (cfg, N, n, seed) grid point. Rows may differ in seed, N, n and W_coh (and in any
+  other v_glue block parameter): state arrays are padded to the largest N with a thread mask,
+  and every kernel parameter is a per-row vector.
+- Per-row reductions (means over threads) are evaluated per thread-count group on the unpadded
+  slice, so they match np.mean over the row in run_single_v_glue bit for bit.
+
+Parity with run_single_v_glue:
+- Each row owns its own np.random.default_rng(seed) and draws exactly what the ancestor
+  kernels draw for that seed, in the same order. Row r therefore reproduces the trajectory
+  (and RUN_METRICS) of run_single_v_glue(cfg, N, n, seed) bit for bit.
+- Exception: the ancestor domain_glue_step draws from the *global* np.random stream, which is
+  never seeded. The batched domain step draws from the same global stream (one uniform per
+  thread), so runs with domains enabled are not seed-reproducible in either engine.
+
+Scope:
+- Nospace only. Space-on points (cfg.space.enabled: true) run through run_single_v_glue, and so
+  do points with engine.checkpoint.every > 0 or engine.kernels: fused, which the batched engine
+  does not implement.
+- Rows are stacked only when they share steps_total, burn_in_epochs, engine.rng and engine.metrics.
+- engine.rng.mode: blocked serves all tick-loop draws from per-row layout-v1 block streams
+  (see rng_streams.py) with one gather per kernel instead of one Generator call per row.
+
+YAML (per config):
+  engine:
+    mode: v_glue
+    batch:
+      enabled: true
+      size: 256     # max rows per vectorised job (default: all rows of the config)
+
+CLI (many configs as one job):
+  python3 -m bcqm_vi_spacetime.cli sweep --config a.yml --config b.yml ...
+"""
+
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .io import ensure_dir
+from .state import ThreadState
+from .glue_dynamics import initialise_cadence
+from .metrics import StreamingLockstepMetrics, compute_lockstep_metrics, metrics_cfg, metrics_provenance
+from .rng_streams import RowBlockStreams, rng_cfg, rng_provenance
+from .checkpoint import checkpoint_cfg
+from .kernels_fused import kernels_backend
+from .engine_vglue import (
+    _load_v_blocks,
+    _compute_q_base,
+    _space_cfg,
+    _ts_config,
+    _cadence_stats,
+    _kuramoto_R,
+    _domain_stats,
+    _nospace_spatial,
+    _write_run_outputs,
+    run_single_v_glue,
+)
+
+
+@dataclass
+class SweepPoint:
+    """One (cfg, N, n, seed) run of a v_glue config."""
+    cfg: Dict[str, Any]
+    N: int
+    n: float
+    seed: int
+
+
+@dataclass
+class EnsembleState:
+    """Thread state for R rows in lockstep; every array is (R, N_max), padding masked out."""
+    v: np.ndarray
+    theta: np.ndarray
+    domain: np.ndarray
+    T: np.ndarray
+    phi: np.ndarray
+    active: np.ndarray
+    mask: np.ndarray
+
+
+def batch_cfg(cfg: Dict[str, Any]) -> Dict[str, Any]:
+    engine = cfg.get("engine", {}) or {}
+    b = engine.get("batch", {}) or {}
+    size = b.get("size", None)
+    return {
+        "enabled": bool(b.get("enabled", False)),
+        "size": None if size is None else max(1, int(size)),
+    }
+
+
+def _w_coh(cfg: Dict[str, Any]) -> int:
+    return int(cfg.get("W_coh", cfg.get("active_window", {}).get("hops", 256)))
+
+
+class _Rows:
+    """Per-row widths, generators and thread-count groups for masked reductions."""
+
+    def __init__(self, widths: List[int], seeds: List[int]) -> None:
+        self.widths = np.asarray(widths, dtype=int)
+        self.R = len(widths)
+        self.N_max = int(self.widths.max())
+        self.gens = [np.random.default_rng(int(s)) for s in seeds]
+        self.groups: List[Tuple[int, np.ndarray]] = [
+            (int(w), np.flatnonzero(self.widths == w)) for w in np.unique(self.widths)
+        ]
+        self.streams: Optional[RowBlockStreams] = None
+
+    def start_blocked(self, block_ticks: int) -> None:
+        """Switch tick-loop draws to layout-v1 block streams (after the initial state is drawn)."""
+        self.streams = RowBlockStreams(self.gens, self.widths, block_ticks)
+
+    def mean(self, x: np.ndarray) -> np.ndarray:
+        # np.mean over the unpadded slice matches np.mean of each 1-D row bit for bit.
+        out = np.empty(self.R, dtype=np.result_type(x.dtype, float))
+        for w, rows in self.groups:
+            out[rows] = np.mean(x[rows, :w], axis=1)
+        return out
+
+    def theta_mean(self, theta: np.ndarray) -> np.ndarray:
+        return np.angle(self.mean(np.exp(1j * theta)))
+
+    def uniform(self, rows: np.ndarray) -> np.ndarray:
+        """rng.random(N_r) from each selected row's own generator; other entries are NaN."""
+        if self.streams is not None:
+            return self.streams.uniform(rows)
+        r = np.full((self.R, self.N_max), np.nan)
+        for e in np.flatnonzero(rows):
+            w = self.widths[e]
+            r[e, :w] = self.gens[e].random(w)
+        return r
+
+    def normal(self, rows: np.ndarray) -> np.ndarray:
+        if self.streams is not None:
+            return self.streams.normal(rows)
+        z = np.zeros((self.R, self.N_max))
+        for e in np.flatnonzero(rows):
+            w = self.widths[e]
+            z[e, :w] = self.gens[e].normal(size=w)
+        return z
+
+
+def _col(vals: List[float]) -> np.ndarray:
+    return np.asarray(vals, dtype=float)[:, None]
+
+
+def _row_params(blocks: List[Dict[str, SimpleNamespace]]) -> SimpleNamespace:
+    hop = [b["hop"] for b in blocks]
+    shared = [b["shared"] for b in blocks]
+    phase = [b["phase"] for b in blocks]
+    dom = [b["domains"] for b in blocks]
+    cad = [b["cadence"] for b in blocks]
+    return SimpleNamespace(
+        q_base=_col([h.q_base for h in hop]),
+        shared_on=np.array([bool(s.enabled) for s in shared]),
+        flip_bias=_col([np.clip(float(s.lambda_bias), 0.0, 1.0) if s.enabled else 0.0 for s in shared]),
+        phase_on=np.array([bool(p.enabled) for p in phase]),
+        omega_0=_col([float(p.omega_0) if p.enabled else 0.0 for p in phase]),
+        lambda_phase=_col([float(p.lambda_phase) if p.enabled else 0.0 for p in phase]),
+        noise_sigma=_col([float(getattr(p, "noise_sigma", 0.0)) if p.enabled else 0.0 for p in phase]),
+        theta_join=_col([float(p.theta_join) if p.enabled else 0.0 for p in phase]),
+        theta_break=_col([float(p.theta_break) if p.enabled else 0.0 for p in phase]),
+        domains_on=np.array([bool(d.enabled) for d in dom]),
+        n_domains=np.array([max(1, int(getattr(d, "n_initial_domains", 1))) for d in dom]),
+        lambda_domain=_col([float(d.lambda_domain) if d.enabled else 0.0 for d in dom]),
+        cadence_on=np.array([bool(getattr(c, "enabled", False)) for c in cad]),
+        lambda_cadence=_col([float(getattr(c, "lambda_cadence", 0.0)) for c in cad]),
+    )
+
+
+def _cadence_step(rows: _Rows, st: EnsembleState, P: SimpleNamespace) -> None:
+    on = P.cadence_on[:, None]
+    phi = st.phi + 1.0
+    ticked = (phi >= st.T) & on
+    phi[ticked] -= st.T[ticked]
+    st.phi = np.where(on, phi, st.phi)
+    sync = on & (P.lambda_cadence > 0.0)
+    if np.any(sync):
+        mean_T = rows.mean(st.T)[:, None]
+        T = np.clip(st.T + P.lambda_cadence * (mean_T - st.T), 1e-3, None)
+        st.T = np.where(sync, T, st.T)
+    st.active = np.where(on, ticked, True) & st.mask
+
+
+def _hop_coherence_step(rows: _Rows, st: EnsembleState, P: SimpleNamespace) -> None:
+    r = rows.uniform(np.any(st.active, axis=1))
+    slips = st.active & (r < P.q_base)
+    st.v[slips] *= -1
+
+
+def _shared_bias_step(rows: _Rows, st: EnsembleState, m: np.ndarray, P: SimpleNamespace) -> None:
+    draw = P.shared_on & (m != 0.0)
+    if not np.any(draw):
+        return
+    sign_m = np.broadcast_to(np.where(m >= 0.0, 1.0, -1.0)[:, None], st.v.shape)
+    r = rows.uniform(draw)
+    to_flip = (st.v != sign_m) & (r < P.flip_bias)
+    st.v[to_flip] = sign_m[to_flip]
+
+
+def _phase_lock_step(rows: _Rows, st: EnsembleState, m: np.ndarray, theta_mean: np.ndarray,
+                     P: SimpleNamespace) -> None:
+    on = P.phase_on
+    if not np.any(on):
+        return
+    delta = np.angle(np.exp(1j * (theta_mean[:, None] - st.theta)))
+    theta_new = st.theta + P.omega_0 + P.lambda_phase * np.sin(delta)
+    noisy = on & (P.noise_sigma[:, 0] > 0.0)
+    if np.any(noisy):
+        theta_new += P.noise_sigma * rows.normal(noisy)
+    theta_new = np.mod(theta_new, 2.0 * np.pi)
+    st.theta = np.where(on[:, None], theta_new, st.theta)
+    theta_mean_new = rows.theta_mean(st.theta)
+    delta_new = np.abs(np.angle(np.exp(1j * (theta_mean_new[:, None] - st.theta))))
+    live = st.mask & on[:, None]
+    join_mask = live & (delta_new < P.theta_join)
+    break_mask = live & (delta_new > P.theta_break)
+    join_rows = np.any(join_mask, axis=1)
+    if np.any(join_rows):
+        sign_m = np.broadcast_to(np.where(m >= 0.0, 1.0, -1.0)[:, None], st.v.shape)
+        to_flip = join_mask & (rows.uniform(join_rows) < 0.1)
+        st.v[to_flip] = sign_m[to_flip]
+    break_rows = np.any(break_mask, axis=1)
+    if np.any(break_rows):
+        st.v[break_mask & (rows.uniform(break_rows) < 0.1)] *= -1
+
+
+def _domain_glue_step(rows: _Rows, st: EnsembleState, P: SimpleNamespace) -> None:
+    on = P.domains_on
+    if not np.any(on):
+        return
+    D = int(P.n_domains.max())
+    onehot = (st.domain[:, :, None] == np.arange(D)[None, None, :]) & st.mask[:, :, None]
+    counts = onehot.sum(axis=1)
+    sums = np.einsum("en,end->ed", st.v, onehot.astype(float))
+    m_d = np.divide(sums, counts, out=np.zeros_like(sums), where=counts > 0)
+    # Per-thread view of its domain magnetisation.
+    m_thread = np.take_along_axis(m_d, np.clip(st.domain, 0, D - 1), axis=1)
+    sign_md = np.where(m_thread >= 0.0, 1.0, -1.0)
+    flip_prob = np.clip(P.lambda_domain * np.abs(m_thread), 0.0, 1.0)
+    # Ancestor kernel: global np.random stream, one uniform per thread of a non-neutral domain.
+    r = np.random.random(st.v.shape)
+    to_flip = on[:, None] & st.mask & (m_thread != 0.0) & (st.v != sign_md) & (r < flip_prob)
+    st.v = np.where(to_flip, sign_md, st.v)
+
+
+def _init_rows(rows: _Rows, blocks: List[Dict[str, SimpleNamespace]], P: SimpleNamespace) -> EnsembleState:
+    R, N_max = rows.R, rows.N_max
+    st = EnsembleState(
+        v=np.zeros((R, N_max)),
+        theta=np.zeros((R, N_max)),
+        domain=np.zeros((R, N_max), dtype=np.int64),
+        T=np.ones((R, N_max)),
+        phi=np.zeros((R, N_max)),
+        active=np.zeros((R, N_max), dtype=bool),
+        mask=np.arange(N_max)[None, :] < rows.widths[:, None],
+    )
+    for e, rng in enumerate(rows.gens):
+        w = int(rows.widths[e])
+        v0 = rng.choice([-1.0, 1.0], size=w)
+        theta0 = rng.uniform(0.0, 2.0 * np.pi, size=w)
+        domain0 = rng.integers(0, int(P.n_domains[e]), size=w, endpoint=False)
+        th = ThreadState(v=v0, theta=theta0, domain=domain0, history_v=None)
+        initialise_cadence(rng, th, blocks[e]["cadence"])
+        st.v[e, :w] = th.v
+        st.theta[e, :w] = th.theta
+        st.domain[e, :w] = th.domain
+        st.T[e, :w] = th.T
+        st.phi[e, :w] = th.phi
+        st.active[e, :w] = th.active
+    return st
+
+
+def _resolve_blocks(pt: SweepPoint) -> Tuple[Dict[str, Any], int]:
+    W_coh = _w_coh(pt.cfg)
+    blocks = _load_v_blocks(pt.cfg, pt.n)
+    hop = blocks["hop"]
+    hop.q_base = _compute_q_base(hop, W_coh)
+    if hasattr(hop, 'q_base_override'):
+        hop.q_base = float(getattr(hop, 'q_base_override'))
+    return blocks, W_coh
+
+
+def _run_rows(points: List[SweepPoint], steps_total: int, burn_in: int, rc: Dict[str, Any]) -> None:
+    T_eff = steps_total - burn_in
+    if T_eff <= 0:
+        raise ValueError("burn_in must be < steps_total")
+
+    resolved = [_resolve_blocks(pt) for pt in points]
+    blocks = [b for b, _ in resolved]
+    P = _row_params(blocks)
+    rows = _Rows([pt.N for pt in points], [pt.seed for pt in points])
+    st = _init_rows(rows, blocks, P)
+    if rc["mode"] == "blocked":
+        rows.start_blocked(rc["block_ticks"])
+
+    mc = metrics_cfg(points[0].cfg)
+    if mc["mode"] == "streaming":
+        stream = StreamingLockstepMetrics(rows=rows.R, max_lag=mc["max_lag"], chunk=mc["chunk"])
+    else:
+        stream = None
+        m_all = np.zeros((rows.R, T_eff), dtype=float)
+
+    t0_wall = time.time()
+    for t in range(steps_total):
+        _cadence_step(rows, st, P)
+        _hop_coherence_step(rows, st, P)
+
+        m = rows.mean(st.v)
+        theta_mean = rows.theta_mean(st.theta)
+
+        _shared_bias_step(rows, st, m, P)
+        _phase_lock_step(rows, st, m, theta_mean, P)
+        _domain_glue_step(rows, st, P)
+
+        if t >= burn_in:
+            if stream is not None:
+                m = rows.mean(st.v)
+                stream.push(m, m)
+            else:
+                m_all[:, t - burn_in] = rows.mean(st.v)
+
+    elapsed = (time.time() - t0_wall) / float(rows.R)
+
+    for e, (pt, (blk, W_coh)) in enumerate(zip(points, resolved)):
+        ensure_dir(Path(pt.cfg["output"]["out_dir"]))
+        # In the nospace engine dX(t) is the post-glue mean velocity, i.e. m(t).
+        if stream is not None:
+            met = stream.result(e)
+        else:
+            met = compute_lockstep_metrics(m_all[e:e + 1], m_all[e:e + 1])
+        w = pt.N
+        th = ThreadState(v=st.v[e, :w], theta=st.theta[e, :w], domain=st.domain[e, :w], history_v=None,
+                         T=st.T[e, :w], phi=st.phi[e, :w], active=st.active[e, :w])
+        diag = {
+            "cadence": _cadence_stats(th),
+            "phase": {"R": _kuramoto_R(np.asarray(th.theta, dtype=float))},
+            "domains": _domain_stats(np.asarray(th.domain)),
+        }
+        ts_cfg = _ts_config(pt.cfg, steps_total, burn_in)
+        ts: Dict[str, Any] = {"enabled": bool(ts_cfg["enabled"])}
+        if ts_cfg["enabled"]:
+            ts.update({"interval": int(ts_cfg["interval"]), "records": []})
+        extra: Dict[str, Any] = {"batch": {"rows": int(rows.R), "row": int(e)}}
+        if rng_provenance(pt.cfg) is not None:
+            extra["rng_stream"] = rng_provenance(pt.cfg)
+        if metrics_provenance(pt.cfg) is not None:
+            extra["metrics"] = metrics_provenance(pt.cfg)
+        _write_run_outputs(pt.cfg, pt.N, pt.n, pt.seed, blk, W_coh, met, diag, _nospace_spatial(ts), elapsed,
+                           v_glue_extra=extra)
+
+
+def run_sweep_v_glue(points: List[SweepPoint], size: Optional[int] = None) -> None:
+    """
+    Run a list of v_glue grid points, stacking all nospace points that share
+    (steps_total, burn_in_epochs, engine.rng, engine.metrics) into vectorised jobs of at most `size` rows.
+    Space-on, checkpointed and fused-kernel points run one by one through run_single_v_glue.
+    """
+    groups: Dict[Tuple[int, int, str, int, Tuple[str, int, int]], List[SweepPoint]] = {}
+    for pt in points:
+        steps_total = int(pt.cfg["steps_total"])
+        burn_in = int(pt.cfg["burn_in_epochs"])
+        if burn_in + int(pt.cfg["measure_epochs"]) != steps_total:
+            raise ValueError("burn_in_epochs + measure_epochs must equal steps_total")
+        if (_space_cfg(pt.cfg)["enabled"] or checkpoint_cfg(pt.cfg)["every"] > 0
+                or kernels_backend(pt.cfg) != "ancestor"):
+            run_single_v_glue(pt.cfg, pt.N, pt.n, pt.seed)
+            continue
+        rc = rng_cfg(pt.cfg)
+        mc = metrics_cfg(pt.cfg)
+        key = (steps_total, burn_in, rc["mode"], rc["block_ticks"], (mc["mode"], mc["max_lag"], mc["chunk"]))
+        groups.setdefault(key, []).append(pt)
+
+    for (steps_total, burn_in, mode, block_ticks, _), pts in groups.items():
+        k = size or len(pts)
+        for i in range(0, len(pts), k):
+            _run_rows(pts[i:i + k], steps_total, burn_in, {"mode": mode, "block_ticks": block_ticks})
+
+
+def run_batch_v_glue(cfg: Dict[str, Any], N: int, n: float, seeds: List[int]) -> None:
+    """Run all `seeds` of one (N, n) point together; writes the usual per-seed outputs."""
+    points = [SweepPoint(cfg=cfg, N=int(N), n=float(n), seed=int(s)) for s in seeds]
+    run_sweep_v_glue(points, size=batch_cfg(cfg)["size"])
@@ -12,81 +12,309 @@ Notes:
 
 This module is designed to remain compatible with Path A usage:
 - new_event, add_edge, v_active, s_perc, s_junc_w, hubshare, max_indegree, clustering_coeff
+
+Active window index:
+- Node and edge storage is columnar (graph_core.GraphCore); nodes / edges are views on it.
+- Events are also kept in recency buckets (created_at, [eids]) in a deque. v_active(t, W_coh, ...)
+  drops buckets older than t - W_coh from the front and reads the rest, so it costs O(window)
+  instead of a scan over every event ever created.
+- The set is built in event-id order, exactly like the full scan, so its iteration order (and
+  every rng.choice over it) is unchanged.
+- Queries that reach behind already expired buckets (smaller t or larger W_coh than an earlier
+  call), or graphs with events created out of time order, fall back to the full scan.
+
+Window adjacency:
+- add_edge also records each edge in per-event neighbour dicts (first-edge order) for events still
+  in the recency window; expired buckets drop their entries, except current frontiers, which stay
+  pinned until they are replaced. _adj_undirected(active) then reads O(window degree) instead of
+  scanning every edge, and yields the same neighbour sets in the same order as the scan.
+- Sets reaching expired events (fallback queries, or edges added to an expired event) use the scan.
+
+Eviction (bounded memory):
+- evict(cutoff, keep) drops events created before cutoff that are not in keep (the frontiers)
+  together with every edge touching them, optionally appending them to an EventArchive first.
+  Such events can never re-enter V_active, and observables on V_active only read active nodes
+  (whose in/out degrees are stored on the node) and edges between them, so results are unchanged
+  as long as later queries use a cutoff >= the eviction cutoff.
 """
 
-from dataclasses import dataclass
-from typing import Dict, List, Optional, Set, Tuple
+import csv
+from collections import deque
+from pathlib import Path
+from typing import Deque, Dict, Iterable, List, Optional, Set, Tuple
 import math
 import random
 
+import numpy as np
+
+from .component_view import ComponentView
+from .csr_geometry import (CSRGraph, ball_counts, diffusion_returns, kpm_cumulative, kpm_moments, mean_clustering,
+                           sampled_clustering, trace_returns, walk_returns)
+from .graph_core import EdgeView, GraphCore, NodeView
+
+
+def _id_array(active: Iterable[int]) -> np.ndarray:
+    """Ids in the iteration order of `active` (order matters for order-sensitive reductions)."""
+    if isinstance(active, np.ndarray):
+        return active.astype(np.int64, copy=False)
+    return np.fromiter(active, dtype=np.int64, count=len(active))  # type: ignore[arg-type]
+
 
-@dataclass
-class EventNode:
-    created_at: int
-    domain: Optional[int] = None
-    indeg: int = 0
-    outdeg: int = 0
+def _hubshare_of(k: np.ndarray) -> float:
+    if k.size == 0:
+        return 0.0
+    s = int(k.sum())
+    return (int(k.max()) / float(s)) if s > 0 else 0.0
+
+
+def _s_junc_of(k: np.ndarray, beta: float) -> float:
+    """S_junc_w from the indegrees of an active set, in set order."""
+    if k.size == 0:
+        return 0.0
+    b = float(beta)
+    # only junctions contribute; summed in set order, as the per-node loop did (same rounding)
+    s = 0.0
+    for kj in k[k >= 2].tolist():
+        s += 1.0 if kj == 2 else float(kj) ** b
+    return s / float(k.size)
+
+
+Adjacency = Dict[int, Set[int]]
 
 
 class EventGraph:
     def __init__(self) -> None:
-        self.nodes: Dict[int, EventNode] = {}
-        self.edges: List[Tuple[int, int, int]] = []  # (u,v,t)
-        self._next_id: int = 0
+        # Columnar storage (graph_core.py); nodes / edges are dict- and list-style views on it.
+        self.core = GraphCore(weighted=False)
+        self.nodes = NodeView(self.core)  # eid -> NodeRef(created_at, domain, indeg, outdeg)
+        self.edges = EdgeView(self.core)  # (u,v,t)
+        # Recency buckets for v_active: (created_at, [eids]) with created_at increasing.
+        self._recent: Deque[Tuple[int, List[int]]] = deque()
+        self._expired_before: Optional[int] = None  # buckets with created_at < this were dropped
+        self._recency_ok: bool = True
+        # Window adjacency: eid -> {neighbour: None} in first-edge order, for events still in the
+        # recency window (plus pinned frontiers); expired entries are dropped with their buckets.
+        self._nbrs: Dict[int, Dict[int, None]] = {}
+        self._pinned: Set[int] = set()
+        self._adj_ok: bool = True
+        self.n_evicted_nodes: int = 0
+        self.n_evicted_edges: int = 0
+        self._view: Optional[ComponentView] = None  # last memoized window view (component_view.py)
+
+    @property
+    def _next_id(self) -> int:
+        return self.core.n_nodes
 
     def new_event(self, t: int, domain: Optional[int] = None) -> int:
-        eid = self._next_id
-        self._next_id += 1
-        self.nodes[eid] = EventNode(created_at=int(t), domain=domain, indeg=0, outdeg=0)
+        eid = self.core.add_node(int(t), domain)
+        self._nbrs[eid] = {}
+        self._index_recent(eid, int(t))
         return eid
 
+    def new_events(self, t: int, domains: np.ndarray) -> np.ndarray:
+        """len(domains) new events created at t, with consecutive ids (batched new_event)."""
+        t = int(t)
+        k = int(len(domains))
+        ids = self.core.add_nodes(np.full(k, t, dtype=np.int64), np.asarray(domains, dtype=np.int32))
+        ids_l = ids.tolist()
+        for eid in ids_l:
+            self._nbrs[eid] = {}
+        recent = self._recent
+        if k and recent and recent[-1][0] == t:
+            recent[-1][1].extend(ids_l)
+        else:
+            for eid in ids_l:
+                self._index_recent(eid, t)
+        return ids
+
+    def _index_recent(self, eid: int, t: int) -> None:
+        recent = self._recent
+        if recent and recent[-1][0] == t:
+            recent[-1][1].append(eid)
+        elif (not recent or recent[-1][0] < t) and (self._expired_before is None or t >= self._expired_before):
+            recent.append((t, [eid]))
+        else:
+            self._recency_ok = False
+
     def add_edge(self, u: int, v: int, t: int) -> None:
-        self.edges.append((int(u), int(v), int(t)))
-        self.nodes[u].outdeg += 1
-        self.nodes[v].indeg += 1
+        u, v = int(u), int(v)
+        self.core.add_edge(u, v, int(t))
+        nu = self._nbrs.get(u)
+        nv = self._nbrs.get(v)
+        if nu is None or nv is None:
+            self._adj_ok = False  # edge to an already expired event: window adjacency incomplete
+            return
+        nu[v] = None
+        nv[u] = None
+
+    def add_edges(self, us: List[int], vs: List[int], t: int) -> None:
+        """Edges (us[i], vs[i], t) in order (batched add_edge)."""
+        self.core.add_edges(np.asarray(us, dtype=np.int64), np.asarray(vs, dtype=np.int64), int(t))
+        nbrs = self._nbrs
+        for u, v in zip(us, vs):
+            nu = nbrs.get(u)
+            nv = nbrs.get(v)
+            if nu is None or nv is None:
+                self._adj_ok = False
+                continue
+            nu[v] = None
+            nv[u] = None
+
+    def _expire(self, cutoff: int, frontiers: Iterable[int]) -> None:
+        """Drop recency buckets (and their window adjacency) created before cutoff; frontiers stay pinned."""
+        recent = self._recent
+        if self._expired_before is None or cutoff > self._expired_before:
+            self._expired_before = cutoff
+        if not self._pinned and not (recent and recent[0][0] < cutoff):
+            return
+        keep = set(map(int, frontiers))
+        nbrs = self._nbrs
+        if self._pinned:
+            for eid in [p for p in self._pinned if p not in keep]:
+                self._pinned.discard(eid)
+                nbrs.pop(eid, None)
+        while recent and recent[0][0] < cutoff:
+            for eid in recent.popleft()[1]:
+                if eid in keep:
+                    self._pinned.add(eid)
+                else:
+                    nbrs.pop(eid, None)
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """Graph contents as flat arrays (checkpointing)."""
+        c = self.core
+        ids = c.live_ids()
+        dom = c.domain_of(ids).astype(np.int64)
+        has = dom != np.iinfo(np.int32).min
+        return {
+            "eg_ids": ids,
+            "eg_created_at": c.created_at_of(ids),
+            "eg_domain": np.where(has, dom, -1),
+            "eg_has_domain": has,
+            "eg_indeg": c.indeg_of(ids).astype(np.int64),
+            "eg_outdeg": c.outdeg_of(ids).astype(np.int64),
+            "eg_edges": np.stack([c.src, c.dst, c.t], axis=1),
+            "eg_next_id": np.array(c.n_nodes, dtype=np.int64),
+            "eg_evicted": np.array([self.n_evicted_nodes, self.n_evicted_edges], dtype=np.int64),
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray]) -> "EventGraph":
+        g = cls()
+        ids = arrays["eg_ids"]
+        n_nodes = int(arrays["eg_next_id"])
+        base = int(ids[0]) if ids.size else n_nodes
+        rows = ids - base
+        n = n_nodes - base
+
+        def col(values: np.ndarray, fill=0) -> np.ndarray:
+            out = np.full(n, fill, dtype=values.dtype)
+            out[rows] = values
+            return out
+
+        alive = np.zeros(n, dtype=bool)
+        alive[rows] = True
+        domain = np.where(arrays["eg_has_domain"], arrays["eg_domain"], np.iinfo(np.int32).min)
+        edges = arrays["eg_edges"].reshape(-1, 3)
+        g.core.restore(base, n_nodes, col(arrays["eg_created_at"]), col(domain), col(arrays["eg_indeg"]),
+                       col(arrays["eg_outdeg"]), alive, edges[:, 0], edges[:, 1], edges[:, 2])
+        g.n_evicted_nodes, g.n_evicted_edges = arrays["eg_evicted"].tolist()
+        for eid, t in zip(ids.tolist(), arrays["eg_created_at"].tolist()):
+            g._nbrs[eid] = {}
+            g._index_recent(eid, t)
+        for u, v in zip(edges[:, 0].tolist(), edges[:, 1].tolist()):
+            g._nbrs[u][v] = None
+            g._nbrs[v][u] = None
+        return g
 
     def v_active(self, t: int, W_coh: int, frontiers: List[int]) -> Set[int]:
         cutoff = int(t) - int(W_coh)
-        active = {eid for eid, nd in self.nodes.items() if nd.created_at >= cutoff}
+        if not self._recency_ok or (self._expired_before is not None and cutoff < self._expired_before):
+            active = set(self.core.ids_created_since(cutoff).tolist())
+        else:
+            self._expire(cutoff, frontiers)
+            active = {eid for _, ids in self._recent for eid in ids}
         active.update(int(e) for e in frontiers)
         return active
 
+    def advance_window(self, t: int, W_coh: int, frontiers: Iterable[int]) -> None:
+        """Expire the recency buckets and window adjacency as v_active(t, W_coh, frontiers) would, without building the set."""
+        cutoff = int(t) - int(W_coh)
+        if self._recency_ok and (self._expired_before is None or cutoff >= self._expired_before):
+            self._expire(cutoff, frontiers)
+
+    def evict(self, cutoff: int, keep: Iterable[int], archive: Optional["EventArchive"] = None) -> None:
+        """Drop events created before cutoff (except keep) and all edges touching them."""
+        cutoff = int(cutoff)
+        keep = [int(e) for e in keep]
+        c = self.core
+        live = c.live_ids()
+        old = live[c.created_at_of(live) < cutoff]
+        dead = old[~np.isin(old, np.array(keep, dtype=np.int64))]
+        if dead.size == 0:
+            return
+        if archive is not None:
+            touching = np.isin(c.src, dead) | np.isin(c.dst, dead)
+            archive.append(self, dead.tolist(), c.edge_tuples(touching))
+        dropped = c.remove_nodes(dead)
+        self.n_evicted_nodes += int(dead.size)
+        self.n_evicted_edges += int(np.count_nonzero(dropped))
+        self._expire(cutoff, keep)
+        for eid in dead.tolist():
+            self._nbrs.pop(eid, None)
+
+    @property
+    def version(self) -> Tuple[int, int, int, int]:
+        """Changes with every added event or edge and every eviction (events and edges only grow otherwise)."""
+        c = self.core
+        return (c.n_nodes, c.n_edges, self.n_evicted_nodes, self.n_evicted_edges)
+
+    def view(self, active: Set[int]) -> ComponentView:
+        """Memoized adjacency / components / CSR view of active at the current graph version."""
+        key = tuple(active)
+        version = self.version
+        v = self._view
+        if v is None or not v.matches(key, version):
+            v = self._view = ComponentView(self, active, key, version)
+        return v
+
     def indegrees(self, active: Set[int]) -> List[int]:
-        return [self.nodes[e].indeg for e in active]
+        return self.core.indeg_of(_id_array(active)).tolist()
 
     def max_indegree(self, active: Set[int]) -> int:
-        return max((self.nodes[e].indeg for e in active), default=0)
+        if not active:
+            return 0
+        return int(self.core.indeg_of(_id_array(active)).max())
 
     def hubshare(self, active: Set[int]) -> float:
-        indegs = self.indegrees(active)
-        if not indegs:
+        if not active:
             return 0.0
-        s = sum(indegs)
-        return (max(indegs) / float(s)) if s > 0 else 0.0
+        return _hubshare_of(self.core.indeg_of(_id_array(active)))
 
     def s_junc_w(self, active: Set[int], beta: float = 1.5) -> float:
         if not active:
             return 0.0
-        s = 0.0
-        for e in active:
-            k = self.nodes[e].indeg
-            if k < 2:
-                continue
-            s += 1.0 if k == 2 else float(k) ** float(beta)
-        return s / float(len(active))
+        return _s_junc_of(self.core.indeg_of(_id_array(active)), beta)
 
     def _adj_undirected(self, active: Set[int]) -> Dict[int, Set[int]]:
+        """Undirected adjacency induced on active (neighbour sets filled in edge order)."""
+        nbrs = self._nbrs
+        if self._adj_ok and all(e in nbrs for e in active):
+            aset = active if isinstance(active, (set, frozenset)) else set(active)
+            return {e: {nb for nb in nbrs[e] if nb in aset} for e in active}
         adj: Dict[int, Set[int]] = {e: set() for e in active}
-        for u, v, t in self.edges:
-            if u in active and v in active:
-                adj[u].add(v)
-                adj[v].add(u)
+        c = self.core
+        mask = c.edges_within(_id_array(active))
+        for u, v in zip(c.src[mask].tolist(), c.dst[mask].tolist()):
+            adj[u].add(v)
+            adj[v].add(u)
         return adj
 
-    def s_perc(self, active: Set[int]) -> float:
+    def s_perc(self, active: Set[int], adj: Optional[Adjacency] = None) -> float:
         if not active:
             return 0.0
-        adj = self._adj_undirected(active)
+        if adj is None:
+            return len(self.view(active).largest_component) / float(len(active))
         seen: Set[int] = set()
         best = 0
         for e in active:
@@ -105,97 +333,94 @@ class EventGraph:
             best = max(best, size)
         return best / float(len(active))
 
-    def clustering_coeff(self, active: Set[int], sample: Optional[int] = 500) -> float:
+    def clustering_coeff(self, active: Set[int], sample: Optional[int] = 500,
+                         adj: Optional[Adjacency] = None, csr: Optional[CSRGraph] = None) -> float:
+        """
+        Mean local clustering over the events with degree >= 2: over a stride sample of `sample`
+        events (in set order), or exactly over the whole window with sample=None. A sample closes
+        only the sampled events' wedges (csr_geometry.sampled_clustering, on adj); the exact value
+        counts the triangles of the whole window at once (csr_geometry.triangle_counts, on csr,
+        which, if given, must list the events of active in set order).
+        """
         if not active:
             return 0.0
-        adj = self._adj_undirected(active)
-        nodes = list(active)
-        if sample is not None and len(nodes) > sample:
-            step = max(1, len(nodes) // sample)
-            nodes = nodes[::step][:sample]
-        coeffs: List[float] = []
-        for v in nodes:
-            nbrs = list(adj.get(v, set()))
-            k = len(nbrs)
-            if k < 2:
-                continue
-            links = 0
-            for i in range(k):
-                ai = adj.get(nbrs[i], set())
-                for j in range(i + 1, k):
-                    if nbrs[j] in ai:
-                        links += 1
-            coeffs.append((2.0 * links) / (k * (k - 1)))
-        return sum(coeffs) / len(coeffs) if coeffs else 0.0
-
-    def largest_component_nodes(self, active: Set[int]) -> Set[int]:
+        if sample is not None and len(active) > sample:
+            nodes = list(active)
+            nodes = nodes[::max(1, len(nodes) // sample)][:sample]
+            return sampled_clustering(nodes, self.view(active).adj if adj is None else adj)
+        if csr is None:
+            csr = self.view(active).window_csr if adj is None else CSRGraph.from_adjacency(active, adj)
+        return mean_clustering(csr)
+
+    def largest_component_nodes(self, active: Set[int], adj: Optional[Adjacency] = None) -> Set[int]:
         """Largest weakly connected component in the undirected projection."""
+        return self.components(active, adj)[1]
+
+    def components(self, active: Set[int], adj: Optional[Adjacency] = None) -> Tuple[Dict[int, int], Set[int]]:
+        """(component label per event, largest component) of active; a label is the component's first event."""
         if not active:
-            return set()
-        adj = self._adj_undirected(active)
-        seen: Set[int] = set()
+            return {}, set()
+        if adj is None:
+            view = self.view(active)
+            return view.labels, view.largest_component
+        labels: Dict[int, int] = {}
         best_comp: Set[int] = set()
         for e in active:
-            if e in seen:
+            if e in labels:
                 continue
+            lab = e
             stack = [e]
-            seen.add(e)
+            labels[e] = lab
             comp: Set[int] = set([e])
             while stack:
                 x = stack.pop()
                 for nb in adj.get(x, set()):
-                    if nb not in seen:
-                        seen.add(nb)
+                    if nb not in labels:
+                        labels[nb] = lab
                         comp.add(nb)
                         stack.append(nb)
             if len(comp) > len(best_comp):
                 best_comp = comp
-        return best_comp
+        return labels, best_comp
     def ball_growth_profile(
         self,
         active: Set[int],
         r_max: int = 25,
         samples: int = 25,
         seed: int = 0,
+        adj: Optional[Adjacency] = None,
+        comp: Optional[Set[int]] = None,
+        csr: Optional[CSRGraph] = None,
     ) -> Dict[str, object]:
-        """Estimate mean ball volume |B(r)| vs r on the largest component of active (undirected)."""
+        """
+        Estimate mean ball volume |B(r)| vs r on the largest component of active (undirected).
+        Balls are exact (breadth-first distances), computed for all roots at once by the
+        bit-parallel BFS of csr_geometry.ball_counts, so `samples` can be in the thousands.
+        adj / comp / csr: precomputed adjacency of active, its largest component and the CSR view
+        of that component (WindowSnapshot).
+        """
         rng = random.Random(int(seed))
-        comp = self.largest_component_nodes(active)
+        if adj is None and comp is None and csr is None:
+            view = self.view(active)
+            adj, comp = view.adj, view.largest_component
+            if comp:
+                csr = view.csr
+        if comp is None:
+            comp = self.largest_component_nodes(active, adj)
         comp_size = len(comp)
         if comp_size == 0:
             return {"comp_size": 0, "r_max": int(r_max), "samples": 0, "mean_ball": []}
 
-        adj = self._adj_undirected(comp)
-        nodes = list(comp)
-        k = min(int(samples), len(nodes))
-        roots = [nodes[rng.randrange(len(nodes))] for _ in range(k)]
-
-        mean_ball = [0.0] * (int(r_max) + 1)
-        for root in roots:
-            dist = {root: 0}
-            frontier = [root]
-            while frontier:
-                v = frontier.pop()
-                dv = dist[v]
-                if dv >= r_max:
-                    continue
-                for nb in adj.get(v, ()):
-                    if nb not in dist:
-                        dist[nb] = dv + 1
-                        if dist[nb] <= r_max:
-                            frontier.append(nb)
-
-            counts = [0] * (int(r_max) + 1)
-            for d in dist.values():
-                if d <= r_max:
-                    counts[d] += 1
-
-            cum = 0
-            for r in range(r_max + 1):
-                cum += counts[r]
-                mean_ball[r] += cum
-
-        mean_ball = [x / float(k) for x in mean_ball]
+        if csr is None:
+            if adj is None:
+                adj = self._adj_undirected(comp)
+            csr = CSRGraph.from_adjacency(comp, adj)
+        n_nodes = csr.n
+        k = min(int(samples), n_nodes)
+        roots = np.array([rng.randrange(n_nodes) for _ in range(k)], dtype=np.int64)
+
+        balls = ball_counts(csr, roots, int(r_max))
+        mean_ball = (balls.sum(axis=0) / float(k)).tolist()
         return {"comp_size": comp_size, "r_max": int(r_max), "samples": int(k), "mean_ball": mean_ball}
     @staticmethod
     def _linear_fit_loglog(ts: List[int], ys: List[float]) -> Tuple[float, float, float]:
@@ -225,6 +450,13 @@ class EventGraph:
         fit_t_max: int = 400,
         seed: int = 0,
         t_max: int | None = None,
+        adj: Optional[Adjacency] = None,
+        comp: Optional[Set[int]] = None,
+        csr: Optional[CSRGraph] = None,
+        method: str = "walk",
+        roots: int = 64,
+        probes: int = 0,
+        p0_floor: float = 1e-8,
         **kwargs,
     ) -> Dict[str, object]:
         """
@@ -232,11 +464,25 @@ class EventGraph:
 
         We simulate 'walkers' random walks of length 'steps' starting at random nodes.
         P0(t) = Pr(X_t = X_0) estimated by fraction of walkers returned at time t.
+        method: "walk" (one Python walker at a time, random.Random(seed)) or "walk_csr" (all
+        walkers advanced together on the CSR view, np.random.default_rng(seed); cheap enough for
+        10^4-10^5 walkers, different random stream).
+        method "diffusion": no walkers; P0(t) is the exact return probability averaged over
+        `roots` random start nodes (probability vectors propagated through D^-1 A), or, with
+        probes > 0, a Hutchinson estimate of tr(P^t)/n from that many Rademacher probes. P0 is
+        smooth, so fit points go down to p0_floor instead of stopping at the first empty count;
+        only even t are fitted (no parity oscillation on (nearly) bipartite components).
 
         Fit ds from P0(t) ~ t^{-ds/2}.
         """
+        if method not in ("walk", "walk_csr", "diffusion"):
+            raise ValueError("method must be walk | walk_csr | diffusion")
         rng = random.Random(int(seed))
-        comp = self.largest_component_nodes(active)
+        view = self.view(active) if adj is None and comp is None and csr is None else None
+        if view is not None:
+            adj, comp = view.adj, view.largest_component
+        if comp is None:
+            comp = self.largest_component_nodes(active, adj)
         comp_size = len(comp)
         out: Dict[str, object] = {
             "comp_size": comp_size,
@@ -256,7 +502,8 @@ class EventGraph:
             out["notes"] = "component_too_small"
             return out
 
-        adj = self._adj_undirected(comp)
+        if adj is None:
+            adj = self._adj_undirected(comp)
         nodes = list(comp)
 
         # Adaptive t_max to avoid deep finite-size saturation
@@ -269,37 +516,57 @@ class EventGraph:
             return out
         out["fit_t_min"] = tmin
         out["fit_t_max"] = tmax
-
-        # Preselect start nodes
-        starts = [nodes[rng.randrange(comp_size)] for _ in range(int(walkers))]
-        pos = list(starts)
-
-        # Track returns for times up to tmax
-        returns = [0]*(tmax+1)
-        returns[0] = int(walkers)
-
-        for t in range(1, tmax+1):
-            # one step
-            for i in range(int(walkers)):
-                v = pos[i]
-                nbrs = list(adj.get(v, ()))
-                if not nbrs:
-                    # stuck: stay
-                    nxt = v
-                else:
-                    nxt = nbrs[rng.randrange(len(nbrs))]
-                pos[i] = nxt
-            # count returns
-            ret = sum(1 for i in range(int(walkers)) if pos[i] == starts[i])
-            returns[t] = ret
+        if method != "walk":
+            out["method"] = method
+
+        if method != "walk" and csr is None:
+            csr = view.csr if view is not None else CSRGraph.from_adjacency(nodes, adj)
+        if method == "diffusion":
+            np_rng = np.random.default_rng(int(seed))
+            if int(probes) > 0:
+                out["probes"] = int(probes)
+                p0 = trace_returns(csr, int(probes), tmax, np_rng)
+            else:
+                out["roots"] = int(roots)
+                p0 = diffusion_returns(csr, np_rng.integers(0, csr.n, size=int(roots)), tmax)
+            walkers = 1
+            returns = p0.tolist()
+        elif method == "walk_csr":
+            returns = walk_returns(csr, int(walkers), tmax, np.random.default_rng(int(seed))).tolist()
+        else:
+            # Preselect start nodes
+            starts = [nodes[rng.randrange(comp_size)] for _ in range(int(walkers))]
+            pos = list(starts)
+
+            # Track returns for times up to tmax
+            returns = [0]*(tmax+1)
+            returns[0] = int(walkers)
+
+            for t in range(1, tmax+1):
+                # one step
+                for i in range(int(walkers)):
+                    v = pos[i]
+                    nbrs = list(adj.get(v, ()))
+                    if not nbrs:
+                        # stuck: stay
+                        nxt = v
+                    else:
+                        nxt = nbrs[rng.randrange(len(nbrs))]
+                    pos[i] = nxt
+                # count returns
+                ret = sum(1 for i in range(int(walkers)) if pos[i] == starts[i])
+                returns[t] = ret
 
         P0 = [returns[t]/float(walkers) for t in range(tmax+1)]
+        floor = float(p0_floor) if method == "diffusion" else 0.0
 
         # Choose fit points where P0>0 and t in [tmin,tmax]
         ts = []
         ys = []
         for t in range(tmin, tmax+1):
-            if P0[t] > 0:
+            if method == "diffusion" and t % 2:
+                continue
+            if P0[t] > floor:
                 ts.append(t)
                 ys.append(P0[t])
         if len(ts) < 8:
@@ -330,3 +597,266 @@ class EventGraph:
         out["ds_valid"] = True
         out["notes"] = "ok"
         return out
+
+    def spectral_density_kpm(
+        self,
+        active: Set[int],
+        moments: int = 256,
+        probes: int = 16,
+        seed: int = 0,
+        lambda_min: Optional[float] = None,
+        lambda_max: float = 0.1,
+        adj: Optional[Adjacency] = None,
+        comp: Optional[Set[int]] = None,
+        csr: Optional[CSRGraph] = None,
+    ) -> Dict[str, object]:
+        """
+        Spectral dimension from the density of states of the normalized Laplacian of the largest
+        component of active, estimated with the kernel polynomial method (Chebyshev moments from
+        `probes` random vectors, Jackson damping; see csr_geometry).
+
+        The integrated density N(lambda) (zero mode removed) scales as lambda^{ds/2} at small
+        lambda, so ds = 2 * slope of log N vs log lambda over [lambda_min, lambda_max].
+        lambda_min defaults to the KPM resolution at the band edge, 1 - cos(3 pi / moments).
+        Cost is O(moments * probes * edges), independent of the walk time scales.
+        """
+        view = self.view(active) if adj is None and comp is None and csr is None else None
+        if view is not None:
+            adj, comp = view.adj, view.largest_component
+        if comp is None:
+            comp = self.largest_component_nodes(active, adj)
+        comp_size = len(comp)
+        lam_lo = float(lambda_min) if lambda_min is not None else float(1.0 - math.cos(3.0 * math.pi / int(moments)))
+        lam_hi = float(lambda_max)
+        out: Dict[str, object] = {
+            "method": "kpm",
+            "comp_size": comp_size,
+            "moments": int(moments),
+            "probes": int(probes),
+            "lambda_fit": [lam_lo, lam_hi],
+            "ds_est": None,
+            "ds_valid": False,
+            "slope": None,
+            "r2": None,
+            "notes": "",
+        }
+        if comp_size < 30:
+            out["notes"] = "component_too_small"
+            return out
+        if not (0.0 < lam_lo < lam_hi):
+            out["notes"] = "fit_window_too_small"
+            return out
+
+        if csr is None:
+            if view is not None:
+                csr = view.csr
+            else:
+                if adj is None:
+                    adj = self._adj_undirected(comp)
+                csr = CSRGraph.from_adjacency(comp, adj)
+        mu = kpm_moments(csr, int(moments), int(probes), np.random.default_rng(int(seed)))
+        lam = np.geomspace(lam_lo, lam_hi, 40)
+        idos = kpm_cumulative(mu, lam) - 1.0 / comp_size
+        out["idos_downsample"] = [(float(x), float(y)) for x, y in zip(lam[::4], idos[::4])]
+
+        keep = idos > 0
+        if int(keep.sum()) < 8:
+            out["notes"] = "insufficient_low_modes"
+            return out
+        b, a, r2 = self._linear_fit_loglog(lam[keep].tolist(), idos[keep].tolist())
+        ds = 2.0 * b
+        out["slope"] = float(b)
+        out["r2"] = float(r2)
+        out["ds_est"] = float(ds)
+        if (ds <= 0) or (ds > 10) or (r2 < 0.85):
+            out["notes"] = "fit_invalid"
+            return out
+        out["ds_valid"] = True
+        out["notes"] = "ok"
+        return out
+
+
+class IndexedPool:
+    """Set of event ids with O(1) add, swap-remove and uniform pick."""
+
+    def __init__(self) -> None:
+        self.items: List[int] = []
+        self._pos: Dict[int, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def add(self, eid: int) -> None:
+        self._pos[eid] = len(self.items)
+        self.items.append(eid)
+
+    def remove(self, eid: int) -> None:
+        i = self._pos.pop(eid)
+        last = self.items.pop()
+        if last != eid:
+            self.items[i] = last
+            self._pos[last] = i
+
+    def pick(self, rng) -> int:
+        return self.items[int(rng.integers(0, len(self.items)))]
+
+    def pick_many(self, u: np.ndarray) -> np.ndarray:
+        """Items at positions floor(u * len) for uniforms u (vectorized picks)."""
+        n = len(self.items)
+        idx = np.minimum((u * n).astype(np.int64), n - 1)
+        items = self.items
+        return np.array([items[k] for k in idx.tolist()], dtype=np.int64)
+
+
+class ActiveDomainPools:
+    """
+    Incrementally maintained V_active (created_at >= t - W_coh, plus frontiers), held as one
+    IndexedPool over all active events and one per domain, so a (domain-matched) reuse draw is O(1).
+
+    sync(t, W_coh, frontiers) brings the pools to the v_active(t, W_coh, frontiers) membership:
+    events created since the last sync enter, buckets older than the cutoff leave (unless they are
+    frontiers), and events that stop being frontiers leave if they are outside the window. The
+    graph's own window (recency buckets, window adjacency) is advanced with it, since the tick loop
+    then never calls v_active. Picks depend on the pools' internal order, so draws differ from
+    rng.choice over list(v_active(...)).
+    """
+
+    def __init__(self, g: EventGraph) -> None:
+        self.g = g
+        self.all = IndexedPool()
+        self.by_domain: Dict[Optional[int], IndexedPool] = {}
+        self._member: Dict[int, Optional[int]] = {}
+        self._buckets: Deque[Tuple[int, List[int]]] = deque()
+        self._seen = 0
+        self._cutoff: Optional[int] = None
+        self._frontiers: Set[int] = set()
+
+    def __len__(self) -> int:
+        return len(self.all)
+
+    def domain(self, dom: Optional[int]) -> IndexedPool:
+        pool = self.by_domain.get(dom)
+        if pool is None:
+            pool = self.by_domain[dom] = IndexedPool()
+        return pool
+
+    def _add(self, eid: int) -> None:
+        dom = self.g.nodes[eid].domain
+        self._member[eid] = dom
+        self.all.add(eid)
+        self.domain(dom).add(eid)
+
+    def _remove(self, eid: int) -> None:
+        dom = self._member.pop(eid)
+        self.all.remove(eid)
+        self.by_domain[dom].remove(eid)
+
+    def sync(self, t: int, W_coh: int, frontiers: List[int]) -> int:
+        cutoff = int(t) - int(W_coh)
+        if self._cutoff is not None and cutoff < self._cutoff:
+            raise ValueError("ActiveDomainPools needs a non-decreasing window cutoff")
+        self._cutoff = cutoff
+        front = set(int(e) for e in frontiers)
+        nodes = self.g.nodes
+        for eid in range(self._seen, self.g._next_id):
+            ca = nodes[eid].created_at
+            if self._buckets and ca < self._buckets[-1][0]:
+                raise ValueError("ActiveDomainPools needs events created in time order")
+            if self._buckets and self._buckets[-1][0] == ca:
+                self._buckets[-1][1].append(eid)
+            else:
+                self._buckets.append((ca, [eid]))
+            if ca >= cutoff or eid in front:
+                self._add(eid)
+        self._seen = self.g._next_id
+        while self._buckets and self._buckets[0][0] < cutoff:
+            for eid in self._buckets.popleft()[1]:
+                if eid in self._member and eid not in front:
+                    self._remove(eid)
+        for eid in self._frontiers - front:
+            nd = nodes.get(eid)
+            if eid in self._member and (nd is None or nd.created_at < cutoff):
+                self._remove(eid)
+        for eid in front - self._frontiers:
+            if eid not in self._member:
+                self._add(eid)
+        self._frontiers = front
+        self.g.advance_window(t, W_coh, front)
+        return len(self.all)
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """Pool contents in their internal order (checkpointing)."""
+        doms = list(self.by_domain.keys())
+        return {
+            "pool_all": np.array(self.all.items, dtype=np.int64),
+            "pool_dom_keys": np.array([-1 if d is None else d for d in doms], dtype=np.int64),
+            "pool_dom_has": np.array([d is not None for d in doms], dtype=bool),
+            "pool_dom_len": np.array([len(self.by_domain[d]) for d in doms], dtype=np.int64),
+            "pool_dom_val": np.array([e for d in doms for e in self.by_domain[d].items], dtype=np.int64),
+            "pool_frontiers": np.array(sorted(self._frontiers), dtype=np.int64),
+            "pool_state": np.array([self._seen, -1 if self._cutoff is None else self._cutoff,
+                                    self._cutoff is not None], dtype=np.int64),
+        }
+
+    @classmethod
+    def from_arrays(cls, g: EventGraph, arrays: Dict[str, np.ndarray]) -> "ActiveDomainPools":
+        p = cls(g)
+        seen, cutoff, has_cutoff = arrays["pool_state"].tolist()
+        p._seen = seen
+        p._cutoff = cutoff if has_cutoff else None
+        p._frontiers = set(arrays["pool_frontiers"].tolist())
+        for eid in arrays["pool_all"].tolist():
+            p.all.add(eid)
+            p._member[eid] = g.nodes[eid].domain
+        vals = arrays["pool_dom_val"].tolist()
+        i = 0
+        for key, has, k in zip(arrays["pool_dom_keys"].tolist(), arrays["pool_dom_has"].tolist(),
+                               arrays["pool_dom_len"].tolist()):
+            pool = p.domain(key if has else None)
+            for eid in vals[i:i + k]:
+                pool.add(eid)
+            i += k
+        for eid in range(seen):
+            nd = g.nodes.get(eid)
+            if nd is None or (p._cutoff is not None and nd.created_at < p._cutoff):
+                continue
+            ca = nd.created_at
+            if p._buckets and p._buckets[-1][0] == ca:
+                p._buckets[-1][1].append(eid)
+            else:
+                p._buckets.append((ca, [eid]))
+        return p
+
+
+class EventArchive:
+    """Append-only CSV archive of evicted events (<prefix>_nodes.csv) and edges (<prefix>_edges.csv)."""
+
+    def __init__(self, prefix: Path) -> None:
+        self.nodes_path = Path(str(prefix) + "_nodes.csv")
+        self.edges_path = Path(str(prefix) + "_edges.csv")
+
+    def start(self) -> None:
+        self.nodes_path.parent.mkdir(parents=True, exist_ok=True)
+        with self.nodes_path.open("w", newline="", encoding="utf-8") as f:
+            csv.writer(f).writerow(["eid", "created_at", "domain", "indeg", "outdeg"])
+        with self.edges_path.open("w", newline="", encoding="utf-8") as f:
+            csv.writer(f).writerow(["u", "v", "t"])
+
+    def append(self, g: EventGraph, eids: List[int], edges: List[Tuple[int, int, int]]) -> None:
+        with self.nodes_path.open("a", newline="", encoding="utf-8") as f:
+            w = csv.writer(f)
+            for eid in eids:
+                nd = g.nodes[eid]
+                w.writerow([eid, nd.created_at, "" if nd.domain is None else nd.domain, nd.indeg, nd.outdeg])
+        with self.edges_path.open("a", newline="", encoding="utf-8") as f:
+            csv.writer(f).writerows(edges)
+
+    def sizes(self) -> List[int]:
+        """Current byte sizes of both files (checkpointing)."""
+        return [self.nodes_path.stat().st_size, self.edges_path.stat().st_size]
+
+    def truncate(self, sizes: List[int]) -> None:
+        """Cut both files back to the sizes recorded with a checkpoint."""
+        for path, size in zip((self.nodes_path, self.edges_path), sizes):
+            with path.open("r+b") as f:
+                f.truncate(int(size))
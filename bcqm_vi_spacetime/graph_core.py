@@ -0,0 +1,385 @@
+from __future__ import annotations
+
+"""
+graph_core.py (BCQM VI)
+
+Columnar (struct-of-arrays) graph storage shared by EventGraph and GraphStore.
+
+Nodes:
+- Node id i lives at row i - base of growable buffers created_at (int64), domain (int32, None
+  stored as a sentinel), indeg / outdeg (int32) and an alive flag. Ids are never reused.
+- remove_nodes marks nodes dead, drops every edge touching them and releases the rows below the
+  oldest live node, so with window eviction the buffers follow the live window.
+- Per-node accessors and add_edge / add_edges raise KeyError for ids that were never created or
+  have been removed (as the dict storage did); the bulk *_of readers take ids known to be live.
+Edges:
+- Growable src / dst / t (int64) buffers in insertion order, plus w (float64) for weighted graphs.
+Buffers double when full. Per node ~21 bytes, per edge 24 bytes (32 weighted), against a few
+hundred bytes for a dict entry + node object or a list slot + tuple.
+
+EventGraph / GraphStore keep their dict/list style API through NodeView (id -> NodeRef proxy with
+created_at / domain / indeg / outdeg attributes) and EdgeView (sequence of edge tuples).
+"""
+
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+
+
+_NO_DOMAIN = np.iinfo(np.int32).min
+
+
+def _grow(a: np.ndarray, n: int) -> np.ndarray:
+    out = np.zeros(max(2 * a.shape[0], n, 16), dtype=a.dtype)
+    out[:a.shape[0]] = a
+    return out
+
+
+class GraphCore:
+    def __init__(self, weighted: bool = False, capacity: int = 1024) -> None:
+        self.weighted = bool(weighted)
+        self.base = 0        # id of node row 0
+        self.n_nodes = 0     # next id
+        self.n_alive = 0
+        self.n_edges = 0
+        cap = max(16, int(capacity))
+        self._created = np.zeros(cap, dtype=np.int64)
+        self._domain = np.zeros(cap, dtype=np.int32)
+        self._indeg = np.zeros(cap, dtype=np.int32)
+        self._outdeg = np.zeros(cap, dtype=np.int32)
+        self._alive = np.zeros(cap, dtype=bool)
+        self._src = np.zeros(cap, dtype=np.int64)
+        self._dst = np.zeros(cap, dtype=np.int64)
+        self._t = np.zeros(cap, dtype=np.int64)
+        self._w = np.zeros(cap if self.weighted else 0, dtype=float)
+
+    # ---- nodes ----
+    def add_node(self, created_at: int, domain: Optional[int] = None) -> int:
+        r = self.n_nodes - self.base
+        if r >= self._created.shape[0]:
+            self._created = _grow(self._created, r + 1)
+            self._domain = _grow(self._domain, r + 1)
+            self._indeg = _grow(self._indeg, r + 1)
+            self._outdeg = _grow(self._outdeg, r + 1)
+            self._alive = _grow(self._alive, r + 1)
+        self._created[r] = created_at
+        self._domain[r] = _NO_DOMAIN if domain is None else domain
+        self._indeg[r] = 0
+        self._outdeg[r] = 0
+        self._alive[r] = True
+        nid = self.n_nodes
+        self.n_nodes += 1
+        self.n_alive += 1
+        return nid
+
+    def add_nodes(self, created_at: np.ndarray, domain: np.ndarray) -> np.ndarray:
+        """Append len(created_at) nodes at once (domain given as stored ints); returns their ids."""
+        k = int(len(created_at))
+        r = self.n_nodes - self.base
+        if r + k > self._created.shape[0]:
+            self._created = _grow(self._created, r + k)
+            self._domain = _grow(self._domain, r + k)
+            self._indeg = _grow(self._indeg, r + k)
+            self._outdeg = _grow(self._outdeg, r + k)
+            self._alive = _grow(self._alive, r + k)
+        self._created[r:r + k] = created_at
+        self._domain[r:r + k] = domain
+        self._indeg[r:r + k] = 0
+        self._outdeg[r:r + k] = 0
+        self._alive[r:r + k] = True
+        ids = np.arange(self.n_nodes, self.n_nodes + k, dtype=np.int64)
+        self.n_nodes += k
+        self.n_alive += k
+        return ids
+
+    def is_alive(self, nid: int) -> bool:
+        r = nid - self.base
+        return 0 <= r < self.n_nodes - self.base and bool(self._alive[r])
+
+    def _row(self, nid: int) -> int:
+        """Buffer row of a live node; KeyError for unknown or removed ids."""
+        if not self.is_alive(nid):
+            raise KeyError(nid)
+        return nid - self.base
+
+    def node_created_at(self, nid: int) -> int:
+        return int(self._created[self._row(nid)])
+
+    def node_domain(self, nid: int) -> Optional[int]:
+        d = int(self._domain[self._row(nid)])
+        return None if d == _NO_DOMAIN else d
+
+    def node_indeg(self, nid: int) -> int:
+        return int(self._indeg[self._row(nid)])
+
+    def node_outdeg(self, nid: int) -> int:
+        return int(self._outdeg[self._row(nid)])
+
+    def set_node_field(self, nid: int, field: str, value) -> None:
+        col = {"created_at": self._created, "domain": self._domain, "indeg": self._indeg, "outdeg": self._outdeg}[field]
+        col[self._row(nid)] = _NO_DOMAIN if (field == "domain" and value is None) else value
+
+    def live_ids(self) -> np.ndarray:
+        """Ascending ids of live nodes."""
+        n = self.n_nodes - self.base
+        return np.flatnonzero(self._alive[:n]) + self.base
+
+    def ids_created_since(self, cutoff: int) -> np.ndarray:
+        """Ascending ids of live nodes with created_at >= cutoff."""
+        n = self.n_nodes - self.base
+        return np.flatnonzero(self._alive[:n] & (self._created[:n] >= cutoff)) + self.base
+
+    def created_at_of(self, ids: np.ndarray) -> np.ndarray:
+        return self._created[ids - self.base]
+
+    def domain_of(self, ids: np.ndarray) -> np.ndarray:
+        return self._domain[ids - self.base]
+
+    def indeg_of(self, ids: np.ndarray) -> np.ndarray:
+        return self._indeg[ids - self.base]
+
+    def outdeg_of(self, ids: np.ndarray) -> np.ndarray:
+        return self._outdeg[ids - self.base]
+
+    def alive_of(self, ids: np.ndarray) -> np.ndarray:
+        r = ids - self.base
+        ok = (r >= 0) & (r < self.n_nodes - self.base)
+        out = np.zeros(ids.shape, dtype=bool)
+        out[ok] = self._alive[r[ok]]
+        return out
+
+    # ---- edges ----
+    def add_edge(self, u: int, v: int, t: int, w: float = 1.0) -> None:
+        ru, rv = self._row(u), self._row(v)
+        k = self.n_edges
+        if k >= self._src.shape[0]:
+            self._src = _grow(self._src, k + 1)
+            self._dst = _grow(self._dst, k + 1)
+            self._t = _grow(self._t, k + 1)
+            if self.weighted:
+                self._w = _grow(self._w, k + 1)
+        self._src[k] = u
+        self._dst[k] = v
+        self._t[k] = t
+        if self.weighted:
+            self._w[k] = w
+        self.n_edges = k + 1
+        self._outdeg[ru] += 1
+        self._indeg[rv] += 1
+
+    def add_edges(self, u: np.ndarray, v: np.ndarray, t: int) -> None:
+        """Append edges (u[i], v[i], t) in order, unweighted (w = 1)."""
+        u = np.asarray(u, dtype=np.int64)
+        v = np.asarray(v, dtype=np.int64)
+        for ids in (u, v):
+            bad = ~self.alive_of(ids)
+            if bad.any():
+                raise KeyError(int(ids[bad][0]))
+        k0, k = self.n_edges, int(u.shape[0])
+        if k0 + k > self._src.shape[0]:
+            self._src = _grow(self._src, k0 + k)
+            self._dst = _grow(self._dst, k0 + k)
+            self._t = _grow(self._t, k0 + k)
+            if self.weighted:
+                self._w = _grow(self._w, k0 + k)
+        self._src[k0:k0 + k] = u
+        self._dst[k0:k0 + k] = v
+        self._t[k0:k0 + k] = t
+        if self.weighted:
+            self._w[k0:k0 + k] = 1.0
+        self.n_edges = k0 + k
+        np.add.at(self._outdeg, u - self.base, 1)
+        np.add.at(self._indeg, v - self.base, 1)
+
+    @property
+    def src(self) -> np.ndarray:
+        return self._src[:self.n_edges]
+
+    @property
+    def dst(self) -> np.ndarray:
+        return self._dst[:self.n_edges]
+
+    @property
+    def t(self) -> np.ndarray:
+        return self._t[:self.n_edges]
+
+    @property
+    def w(self) -> np.ndarray:
+        return self._w[:self.n_edges] if self.weighted else np.ones(self.n_edges)
+
+    def edge_tuple(self, i: int) -> Tuple:
+        if self.weighted:
+            return (int(self._src[i]), int(self._dst[i]), float(self._w[i]), int(self._t[i]))
+        return (int(self._src[i]), int(self._dst[i]), int(self._t[i]))
+
+    def edge_tuples(self, mask: Optional[np.ndarray] = None) -> List[Tuple]:
+        """Edges as tuples in insertion order: (u, v, t), or (u, v, w, t) when weighted."""
+        src, dst, t = self.src, self.dst, self.t
+        if mask is not None:
+            src, dst, t = src[mask], dst[mask], t[mask]
+        if self.weighted:
+            w = self.w if mask is None else self.w[mask]
+            return list(zip(src.tolist(), dst.tolist(), w.tolist(), t.tolist()))
+        return list(zip(src.tolist(), dst.tolist(), t.tolist()))
+
+    def edges_within(self, ids: np.ndarray) -> np.ndarray:
+        """Mask of edges with both endpoints in ids."""
+        return np.isin(self.src, ids) & np.isin(self.dst, ids)
+
+    # ---- removal ----
+    def remove_nodes(self, ids: np.ndarray) -> np.ndarray:
+        """Kill nodes `ids`, drop every edge touching them; returns the mask of dropped edges."""
+        ids = np.asarray(ids, dtype=np.int64)
+        self._alive[ids - self.base] = False
+        self.n_alive -= int(ids.size)
+        dropped = ~(self.alive_of(self.src) & self.alive_of(self.dst))
+        keep = ~dropped
+        k = int(keep.sum())
+        self._src[:k] = self.src[keep]
+        self._dst[:k] = self.dst[keep]
+        self._t[:k] = self.t[keep]
+        if self.weighted:
+            self._w[:k] = self.w[keep]
+        self.n_edges = k
+        # release node rows below the oldest live node
+        n = self.n_nodes - self.base
+        live = np.flatnonzero(self._alive[:n])
+        shift = int(live[0]) if live.size else n
+        if shift:
+            for col in (self._created, self._domain, self._indeg, self._outdeg, self._alive):
+                col[:n - shift] = col[shift:n]
+            self._alive[n - shift:n] = False
+            self.base += shift
+        return dropped
+
+    # ---- checkpointing ----
+    def restore(self, base: int, n_nodes: int, created_at: np.ndarray, domain: np.ndarray,
+                indeg: np.ndarray, outdeg: np.ndarray, alive: np.ndarray,
+                src: np.ndarray, dst: np.ndarray, t: np.ndarray, w: Optional[np.ndarray] = None) -> None:
+        n = n_nodes - base
+        cap = max(16, n)
+        self.base = int(base)
+        self.n_nodes = int(n_nodes)
+        self.n_alive = int(np.count_nonzero(alive))
+        self._created = np.zeros(cap, dtype=np.int64)
+        self._created[:n] = created_at
+        self._domain = np.zeros(cap, dtype=np.int32)
+        self._domain[:n] = domain
+        self._indeg = np.zeros(cap, dtype=np.int32)
+        self._indeg[:n] = indeg
+        self._outdeg = np.zeros(cap, dtype=np.int32)
+        self._outdeg[:n] = outdeg
+        self._alive = np.zeros(cap, dtype=bool)
+        self._alive[:n] = alive
+        k = int(src.shape[0])
+        ecap = max(16, k)
+        self.n_edges = k
+        self._src = np.zeros(ecap, dtype=np.int64)
+        self._src[:k] = src
+        self._dst = np.zeros(ecap, dtype=np.int64)
+        self._dst[:k] = dst
+        self._t = np.zeros(ecap, dtype=np.int64)
+        self._t[:k] = t
+        self._w = np.zeros(ecap if self.weighted else 0, dtype=float)
+        if self.weighted and w is not None:
+            self._w[:k] = w
+
+
+class NodeRef:
+    """Attribute view of one node row (created_at, domain, indeg, outdeg)."""
+
+    __slots__ = ("_core", "_id")
+
+    def __init__(self, core: GraphCore, nid: int) -> None:
+        self._core = core
+        self._id = nid
+
+    @property
+    def created_at(self) -> int:
+        return self._core.node_created_at(self._id)
+
+    @created_at.setter
+    def created_at(self, value: int) -> None:
+        self._core.set_node_field(self._id, "created_at", value)
+
+    @property
+    def domain(self) -> Optional[int]:
+        return self._core.node_domain(self._id)
+
+    @domain.setter
+    def domain(self, value: Optional[int]) -> None:
+        self._core.set_node_field(self._id, "domain", value)
+
+    @property
+    def indeg(self) -> int:
+        return self._core.node_indeg(self._id)
+
+    @indeg.setter
+    def indeg(self, value: int) -> None:
+        self._core.set_node_field(self._id, "indeg", value)
+
+    @property
+    def outdeg(self) -> int:
+        return self._core.node_outdeg(self._id)
+
+    @outdeg.setter
+    def outdeg(self, value: int) -> None:
+        self._core.set_node_field(self._id, "outdeg", value)
+
+    def __repr__(self) -> str:
+        return (f"NodeRef(id={self._id}, created_at={self.created_at}, domain={self.domain}, "
+                f"indeg={self.indeg}, outdeg={self.outdeg})")
+
+
+class NodeView:
+    """Read-only mapping id -> NodeRef over the live nodes, in id order."""
+
+    def __init__(self, core: GraphCore) -> None:
+        self._core = core
+
+    def __len__(self) -> int:
+        return self._core.n_alive
+
+    def __contains__(self, nid) -> bool:
+        return isinstance(nid, (int, np.integer)) and self._core.is_alive(int(nid))
+
+    def __getitem__(self, nid: int) -> NodeRef:
+        if not self._core.is_alive(nid):
+            raise KeyError(nid)
+        return NodeRef(self._core, nid)
+
+    def get(self, nid: int, default=None):
+        return NodeRef(self._core, nid) if self._core.is_alive(nid) else default
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self._core.live_ids().tolist())
+
+    def keys(self) -> List[int]:
+        return self._core.live_ids().tolist()
+
+    def values(self) -> List[NodeRef]:
+        return [NodeRef(self._core, nid) for nid in self.keys()]
+
+    def items(self) -> List[Tuple[int, NodeRef]]:
+        return [(nid, NodeRef(self._core, nid)) for nid in self.keys()]
+
+
+class EdgeView:
+    """Sequence of edge tuples in insertion order."""
+
+    def __init__(self, core: GraphCore) -> None:
+        self._core = core
+
+    def __len__(self) -> int:
+        return self._core.n_edges
+
+    def __iter__(self) -> Iterator[Tuple]:
+        return iter(self._core.edge_tuples())
+
+    def __getitem__(self, i: int) -> Tuple:
+        n = self._core.n_edges
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError(i)
+        return self._core.edge_tuple(i)
@@ -1,30 +1,62 @@
 \
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Dict, List, Tuple
+from typing import Dict
 
+import numpy as np
 
-@dataclass
-class Node:
-    created_at: int
-    indeg: int = 0
-    outdeg: int = 0
+from .graph_core import EdgeView, GraphCore, NodeView
 
 
 class GraphStore:
     def __init__(self) -> None:
-        self.nodes: Dict[int, Node] = {}
-        self.edges: List[Tuple[int, int, float, int]] = []  # (u,v,w,epoch)
-        self._next_id: int = 0
+        # Columnar storage (graph_core.py); nodes / edges are dict- and list-style views on it.
+        self.core = GraphCore(weighted=True)
+        self.nodes = NodeView(self.core)  # nid -> NodeRef(created_at, indeg, outdeg)
+        self.edges = EdgeView(self.core)  # (u,v,w,epoch)
+
+    @property
+    def _next_id(self) -> int:
+        return self.core.n_nodes
 
     def new_node(self, created_at: int) -> int:
-        nid = self._next_id
-        self._next_id += 1
-        self.nodes[nid] = Node(created_at=created_at)
-        return nid
+        return self.core.add_node(int(created_at))
 
     def add_edge(self, u: int, v: int, w: float, epoch: int) -> None:
-        self.edges.append((u, v, float(w), int(epoch)))
-        self.nodes[u].outdeg += 1
-        self.nodes[v].indeg += 1
+        self.core.add_edge(int(u), int(v), int(epoch), float(w))
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """Graph contents as flat arrays (checkpointing)."""
+        c = self.core
+        ids = c.live_ids()
+        return {
+            "gs_ids": ids,
+            "gs_created_at": c.created_at_of(ids),
+            "gs_indeg": c.indeg_of(ids).astype(np.int64),
+            "gs_outdeg": c.outdeg_of(ids).astype(np.int64),
+            "gs_edge_uv": np.stack([c.src, c.dst, c.t], axis=1),
+            "gs_edge_w": c.w.copy(),
+            "gs_next_id": np.array(c.n_nodes, dtype=np.int64),
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray]) -> "GraphStore":
+        g = cls()
+        ids = arrays["gs_ids"]
+        n_nodes = int(arrays["gs_next_id"])
+        base = int(ids[0]) if ids.size else n_nodes
+        n = n_nodes - base
+        rows = ids - base
+
+        def col(values: np.ndarray) -> np.ndarray:
+            out = np.zeros(n, dtype=values.dtype)
+            out[rows] = values
+            return out
+
+        alive = np.zeros(n, dtype=bool)
+        alive[rows] = True
+        uv = arrays["gs_edge_uv"].reshape(-1, 3)
+        g.core.restore(base, n_nodes, col(arrays["gs_created_at"]), np.zeros(n, dtype=np.int32),
+                       col(arrays["gs_indeg"]), col(arrays["gs_outdeg"]), alive,
+                       uv[:, 0], uv[:, 1], uv[:, 2], arrays["gs_edge_w"])
+        return g
@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+"""
+kernels_fused.py (BCQM VI)
+
+Fused single-pass glue step: an alternative backend to the verbatim BCQM V kernels in
+kernels_v_ancestor.py (which stay untouched).
+
+One call of fused_glue_step does, for one tick,
+  cadence_step -> hop_coherence_step -> bundle update -> shared_bias_step
+  -> phase_lock_step -> domain_glue_step -> bundle update
+with the same random draws, in the same order, and the same floating-point operations as the
+ancestor sequence in run_single_v_glue, so trajectories are identical for a fixed seed.
+
+What it saves per tick:
+- The complex order parameter mean(exp(1j*theta)) is evaluated once (inside the phase-lock
+  stage) instead of three times: theta does not change between the end of one tick and the
+  phase-lock stage of the next, so the running theta_mean is carried in the workspace.
+- Cadence, hop, flip masks and phase arrays are updated in place in preallocated buffers
+  (no astype copies, no temporary masks, no fresh theta arrays).
+
+Assumption: thread domain labels are fixed during a run (no kernel relabels them), so the
+per-domain index lists are built once.
+
+YAML:
+  engine:
+    kernels: fused      # ancestor (default) | fused
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List
+
+import numpy as np
+
+from .state import ThreadState, BundleState
+
+
+def kernels_backend(cfg: Dict[str, Any]) -> str:
+    engine = cfg.get("engine", {}) or {}
+    backend = str(engine.get("kernels", "ancestor")).lower()
+    if backend not in ("ancestor", "fused"):
+        raise ValueError("engine.kernels must be ancestor | fused")
+    return backend
+
+
+@dataclass
+class FusedWorkspace:
+    """Preallocated per-run buffers and the running phase order parameter."""
+    theta_mean: float
+    r: np.ndarray          # uniforms
+    d: np.ndarray          # phase differences / scratch reals
+    tmp: np.ndarray        # scratch reals
+    theta_alt: np.ndarray  # second theta buffer (swapped each phase-lock stage)
+    z: np.ndarray          # scratch complex
+    active: np.ndarray     # cadence mask
+    slips: np.ndarray      # scratch mask
+    join: np.ndarray
+    brk: np.ndarray
+    domain_idx: List[np.ndarray]
+
+    @classmethod
+    def for_run(cls, threads: ThreadState, bundle: BundleState, cfg_domains) -> "FusedWorkspace":
+        N = threads.v.shape[0]
+        # Own float copies so the cadence stage can work in place.
+        threads.T = np.array(threads.T, dtype=float)
+        threads.phi = np.array(threads.phi, dtype=float)
+        threads.theta = np.array(threads.theta, dtype=float)
+        n_domains = max(1, int(getattr(cfg_domains, "n_initial_domains", 1)))
+        dom = np.asarray(threads.domain)
+        return cls(
+            theta_mean=float(bundle.theta_mean),
+            r=np.empty(N),
+            d=np.empty(N),
+            tmp=np.empty(N),
+            theta_alt=np.empty(N),
+            z=np.empty(N, dtype=complex),
+            active=np.ones(N, dtype=bool),
+            slips=np.empty(N, dtype=bool),
+            join=np.empty(N, dtype=bool),
+            brk=np.empty(N, dtype=bool),
+            domain_idx=[np.flatnonzero(dom == k) for k in range(n_domains)],
+        )
+
+
+def _uniform(rng, ws: FusedWorkspace) -> np.ndarray:
+    rng.random(out=ws.r)
+    return ws.r
+
+
+def _wrapped_delta(ws: FusedWorkspace, theta_mean: float, theta: np.ndarray) -> np.ndarray:
+    # np.angle(np.exp(1j * (theta_mean - theta))) into ws.d
+    np.subtract(theta_mean, theta, out=ws.d)
+    np.multiply(1j, ws.d, out=ws.z)
+    np.exp(ws.z, out=ws.z)
+    return np.arctan2(ws.z.imag, ws.z.real, out=ws.d)
+
+
+def fused_glue_step(rng,
+                    threads: ThreadState,
+                    bundle: BundleState,
+                    ws: FusedWorkspace,
+                    cfg_hop,
+                    cfg_shared,
+                    cfg_phase,
+                    cfg_domains,
+                    cfg_cadence) -> float:
+    """Advance one tick in place; updates bundle (m, theta_mean, X) and returns dX."""
+    v = threads.v
+    active = ws.active
+
+    # Cadence
+    if getattr(cfg_cadence, "enabled", False):
+        T = threads.T
+        phi = threads.phi
+        phi += 1.0
+        np.greater_equal(phi, T, out=active)
+        np.subtract(phi, T, out=phi, where=active)
+        lambda_cadence = float(getattr(cfg_cadence, "lambda_cadence", 0.0))
+        if lambda_cadence > 0.0:
+            mean_T = float(np.mean(T))
+            np.subtract(mean_T, T, out=ws.tmp)
+            ws.tmp *= lambda_cadence
+            T += ws.tmp
+            np.maximum(T, 1e-3, out=T)
+    else:
+        active.fill(True)
+    threads.active = active
+
+    # Hop coherence
+    q_base = getattr(cfg_hop, "q_base", None)
+    if q_base is None:
+        q_base = min(0.5, float(cfg_hop.k_prefactor) / 50.0)
+    if active.any():
+        np.less(_uniform(rng, ws), q_base, out=ws.slips)
+        ws.slips &= active
+        np.negative(v, out=v, where=ws.slips)
+
+    m = float(np.mean(v))
+    bundle.m = m
+    bundle.theta_mean = ws.theta_mean
+
+    # Shared bias
+    if cfg_shared.enabled and m != 0.0:
+        sign_m = 1.0 if m >= 0.0 else -1.0
+        flip_prob = np.clip(float(cfg_shared.lambda_bias), 0.0, 1.0)
+        np.less(_uniform(rng, ws), flip_prob, out=ws.slips)
+        ws.slips &= (v != sign_m)
+        np.copyto(v, sign_m, where=ws.slips)
+
+    # Phase lock
+    if cfg_phase.enabled:
+        theta = threads.theta
+        theta_new = ws.theta_alt
+        delta = _wrapped_delta(ws, ws.theta_mean, theta)
+        np.sin(delta, out=delta)
+        delta *= float(cfg_phase.lambda_phase)
+        np.add(theta, float(cfg_phase.omega_0), out=theta_new)
+        theta_new += delta
+        noise_sigma = float(getattr(cfg_phase, "noise_sigma", 0.0))
+        if noise_sigma > 0.0:
+            theta_new += noise_sigma * rng.normal(size=theta_new.shape[0])
+        np.mod(theta_new, 2.0 * np.pi, out=theta_new)
+        threads.theta = theta_new
+        ws.theta_alt = theta
+
+        np.multiply(1j, theta_new, out=ws.z)
+        np.exp(ws.z, out=ws.z)
+        theta_mean_new = np.angle(np.mean(ws.z))
+        ws.theta_mean = float(theta_mean_new)
+
+        delta_new = _wrapped_delta(ws, theta_mean_new, theta_new)
+        np.abs(delta_new, out=delta_new)
+        np.less(delta_new, float(cfg_phase.theta_join), out=ws.join)
+        np.greater(delta_new, float(cfg_phase.theta_break), out=ws.brk)
+        if ws.join.any():
+            sign_m = 1.0 if m >= 0.0 else -1.0
+            np.less(_uniform(rng, ws), 0.1, out=ws.slips)
+            ws.slips &= ws.join
+            np.copyto(v, sign_m, where=ws.slips)
+        if ws.brk.any():
+            np.less(_uniform(rng, ws), 0.1, out=ws.slips)
+            ws.slips &= ws.brk
+            np.negative(v, out=v, where=ws.slips)
+
+    # Domain glue (ancestor draws from the global np.random stream; kept as is)
+    if cfg_domains.enabled:
+        lambda_dom = float(cfg_domains.lambda_domain)
+        for idx in ws.domain_idx:
+            if idx.size == 0:
+                continue
+            v_d = v[idx]
+            m_d = float(v_d.mean())
+            if m_d == 0.0:
+                continue
+            sign_md = 1.0 if m_d >= 0.0 else -1.0
+            flip_prob = np.clip(lambda_dom * abs(m_d), 0.0, 1.0)
+            to_flip = (v_d != sign_md) & (np.random.random(idx.size) < flip_prob)
+            v[idx[to_flip]] = sign_md
+
+    dX = float(np.mean(v))
+    bundle.m = dX
+    bundle.theta_mean = ws.theta_mean
+    bundle.X += dX
+    return dX
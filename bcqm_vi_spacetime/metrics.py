@@ -7,5 +7,198 @@ Direct ancestry:
 - `metrics_v_ancestor.py` is a verbatim copy of BCQM V: `bcqm_glue_axes/metrics.py`
 
 Do not edit `metrics_v_ancestor.py`. If changes are needed, wrap or extend here.
+
+Streaming mode (engine.metrics.mode: streaming):
+- StreamingLockstepMetrics accumulates Q_clock, ell_lock and L_inst online, so the engine never
+  holds the full m(t) / dX(t) series. Memory is O(rows * (chunk + max_lag)).
+- Q_clock: chunked Welford / Chan merge of mean and (population) variance of dX.
+- L_inst: running sum of |m|.
+- ell_lock: lagged products S_k = sum_t z_t z_{t+k} for k <= max_lag (z = m - c, c the mean of the
+  first chunk, to keep the mean correction well conditioned), plus the first and last max_lag
+  values; the autocovariance about the full-series mean is recovered exactly at the end.
+  ell_lock sums the positive part of the ACF up to max_lag only; with max_lag >= T_eff - 1 it
+  matches compute_lockstep_metrics up to rounding.
+
+YAML:
+  engine:
+    metrics:
+      mode: streaming    # batch (default) | streaming
+      max_lag: 4096
+      chunk: 8192        # ticks buffered between updates
 """
+from typing import Any, Dict, Optional
+
+import numpy as np
+
 from .metrics_v_ancestor import *  # noqa: F401,F403
+
+
+def metrics_cfg(cfg: Dict[str, Any]) -> Dict[str, Any]:
+    engine = cfg.get("engine", {}) or {}
+    m = engine.get("metrics", {}) or {}
+    mode = str(m.get("mode", "batch")).lower()
+    if mode not in ("batch", "streaming"):
+        raise ValueError("engine.metrics.mode must be batch | streaming")
+    max_lag = max(1, int(m.get("max_lag", 4096)))
+    return {"mode": mode, "max_lag": max_lag, "chunk": max(1, int(m.get("chunk", max(8192, max_lag))))}
+
+
+def metrics_provenance(cfg: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """RUN_CONFIG record of the lockstep-metrics mode (None for the batch FFT path)."""
+    mc = metrics_cfg(cfg)
+    if mc["mode"] == "batch":
+        return None
+    return {"mode": mc["mode"], "max_lag": mc["max_lag"]}
+
+
+class StreamingLockstepMetrics:
+    """
+    Online counterpart of compute_lockstep_metrics for `rows` independent series.
+
+    push(m, dX) appends one tick (scalars, or arrays of shape (rows,)); result(row) returns the
+    metrics of one row, result() those of the whole ensemble (ACF averaged over rows, as the
+    batch path does for an (E, T) input).
+    """
+
+    def __init__(self, rows: int = 1, max_lag: int = 4096, chunk: int = 8192) -> None:
+        self.rows = int(rows)
+        self.L = max(1, int(max_lag))
+        self.C = max(1, int(chunk))
+        self._m = np.empty((self.rows, self.C))
+        self._dX = np.empty((self.rows, self.C))
+        self._pos = 0
+        self.n = 0
+        # dX: Welford state
+        self._mean = np.zeros(self.rows)
+        self._M2 = np.zeros(self.rows)
+        # m: |m| sum, shifted sums and lagged products
+        self._abs = np.zeros(self.rows)
+        self._c: Optional[np.ndarray] = None
+        self._sum = np.zeros(self.rows)
+        self._S = np.zeros((self.rows, self.L + 1))
+        self._head = np.zeros((self.rows, self.L))
+        self._tail = np.zeros((self.rows, self.L))
+
+    def push(self, m, dX) -> None:
+        p = self._pos
+        self._m[:, p] = m
+        self._dX[:, p] = dX
+        self._pos = p + 1
+        if self._pos == self.C:
+            self._flush()
+
+    def push_many(self, m: np.ndarray, dX: np.ndarray) -> None:
+        """Append a (rows, k) block of ticks."""
+        m = np.asarray(m, dtype=float).reshape(self.rows, -1)
+        dX = np.asarray(dX, dtype=float).reshape(self.rows, -1)
+        i = 0
+        while i < m.shape[1]:
+            k = min(self.C - self._pos, m.shape[1] - i)
+            self._m[:, self._pos:self._pos + k] = m[:, i:i + k]
+            self._dX[:, self._pos:self._pos + k] = dX[:, i:i + k]
+            self._pos += k
+            i += k
+            if self._pos == self.C:
+                self._flush()
+
+    def _flush(self) -> None:
+        k = self._pos
+        if k == 0:
+            return
+        m = self._m[:, :k]
+        dX = self._dX[:, :k]
+        n_a = self.n
+        n = n_a + k
+
+        mean_b = dX.mean(axis=1)
+        M2_b = np.sum((dX - mean_b[:, None]) ** 2, axis=1)
+        delta = mean_b - self._mean
+        self._mean = self._mean + delta * (k / n)
+        self._M2 = self._M2 + M2_b + delta * delta * (n_a * k / n)
+
+        self._abs += np.sum(np.abs(m), axis=1)
+        if self._c is None:
+            self._c = m.mean(axis=1)
+        z = m - self._c[:, None]
+        self._sum += z.sum(axis=1)
+        if n_a < self.L:
+            h = min(self.L - n_a, k)
+            self._head[:, n_a:n_a + h] = z[:, :h]
+
+        # S_k += sum_j z_j * y_{L + j - k}, y = [last L values, this chunk], via one FFT correlation.
+        L = self.L
+        y = np.concatenate([self._tail, z], axis=1)
+        nfft = 1 << (L + k - 1).bit_length()
+        corr = np.fft.irfft(np.fft.rfft(y, nfft) * np.conjugate(np.fft.rfft(z, nfft)), nfft)
+        self._S += corr[:, L::-1]
+        self._tail = y[:, -L:].copy()
+
+        self.n = n
+        self._pos = 0
+
+    def get_state(self) -> Dict[str, np.ndarray]:
+        """Accumulator state, including ticks buffered since the last chunk update (checkpointing)."""
+        return {
+            "lm_buf_m": self._m[:, :self._pos].copy(),
+            "lm_buf_dX": self._dX[:, :self._pos].copy(),
+            "lm_n": np.array(self.n, dtype=np.int64),
+            "lm_mean": self._mean,
+            "lm_M2": self._M2,
+            "lm_abs": self._abs,
+            "lm_c": np.empty(0) if self._c is None else self._c,
+            "lm_sum": self._sum,
+            "lm_S": self._S,
+            "lm_head": self._head,
+            "lm_tail": self._tail,
+        }
+
+    def set_state(self, arrays: Dict[str, np.ndarray]) -> None:
+        self._pos = int(arrays["lm_buf_m"].shape[1])
+        self._m[:, :self._pos] = arrays["lm_buf_m"]
+        self._dX[:, :self._pos] = arrays["lm_buf_dX"]
+        self.n = int(arrays["lm_n"])
+        self._mean = np.array(arrays["lm_mean"], dtype=float)
+        self._M2 = np.array(arrays["lm_M2"], dtype=float)
+        self._abs = np.array(arrays["lm_abs"], dtype=float)
+        self._c = np.array(arrays["lm_c"], dtype=float) if arrays["lm_c"].size else None
+        self._sum = np.array(arrays["lm_sum"], dtype=float)
+        self._S = np.array(arrays["lm_S"], dtype=float)
+        self._head = np.array(arrays["lm_head"], dtype=float)
+        self._tail = np.array(arrays["lm_tail"], dtype=float)
+
+    def _acf(self) -> np.ndarray:
+        n = self.n
+        K = min(self.L, n - 1) + 1
+        lags = np.arange(K)
+        tot = self._sum[:, None]
+        # sum of the first k / last k values of z, k = 0..K-1
+        first = np.concatenate([np.zeros((self.rows, 1)), np.cumsum(self._head[:, :K - 1], axis=1)], axis=1)
+        last = np.concatenate([np.zeros((self.rows, 1)),
+                               np.cumsum(self._tail[:, ::-1][:, :K - 1], axis=1)], axis=1)
+        mu = tot / n
+        cov = self._S[:, :K] - mu * ((tot - last) + (tot - first)) + (n - lags)[None, :] * mu * mu
+        return cov / cov[:, :1]
+
+    def result(self, row: Optional[int] = None) -> Dict[str, float]:
+        self._flush()
+        if self.n == 0:
+            raise ValueError("no samples pushed")
+        sel = slice(None) if row is None else slice(row, row + 1)
+        acf_mean = self._acf()[sel].mean(axis=0)
+        ell_lock = float(np.sum(np.maximum(acf_mean, 0.0)))
+        if row is None:
+            # pooled mean / variance of dX over all rows
+            mean_dX = float(np.mean(self._mean))
+            M2 = float(np.sum(self._M2 + self.n * (self._mean - mean_dX) ** 2))
+            std_dX = float(np.sqrt(M2 / (self.n * self.rows)))
+            L_inst = float(np.sum(self._abs) / (self.n * self.rows))
+        else:
+            mean_dX = float(self._mean[row])
+            std_dX = float(np.sqrt(self._M2[row] / self.n))
+            L_inst = float(self._abs[row] / self.n)
+        Q_clock = float(abs(mean_dX) / std_dX) if std_dX > 0 else 0.0
+        return {
+            "L_inst": L_inst,
+            "ell_lock": ell_lock,
+            "Q_clock": Q_clock,
+        }
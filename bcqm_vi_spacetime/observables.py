@@ -6,6 +6,7 @@ from typing import Dict, List, Set, Tuple, Any
 import math
 import numpy as np
 
+from .csr_geometry import CSRGraph, mean_clustering, sampled_clustering
 from .graph_store import GraphStore
 
 
@@ -38,24 +39,9 @@ def clustering_coefficient_undirected(adj: Dict[int, Set[int]], sample: int | No
         return 0.0
     if sample is not None and len(nodes) > sample:
         rng = np.random.default_rng(0)
-        nodes = list(rng.choice(nodes, size=sample, replace=False))
-    coeffs: List[float] = []
-    for v in nodes:
-        nbrs = list(adj.get(v, set()))
-        k = len(nbrs)
-        if k < 2:
-            continue
-        links = 0
-        for i in range(k):
-            ni = nbrs[i]
-            ai = adj.get(ni, set())
-            for j in range(i + 1, k):
-                if nbrs[j] in ai:
-                    links += 1
-        coeffs.append((2.0 * links) / (k * (k - 1)))
-    if not coeffs:
-        return 0.0
-    return float(sum(coeffs)) / float(len(coeffs))
+        picked = rng.choice(len(nodes), size=sample, replace=False).tolist()
+        return float(sampled_clustering([nodes[i] for i in picked], adj))
+    return float(mean_clustering(CSRGraph.from_adjacency(nodes, adj)))
 
 
 def induced_active_set(cfg: Dict[str, Any], g: GraphStore, frontier: List[int], epoch: int) -> List[int]:
@@ -64,7 +50,7 @@ def induced_active_set(cfg: Dict[str, Any], g: GraphStore, frontier: List[int],
     if mode == "recency":
         hops = int(aw["hops"])
         cutoff = max(0, epoch - hops)
-        active = [nid for nid, nd in g.nodes.items() if nd.created_at >= cutoff]
+        active = g.core.ids_created_since(cutoff).tolist()
         aset = set(active)
         aset.update(frontier)
         return list(aset)
@@ -92,10 +78,10 @@ def s_perc(g: GraphStore, active: List[int]) -> float:
         return 0.0
     aset = set(active)
     adj: Dict[int, Set[int]] = {v: set() for v in aset}
-    for u, v, w, t in g.edges:
-        if u in aset and v in aset:
-            adj[u].add(v)
-            adj[v].add(u)
+    mask = g.core.edges_within(np.fromiter(aset, dtype=np.int64, count=len(aset)))
+    for u, v in zip(g.core.src[mask].tolist(), g.core.dst[mask].tolist()):
+        adj[u].add(v)
+        adj[v].add(u)
 
     seen: Set[int] = set()
     best = 0
@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+"""
+rng_streams.py (BCQM VI)
+
+Block-drawn random streams for the v_glue tick loop.
+
+The ancestor kernels make several small rng.random(N) / rng.normal(size=N) calls per tick and the
+space layer one scalar rng.random() per thread. In blocked mode those calls are served from large
+pre-drawn blocks (default 4096 ticks at a time), so Generator call overhead leaves the hot loop.
+
+Stream layout v1 (RNG_STREAM_LAYOUT = 1):
+- Initial state (v0, theta0, domain0, cadence periods/phases) is drawn from default_rng(seed)
+  exactly as in the legacy engine; the stream takes over from the first tick.
+- U: every later uniform is the next double of that generator's random() stream, consumed in call
+  order: random(k) takes the next k values, random() the next one.
+- choice(a): one value u of U, element a[floor(u * len(a))]; integers(low, high): one value u,
+  low + floor(u * (high - low)) (integers(k) is integers(0, k), as for Generator).
+- G: Gaussian variates come from a child generator spawned from the seed's SeedSequence
+  (gen.spawn(1)[0]) and are consumed in call order.
+
+Consequences:
+- The block size never changes a value (Generator.random(k) output concatenates).
+- Runs that only draw uniforms through the kernels (nospace, phase noise_sigma = 0) are
+  bit-identical to the legacy stream. Space-layer candidate picks and phase noise differ from
+  legacy but are reproducible under layout v1.
+
+YAML:
+  engine:
+    rng:
+      mode: blocked      # legacy (default) | blocked
+      block_ticks: 4096
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+RNG_STREAM_LAYOUT = 1
+
+# Uniform slots per thread per tick: hop, shared bias, phase join, phase break, space reuse + pick.
+_SLOTS_PER_THREAD = 6
+
+
+def rng_cfg(cfg: Dict[str, Any]) -> Dict[str, Any]:
+    engine = cfg.get("engine", {}) or {}
+    r = engine.get("rng", {}) or {}
+    mode = str(r.get("mode", "legacy")).lower()
+    if mode not in ("legacy", "blocked"):
+        raise ValueError("engine.rng.mode must be legacy | blocked")
+    return {"mode": mode, "block_ticks": max(1, int(r.get("block_ticks", 4096)))}
+
+
+def rng_provenance(cfg: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """RUN_CONFIG record of the stream layout (None for the legacy stream)."""
+    rc = rng_cfg(cfg)
+    if rc["mode"] == "legacy":
+        return None
+    return {"mode": rc["mode"], "layout": RNG_STREAM_LAYOUT, "block_ticks": rc["block_ticks"]}
+
+
+class BlockUniformStream:
+    """
+    Drop-in for the subset of np.random.Generator used by the kernels and the space layer,
+    serving layout-v1 streams from pre-drawn blocks.
+    """
+
+    def __init__(self, gen: np.random.Generator, block_size: int) -> None:
+        self._gen = gen
+        self._gauss = gen.spawn(1)[0]
+        self._block = max(1, int(block_size))
+        self._u = np.empty(0)
+        self._ul: List[float] = []  # same block as Python floats, for scalar draws
+        self._upos = 0
+        self._g = np.empty(0)
+        self._gpos = 0
+
+    def _refill_u(self, k: int) -> None:
+        rest = self._u[self._upos:]
+        self._u = np.concatenate([rest, self._gen.random(max(self._block, k))])
+        self._ul = self._u.tolist()
+        self._upos = 0
+
+    def random(self, size: Optional[int] = None, out: Optional[np.ndarray] = None):
+        if out is not None:
+            size = out.shape
+        k = 1 if size is None else (size if type(size) is int else int(np.prod(size)))
+        if self._upos + k > len(self._ul):
+            self._refill_u(k)
+        pos = self._upos
+        self._upos = pos + k
+        if out is not None:
+            out[...] = self._u[pos:pos + k].reshape(out.shape)
+            return out
+        if size is None:
+            return self._ul[pos]
+        out = self._u[pos:pos + k]
+        return out if type(size) is int else out.reshape(size)
+
+    def normal(self, loc: float = 0.0, scale: float = 1.0, size: Optional[int] = None):
+        k = 1 if size is None else (size if type(size) is int else int(np.prod(size)))
+        if self._gpos + k > self._g.size:
+            rest = self._g[self._gpos:]
+            self._g = np.concatenate([rest, self._gauss.standard_normal(max(self._block, k))])
+            self._gpos = 0
+        z = self._g[self._gpos:self._gpos + k]
+        self._gpos += k
+        if size is None:
+            return float(loc + scale * z[0])
+        return loc + scale * (z if type(size) is int else z.reshape(size))
+
+    def choice(self, a: Sequence[Any]):
+        k = len(a)
+        if k == 0:
+            raise ValueError("a cannot be empty")
+        return a[min(int(self.random() * k), k - 1)]
+
+    def integers(self, low: int, high: Optional[int] = None) -> int:
+        """Scalar Generator.integers(low, high): one value of U; high=None draws from [0, low)."""
+        if high is None:
+            low, high = 0, low
+        k = int(high) - int(low)
+        if k <= 0:
+            raise ValueError("high <= low")
+        return int(low) + min(int(self.random() * k), k - 1)
+
+    def get_state(self) -> Tuple[Dict[str, Any], Dict[str, np.ndarray]]:
+        meta = {"gen": self._gen.bit_generator.state, "gauss": self._gauss.bit_generator.state,
+                "block": self._block, "upos": self._upos, "gpos": self._gpos}
+        return meta, {"rng_u": self._u, "rng_g": self._g}
+
+    def set_state(self, meta: Dict[str, Any], arrays: Dict[str, np.ndarray]) -> None:
+        self._gen.bit_generator.state = meta["gen"]
+        self._gauss.bit_generator.state = meta["gauss"]
+        self._block = int(meta["block"])
+        self._u = np.array(arrays["rng_u"], dtype=float)
+        self._ul = self._u.tolist()
+        self._upos = int(meta["upos"])
+        self._g = np.array(arrays["rng_g"], dtype=float)
+        self._gpos = int(meta["gpos"])
+
+
+def wrap_rng(rng: np.random.Generator, cfg: Dict[str, Any], N: int):
+    """Return rng unchanged (legacy) or a layout-v1 block stream on top of it."""
+    rc = rng_cfg(cfg)
+    if rc["mode"] == "legacy":
+        return rng
+    return BlockUniformStream(rng, rc["block_ticks"] * max(1, int(N)) * _SLOTS_PER_THREAD)
+
+
+def stream_state(rng) -> Tuple[Dict[str, Any], Dict[str, np.ndarray]]:
+    """Checkpoint state of a tick-loop stream (plain Generator or BlockUniformStream)."""
+    if isinstance(rng, BlockUniformStream):
+        meta, arrays = rng.get_state()
+        meta["kind"] = "blocked"
+        return meta, arrays
+    return {"kind": "generator", "gen": rng.bit_generator.state}, {}
+
+
+def restore_stream(rng, meta: Dict[str, Any], arrays: Dict[str, np.ndarray]) -> None:
+    kind = "blocked" if isinstance(rng, BlockUniformStream) else "generator"
+    if meta["kind"] != kind:
+        raise ValueError(f"Checkpoint RNG stream is {meta['kind']}, run uses {kind}")
+    if kind == "blocked":
+        rng.set_state(meta, arrays)
+    else:
+        rng.bit_generator.state = meta["gen"]
+
+
+def global_random_state() -> Tuple[Dict[str, Any], Dict[str, np.ndarray]]:
+    """State of the legacy global np.random stream (drawn by the ancestor domain kernel)."""
+    name, keys, pos, has_gauss, cached = np.random.get_state()
+    return ({"name": name, "pos": int(pos), "has_gauss": int(has_gauss), "cached_gaussian": float(cached)},
+            {"np_random_keys": keys})
+
+
+def restore_global_random(meta: Dict[str, Any], arrays: Dict[str, np.ndarray]) -> None:
+    np.random.set_state((meta["name"], arrays["np_random_keys"], meta["pos"], meta["has_gauss"],
+                         meta["cached_gaussian"]))
+
+
+class RowBlockStreams:
+    """
+    Layout-v1 streams for R rows of a batched engine. Row e holds a block of its own uniform
+    stream and (drawn on first use) a block of its Gaussian stream; a request for rows `sel` takes
+    widths[e] values from each selected row in one gather.
+    """
+
+    def __init__(self, gens: List[np.random.Generator], widths: np.ndarray, block_ticks: int) -> None:
+        self.gens = gens
+        self.gauss = [g.spawn(1)[0] for g in gens]
+        self.widths = np.asarray(widths, dtype=int)
+        self.R = len(gens)
+        self.N_max = int(self.widths.max())
+        self.B = max(self.N_max, int(block_ticks) * self.N_max * 4)
+        self.buf = np.vstack([g.random(self.B) for g in gens])
+        self.cur = np.zeros(self.R, dtype=np.int64)
+        # Gaussians: one variate per thread per tick at most (phase noise)
+        self.BG = max(self.N_max, int(block_ticks) * self.N_max)
+        self.gbuf: Optional[np.ndarray] = None
+        self.gcur = np.zeros(self.R, dtype=np.int64)
+        self._udraw = [g.random for g in gens]
+        self._gdraw = [g.standard_normal for g in self.gauss]
+        self._lane = np.arange(self.N_max)
+        self._valid = self._lane[None, :] < self.widths[:, None]
+
+    def _take(self, buf: np.ndarray, cur: np.ndarray, draws: List[Any], sel: np.ndarray) -> np.ndarray:
+        """Gather widths[e] values from row e of buf at cur[e] for selected rows; refills, advances cur."""
+        B = buf.shape[1]
+        for e in np.flatnonzero(sel & (cur + self.widths > B)):
+            rest = buf[e, cur[e]:].copy()
+            buf[e, :rest.size] = rest
+            buf[e, rest.size:] = draws[e](B - rest.size)
+            cur[e] = 0
+        idx = np.minimum(cur[:, None] + self._lane[None, :], B - 1)
+        vals = np.take_along_axis(buf, idx, axis=1)
+        cur += np.where(sel, self.widths, 0)
+        return vals
+
+    def uniform(self, sel: np.ndarray) -> np.ndarray:
+        """Next widths[e] uniforms for each selected row e; other entries are NaN."""
+        vals = self._take(self.buf, self.cur, self._udraw, sel)
+        return np.where(sel[:, None] & self._valid, vals, np.nan)
+
+    def normal(self, sel: np.ndarray) -> np.ndarray:
+        """Next widths[e] standard normals for each selected row e; other entries are 0."""
+        if self.gbuf is None:
+            self.gbuf = np.vstack([draw(self.BG) for draw in self._gdraw])
+        vals = self._take(self.gbuf, self.gcur, self._gdraw, sel)
+        return np.where(sel[:, None] & self._valid, vals, 0.0)
@@ -12,6 +12,7 @@ from .config_schema import validate, resolve_seeds, resolve_n_values
 from .glue import resolve_glue_params
 from .graph_store import GraphStore
 from .io import ensure_dir, write_json
+from .checkpoint import Checkpointer, check_resume, load_checkpoint
 from .observables import (
     induced_active_set,
     s_perc,
@@ -23,6 +24,8 @@ from .observables import (
 from .selection import choose_targets
 from .snapshots import write_edges_csv, write_nodes_json
 from .engine_vglue import run_single_v_glue
+from .engine_vglue_batch import SweepPoint, batch_cfg, run_sweep_v_glue
+from .window_indegrees import WindowIndegrees
 
 
 def _run_id(experiment_id: str, variant: str, N: int, n: float, seed: int) -> str:
@@ -74,24 +77,29 @@ def _choose_preferred_existing(
     tau = max(1, W_coh // 4)
     alpha = 0.75
 
-    def score(vid: int) -> float:
-        nd = g.nodes[vid]
-        age = max(0, epoch - int(nd.created_at))
-        return math.exp(-age / float(tau)) / ((1.0 + float(nd.indeg)) ** float(alpha))
+    # score = exp(-age / tau) / (1 + indeg)^alpha for the whole pool; exp and ** are evaluated with
+    # math once per distinct age / indegree, so scores (and tie order) match the scalar formula.
+    ids = np.asarray(pool, dtype=np.int64)
+    ages, a_inv = np.unique(np.maximum(0, epoch - g.core.created_at_of(ids).astype(np.int64)), return_inverse=True)
+    degs, d_inv = np.unique(g.core.indeg_of(ids), return_inverse=True)
+    decay = np.array([math.exp(-a / float(tau)) for a in ages.tolist()])
+    damp = np.array([(1.0 + float(d)) ** float(alpha) for d in degs.tolist()])
+    score = decay[a_inv] / damp[d_inv]
 
     k = min(10, len(pool))
-    top = sorted(pool, key=score, reverse=True)[:k]
+    # stable sort on -score: ties keep pool order, as sorted(..., reverse=True) did
+    top = ids[np.argsort(-score, kind="stable")[:k]]
     return int(rng.choice(top))
 
 
-def run_single(cfg: Dict[str, Any], N: int, n: float, seed: int) -> None:
+def run_single(cfg: Dict[str, Any], N: int, n: float, seed: int, resume: Path | None = None) -> None:
     validate(cfg)
 
     # Engine dispatch
     engine = cfg.get("engine", {}) or {}
     mode = engine.get("mode", "scaffold")
     if mode == "v_glue":
-        run_single_v_glue(cfg, N, n, seed)
+        run_single_v_glue(cfg, N, n, seed, resume=resume)
         return
 
     # Default: existing scaffold engine
@@ -146,16 +154,52 @@ def run_single(cfg: Dict[str, Any], N: int, n: float, seed: int) -> None:
 
     beta_junc = float(cfg.get("observables", {}).get("beta_junc", 1.5))
     compute_clust = bool(cfg.get("observables", {}).get("compute_clustering", True))
+    clust_sample = cfg.get("observables", {}).get("clustering_sample", 500)  # null or 0: all active nodes
+
+    # Junction statistics every k measured epochs from the incremental window indegree histogram
+    # (output.junction_every; recency active window only).
+    aw_cfg = cfg["active_window"]
+    junction_every = max(0, int(out_cfg.get("junction_every", 0) or 0)) if aw_cfg["mode"] == "recency" else 0
+    junction_ts: Dict[str, Any] = {}
+    if junction_every:
+        junction_ts = {"every": junction_every, "epochs": [], "S_junc_w": [], "hubshare": [], "max_indegree": []}
+
+    # Checkpoint/resume (engine.checkpoint): restore the loop state saved after `epoch_done` epochs.
+    ckpt = Checkpointer(cfg, out_dir, run_id)
+    epoch_done = 0
+    elapsed_prior = 0.0
+    if resume is not None:
+        meta, arrays = load_checkpoint(resume)
+        check_resume(meta, "scaffold", run_id)
+        rng.bit_generator.state = meta["rng"]
+        g = GraphStore.from_arrays(arrays)
+        frontier = arrays["frontier"].tolist()
+        tick_epochs = arrays["tick_epochs"].tolist()
+        lockstep_run = int(meta["lockstep_run"])
+        ell_lock = int(meta["ell_lock"])
+        ts_epochs = meta["ts"]["ts_epochs"]
+        L_series = meta["ts"]["L_series"]
+        Sperc_series = meta["ts"]["Sperc_series"]
+        Sjuncw_series = meta["ts"]["Sjuncw_series"]
+        hubshare_series = meta["ts"]["hubshare_series"]
+        if junction_every:
+            junction_ts = meta["ts"]["junction"]
+        epoch_done = int(meta["epoch_done"])
+        elapsed_prior = float(meta["elapsed"])
+
+    # The tracker rebuilds itself from the graph on first use, so it needs no checkpoint state.
+    juncs = WindowIndegrees(g.core, int(aw_cfg["hops"])) if junction_every else None
 
     t0 = time.time()
 
-    for epoch in range(1, steps_total + 1):
+    for epoch in range(epoch_done + 1, steps_total + 1):
         cand = _build_candidates(cfg, g, frontier, epoch)
 
         active = induced_active_set(cfg, g, frontier, epoch)
         preferred_existing = _choose_preferred_existing(rng, cfg, g, active, frontier, epoch)
 
         choices = choose_targets(rng, cand, allow_new=True, g=glue_params, preferred_existing=preferred_existing)
+        prev_frontier = list(frontier)
 
         for i, (kind, target) in enumerate(choices):
             u = frontier[i]
@@ -182,6 +226,9 @@ def run_single(cfg: Dict[str, Any], N: int, n: float, seed: int) -> None:
                 g.add_edge(u, v, w=1.0, epoch=epoch)
                 frontier[i] = v
 
+        if juncs is not None:
+            juncs.add_edges(zip(prev_frontier, frontier))
+
         if epoch in snapshot_epochs:
             write_edges_csv(out_dir / f"SNAPSHOT_{run_id}_edges_epoch{epoch}.csv", g.edges)
             write_nodes_json(out_dir / f"SNAPSHOT_{run_id}_nodes_epoch{epoch}.json", g)
@@ -203,9 +250,16 @@ def run_single(cfg: Dict[str, Any], N: int, n: float, seed: int) -> None:
                 if len(tick_epochs) == 0 or (epoch - tick_epochs[-1] >= 5):
                     tick_epochs.append(epoch)
 
+            if juncs is not None and (epoch - burn_in - 1) % junction_every == 0:
+                juncs.query(epoch, frontier)
+                junction_ts["epochs"].append(int(epoch))
+                junction_ts["S_junc_w"].append(juncs.s_junc_w(beta_junc))
+                junction_ts["hubshare"].append(juncs.hubshare())
+                junction_ts["max_indegree"].append(int(juncs.max_indegree()))
+
             if ts_enabled and epoch in bin_ends:
                 active_now = induced_active_set(cfg, g, frontier, epoch)
-                indegs = [g.nodes[v].indeg for v in active_now]
+                indegs = g.core.indeg_of(np.asarray(active_now, dtype=np.int64)).tolist()
                 sperc_val = s_perc(g, active_now)
                 sjw_val = weighted_junction_stat(indegs, beta_junc)
                 hub = hubshare_fn(indegs)
@@ -218,10 +272,36 @@ def run_single(cfg: Dict[str, Any], N: int, n: float, seed: int) -> None:
                 Sjuncw_series.append(float(sjw_val))
                 hubshare_series.append(float(hub))
 
-    elapsed = time.time() - t0
+        if ckpt.due(epoch, steps_total):
+            arrays = g.to_arrays()
+            arrays["frontier"] = np.array(frontier, dtype=np.int64)
+            arrays["tick_epochs"] = np.array(tick_epochs, dtype=np.int64)
+            ckpt.save({
+                "engine": "scaffold",
+                "run_id": run_id,
+                "cfg": cfg,
+                "N": int(N),
+                "n": float(n),
+                "seed": int(seed),
+                "epoch_done": int(epoch),
+                "elapsed": elapsed_prior + time.time() - t0,
+                "rng": rng.bit_generator.state,
+                "lockstep_run": int(lockstep_run),
+                "ell_lock": int(ell_lock),
+                "ts": {
+                    "ts_epochs": ts_epochs,
+                    "L_series": L_series,
+                    "Sperc_series": Sperc_series,
+                    "Sjuncw_series": Sjuncw_series,
+                    "hubshare_series": hubshare_series,
+                    "junction": junction_ts,
+                },
+            }, arrays)
+
+    elapsed = elapsed_prior + time.time() - t0
 
     active_final = induced_active_set(cfg, g, frontier, steps_total)
-    indegs_final = [g.nodes[v].indeg for v in active_final]
+    indegs_final = g.core.indeg_of(np.asarray(active_final, dtype=np.int64)).tolist()
     sperc_final = s_perc(g, active_final)
     sjw_final = weighted_junction_stat(indegs_final, beta_junc)
     hub_final = hubshare_fn(indegs_final)
@@ -235,7 +315,7 @@ def run_single(cfg: Dict[str, Any], N: int, n: float, seed: int) -> None:
             if uu in aset and vv in aset:
                 adj[uu].add(vv)
                 adj[vv].add(uu)
-        clust_val = clustering_coefficient_undirected(adj, sample=500)
+        clust_val = clustering_coefficient_undirected(adj, sample=int(clust_sample) if clust_sample else None)
 
     Q = compute_Q_clock(tick_epochs)
     L_val = float("inf") if Q == float("inf") else (Q / (math.sqrt(N) if N > 0 else 1.0))
@@ -273,6 +353,15 @@ def run_single(cfg: Dict[str, Any], N: int, n: float, seed: int) -> None:
         "elapsed_seconds": float(elapsed),
     }
 
+    if juncs is not None:
+        # Early anomaly detection: first logged epoch at which each end-of-run flag condition held
+        junction_ts["first_star_collapse_epoch"] = next(
+            (e for e, h in zip(junction_ts["epochs"], junction_ts["hubshare"]) if h >= hub_star), None)
+        junction_ts["first_runaway_hubbing_epoch"] = next(
+            (e for e, k in zip(junction_ts["epochs"], junction_ts["max_indegree"]) if k > int(max_indeg_factor * N)),
+            None)
+        metrics_obj["junction_timeseries"] = junction_ts
+
     if ts_enabled:
         metrics_obj["timeseries"] = {
             "ts_epochs": ts_epochs,
@@ -305,12 +394,22 @@ def run_single(cfg: Dict[str, Any], N: int, n: float, seed: int) -> None:
 
     write_json(out_dir / f"RUN_CONFIG_{run_id}.json", cfg_obj)
     write_json(out_dir / f"RUN_METRICS_{run_id}.json", metrics_obj)
+    ckpt.finish()
+
+
+def resume_from_checkpoint(path: Path) -> None:
+    """Continue the single run saved in a CHECKPOINT_*.npz file (either engine)."""
+    meta, _ = load_checkpoint(path)
+    run_single(meta["cfg"], int(meta["N"]), float(meta["n"]), int(meta["seed"]), resume=Path(path))
 
 
 def run_from_config(cfg: Dict[str, Any]) -> None:
     validate(cfg)
     seeds = resolve_seeds(cfg["seeds"])
     n_vals = resolve_n_values(cfg["scan"])
+    if _is_v_glue(cfg) and batch_cfg(cfg)["enabled"]:
+        run_sweep_v_glue(_sweep_points(cfg), size=batch_cfg(cfg)["size"])
+        return
     for N in cfg["sizes"]:
         for n in n_vals:
             for seed in seeds:
@@ -319,3 +418,34 @@ def run_from_config(cfg: Dict[str, Any]) -> None:
 
 def scan_from_config(cfg: Dict[str, Any]) -> None:
     run_from_config(cfg)
+
+
+def _is_v_glue(cfg: Dict[str, Any]) -> bool:
+    engine = cfg.get("engine", {}) or {}
+    return engine.get("mode", "scaffold") == "v_glue"
+
+
+def _sweep_points(cfg: Dict[str, Any]) -> List[SweepPoint]:
+    seeds = resolve_seeds(cfg["seeds"])
+    n_vals = resolve_n_values(cfg["scan"])
+    return [
+        SweepPoint(cfg=cfg, N=int(N), n=float(n), seed=int(seed))
+        for N in cfg["sizes"]
+        for n in n_vals
+        for seed in seeds
+    ]
+
+
+def sweep_from_configs(cfgs: List[Dict[str, Any]], size: int | None = None) -> None:
+    """
+    Run several configs as one job: every nospace v_glue grid point (any N, n, W_coh, seed)
+    is stacked into a single vectorised sweep; other points run one by one.
+    """
+    points: List[SweepPoint] = []
+    for cfg in cfgs:
+        validate(cfg)
+        if _is_v_glue(cfg):
+            points.extend(_sweep_points(cfg))
+        else:
+            run_from_config(cfg)
+    run_sweep_v_glue(points, size=size)
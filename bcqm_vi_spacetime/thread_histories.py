@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+"""
+thread_histories.py (BCQM VI)
+
+Per-thread event histories (the last W_coh frontier events of each thread) for the island/bundle
+observables, with their pairwise overlaps maintained incrementally.
+
+The histories are an N x W_coh integer ring buffer: all threads advance together, so one head
+pointer serves every row and push() writes the whole frontier vector as one column (the column it
+overwrites holds the events leaving the windows). lists gives them back oldest-first.
+
+ThreadHistories keeps, next to the histories themselves:
+- per thread, the multiplicity of each event in its window (a thread can revisit an event),
+- an inverted index event -> threads whose window holds it,
+- the N x N matrix of shared-event counts |H_i & H_j| and the set sizes |H_i|.
+push(events) moves every window by one event; only events entering or leaving a thread's set
+touch the index and the counts (O(threads sharing that event)), so overlap() reads the Jaccard
+matrix |H_i & H_j| / |H_i | H_j| in O(N^2) without rebuilding any set.
+
+Sparse mode (sparse=True) keeps the shared-event counts only for pairs that currently share an
+event, in a dict keyed by i * N + j (i < j), instead of the dense N x N counts. pairs() then lists
+just those pairs with their overlaps, so memory and bundle detection scale with the number of
+overlapping pairs rather than N^2; the bundles are the same (pairs with zero overlap never link
+at w* >= 0). The dense mode builds the same pair list from the matrix.
+
+YAML:
+  space:
+    bundle_overlap: sparse    # dense (default) | sparse
+"""
+
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+
+class ThreadHistories:
+    def __init__(self, N: int, W: int, init_ids: List[int], sparse: bool = False) -> None:
+        self.N = int(N)
+        self.W = int(W)
+        self.sparse = bool(sparse)
+        self.buf = np.zeros((self.N, max(1, self.W)), dtype=np.int64)
+        self.head = 0  # next column to write
+        self.length = 0  # events per thread currently held (<= W)
+        self._mult: List[Dict[int, int]] = [{} for _ in range(self.N)]
+        self._index: Dict[int, Dict[int, None]] = {}
+        # Plain nested lists: per-element updates on Python ints are much cheaper than on an ndarray
+        self.inter: List[List[int]] = [] if self.sparse else [[0] * self.N for _ in range(self.N)]
+        self._pair: Dict[int, int] = {}  # sparse mode: i * N + j (i < j) -> shared events
+        self.size: List[int] = [0] * self.N
+        self.push(init_ids)
+
+    def __len__(self) -> int:
+        return self.N
+
+    @property
+    def lists(self) -> List[List[int]]:
+        """Per-thread histories, oldest event first."""
+        W = self.buf.shape[1]
+        cols = [(self.head - self.length + k) % W for k in range(self.length)]
+        return self.buf[:, cols].tolist()
+
+    def _enter(self, i: int, e: int) -> None:
+        holders = self._index.get(e)
+        if holders is None:
+            holders = self._index[e] = {}
+        if self.sparse:
+            pair = self._pair
+            N = self.N
+            for j in holders:
+                k = i * N + j if i < j else j * N + i
+                pair[k] = pair.get(k, 0) + 1
+        else:
+            inter = self.inter
+            row = inter[i]
+            for j in holders:
+                row[j] += 1
+                inter[j][i] += 1
+        holders[i] = None
+        self.size[i] += 1
+
+    def _leave(self, i: int, e: int) -> None:
+        holders = self._index[e]
+        del holders[i]
+        if self.sparse:
+            pair = self._pair
+            N = self.N
+            for j in holders:
+                k = i * N + j if i < j else j * N + i
+                c = pair[k] - 1
+                if c:
+                    pair[k] = c
+                else:
+                    del pair[k]
+        else:
+            inter = self.inter
+            row = inter[i]
+            for j in holders:
+                row[j] -= 1
+                inter[j][i] -= 1
+        if not holders:
+            del self._index[e]
+        self.size[i] -= 1
+
+    def push(self, events: List[int]) -> None:
+        """Append events[i] to thread i's history, dropping its oldest event beyond W."""
+        new = [int(e) for e in events]
+        buf = self.buf
+        W = buf.shape[1]
+        old = buf[:, self.head].tolist() if self.length == W else None
+        buf[:, self.head] = new
+        self.head = (self.head + 1) % W
+        if old is None:
+            self.length += 1
+        for i, mult in enumerate(self._mult):
+            e = new[i]
+            c = mult.get(e, 0)
+            mult[e] = c + 1
+            if c == 0:
+                self._enter(i, e)
+            if old is not None:
+                e = old[i]
+                c = mult[e] - 1
+                if c:
+                    mult[e] = c
+                else:
+                    del mult[e]
+                    self._leave(i, e)
+
+    def pairs(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(i, j, overlap) for the thread pairs i < j sharing at least one event, row-major order."""
+        if not self.sparse:
+            ov = self.overlap()
+            pi, pj = np.triu_indices(self.N, k=1)
+            pv = ov[pi, pj]
+            keep = pv > 0
+            return pi[keep], pj[keep], pv[keep]
+        keys = np.fromiter(self._pair.keys(), dtype=np.int64, count=len(self._pair))
+        cnt = np.fromiter(self._pair.values(), dtype=np.int64, count=len(self._pair))
+        order = np.argsort(keys)
+        keys, cnt = keys[order], cnt[order]
+        pi, pj = keys // self.N, keys % self.N
+        size = np.array(self.size, dtype=np.int64)
+        return pi, pj, cnt / (size[pi] + size[pj] - cnt)
+
+    def overlap(self) -> np.ndarray:
+        """Symmetric matrix of |H_i & H_j| / |H_i | H_j| over the history sets (zero diagonal)."""
+        if self.sparse:
+            ov = np.zeros((self.N, self.N))
+            pi, pj, pv = self.pairs()
+            ov[pi, pj] = pv
+            ov[pj, pi] = pv
+            return ov
+        inter = np.array(self.inter, dtype=np.int64).reshape(self.N, self.N)
+        size = np.array(self.size, dtype=np.int64)
+        uni = size[:, None] + size[None, :] - inter
+        ov = np.zeros((self.N, self.N))
+        np.divide(inter, uni, out=ov, where=uni > 0)
+        np.fill_diagonal(ov, 0.0)
+        return ov
+
+    @classmethod
+    def from_lists(cls, W: int, lists: List[List[int]], sparse: bool = False) -> "ThreadHistories":
+        """Rebuild from saved histories (checkpoint entries "hist_*")."""
+        h = cls(len(lists), W, [x[0] for x in lists], sparse=sparse)
+        for k in range(1, len(lists[0]) if lists else 0):
+            h.push([x[k] for x in lists])
+        return h
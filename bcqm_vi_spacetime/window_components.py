@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+"""
+window_components.py (BCQM VI)
+
+Connected components of the active window V_active(t) = {created_at >= t - W_coh} + frontiers,
+tracked incrementally so S_perc and the largest-component size can be read at every tick.
+
+Scheme (block rebuilds + union-find):
+- Every `block` ticks (default isqrt(W_coh)) the tracker is rebuilt from the window adjacency.
+  Events that stay in the window for the whole block ("stable": created_at >= block end - 1 -
+  W_coh, and every event created during the block) go into a union-find with component sizes and
+  a running maximum; edges between stable events are unions, so they only ever merge.
+- The remaining events ("transient": they expire within the block unless pinned as frontiers)
+  and every edge touching one are kept aside. A query overlays the transient events and edges
+  that are still alive at t on the union-find roots, at O(transient) cost.
+So a query costs O(W_coh^(1/2) * N) and a rebuild O(window), once per block, instead of a DFS over
+the window (after a full edge scan) per sample. Results equal EventGraph.s_perc / the size of
+EventGraph.largest_component_nodes on v_active(t, W_coh, frontiers).
+
+YAML:
+  output:
+    sperc_every: 1     # log S_perc / comp_size every k measured ticks (0 = off, default)
+"""
+
+import math
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from .event_graph import EventGraph
+
+
+class WindowComponents:
+    def __init__(self, g: EventGraph, W_coh: int, block: Optional[int] = None) -> None:
+        self.g = g
+        self.W = int(W_coh)
+        self.block = max(1, min(self.W + 1, int(block) if block else math.isqrt(max(1, self.W))))
+        self.n_rebuilds = 0
+        self._dirty = True
+        self._t0 = 0
+        self._end = 0
+        self._tau = 0
+        self._seen = 0
+        self._parent: Dict[int, int] = {}
+        self._size: Dict[int, int] = {}
+        self._n_stable = 0
+        self._best = 0
+        self._transient: Dict[int, int] = {}  # eid -> created_at
+        self._tedges: List[Tuple[int, int]] = []
+
+    def _find(self, x: int) -> int:
+        parent = self._parent
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def _union(self, u: int, v: int) -> None:
+        ru, rv = self._find(u), self._find(v)
+        if ru == rv:
+            return
+        size = self._size
+        if size[ru] < size[rv]:
+            ru, rv = rv, ru
+        self._parent[rv] = ru
+        size[ru] += size.pop(rv)
+        if size[ru] > self._best:
+            self._best = size[ru]
+
+    def _add_node(self, eid: int, created_at: int) -> None:
+        if created_at >= self._tau:
+            self._parent[eid] = eid
+            self._size[eid] = 1
+            self._n_stable += 1
+            if self._best < 1:
+                self._best = 1
+        else:
+            self._transient[eid] = created_at
+
+    def _link(self, u: int, v: int) -> None:
+        parent = self._parent
+        if u in parent and v in parent:
+            self._union(u, v)
+        elif (u in parent or u in self._transient) and (v in parent or v in self._transient):
+            self._tedges.append((u, v))
+        else:
+            self._dirty = True  # edge to an event outside the tracked window
+
+    def _sync_nodes(self) -> None:
+        core = self.g.core
+        n = core.n_nodes
+        if self._seen < n:
+            ids = np.arange(max(self._seen, core.base), n, dtype=np.int64)
+            ids = ids[core.alive_of(ids)]
+            for eid, c in zip(ids.tolist(), core.created_at_of(ids).tolist()):
+                self._add_node(eid, c)
+            self._seen = n
+
+    def add_edges(self, pairs: Iterable[Tuple[int, int]]) -> None:
+        """Register edges just added to the graph (call after EventGraph.add_edge)."""
+        if self._dirty:
+            return
+        self._sync_nodes()
+        for u, v in pairs:
+            self._link(int(u), int(v))
+
+    def rebuild(self, t: int, frontiers: Iterable[int]) -> None:
+        g = self.g
+        active = g.v_active(t, self.W, frontiers)
+        adj = g._adj_undirected(active)
+        self._t0 = int(t)
+        self._end = self._t0 + self.block
+        self._tau = self._end - 1 - self.W
+        self._parent, self._size, self._n_stable, self._best = {}, {}, 0, 0
+        self._transient, self._tedges = {}, []
+        ids = np.fromiter(active, dtype=np.int64, count=len(active))
+        for eid, c in zip(ids.tolist(), g.core.created_at_of(ids).tolist()):
+            self._add_node(eid, c)
+        self._seen = g.core.n_nodes
+        self._dirty = False
+        for u in active:
+            for v in adj[u]:
+                if u < v:
+                    self._link(u, v)
+        self.n_rebuilds += 1
+
+    def query(self, t: int, frontiers: Iterable[int]) -> Tuple[int, int]:
+        """(|V_active(t)|, size of its largest component)."""
+        frontiers = list(frontiers)
+        t = int(t)
+        if self._dirty or not (self._t0 <= t < self._end):
+            self.rebuild(t, frontiers)
+        else:
+            self._sync_nodes()
+        cutoff = t - self.W
+        fset: Set[int] = set(frontiers)
+        alive = {e for e, c in self._transient.items() if c >= cutoff or e in fset}
+        n_active = self._n_stable + len(alive)
+        best = self._best
+        if alive and best < 1:
+            best = 1
+        if self._tedges:
+            parent = self._parent
+            op: Dict[int, int] = {}
+            osz: Dict[int, int] = {}
+
+            def root(x: int) -> int:
+                while op[x] != x:
+                    op[x] = op[op[x]]
+                    x = op[x]
+                return x
+
+            for u, v in self._tedges:
+                ends = []
+                for x in (u, v):
+                    if x in parent:
+                        k = self._find(x)
+                        if k not in op:
+                            op[k] = k
+                            osz[k] = self._size[k]
+                    elif x in alive:
+                        k = x
+                        if k not in op:
+                            op[k] = k
+                            osz[k] = 1
+                    else:
+                        break
+                    ends.append(k)
+                else:
+                    ru, rv = root(ends[0]), root(ends[1])
+                    if ru != rv:
+                        if osz[ru] < osz[rv]:
+                            ru, rv = rv, ru
+                        op[rv] = ru
+                        osz[ru] += osz.pop(rv)
+                        if osz[ru] > best:
+                            best = osz[ru]
+        return n_active, best
+
+    def s_perc(self, t: int, frontiers: Iterable[int]) -> float:
+        n_active, best = self.query(t, frontiers)
+        return best / float(n_active) if n_active else 0.0
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+"""
+window_indegrees.py (BCQM VI)
+
+Indegree histogram of the active window V_active(t) = {created_at >= t - W_coh} + frontiers,
+maintained incrementally so the junction statistics can be read at every tick.
+
+WindowIndegrees(core, W_coh) works on the columnar GraphCore shared by EventGraph (v_glue) and
+GraphStore (scaffold, recency active window with W_coh = hops) and keeps:
+- hist: indegree k -> number of window events with indegree k (zero counts are dropped),
+- the indegree of each window event and the total indegree of the window.
+Events enter when they are created (synced from the core in id order, i.e. creation order) and
+leave at a query once they are older than t - W_coh and no longer a frontier; add_edges(pairs)
+re-reads the indegree of each edge's target and moves it between bins. A query therefore costs
+O(events entering or leaving + edges added), and the statistics are read from hist in
+O(distinct indegrees):
+- S_junc_w = (sum over k >= 2 of hist[k] * (1 if k == 2 else k^beta)) / |V_active|,
+- hubshare = max indegree / total indegree, max_indegree.
+hubshare and max_indegree equal EventGraph.hubshare / max_indegree on v_active(t, W_coh,
+frontiers); S_junc_w equals EventGraph.s_junc_w up to rounding (summed per indegree bin, in
+ascending order, instead of per event). The tracker rebuilds itself from the core on first use,
+after a query at an earlier tick, or if events arrive out of creation order, so it needs no
+checkpoint state (a resumed run logs the same values).
+
+YAML:
+  output:
+    junction_every: 1     # v_glue: log S_junc_w / hubshare / max_indegree every k measured ticks
+                          # scaffold (recency active window): every k measured epochs (0 = off, default)
+"""
+
+from collections import deque
+from typing import Deque, Dict, Iterable, Optional, Set, Tuple
+
+import numpy as np
+
+from .graph_core import GraphCore
+
+
+class WindowIndegrees:
+    def __init__(self, core: GraphCore, W_coh: int) -> None:
+        self.core = core
+        self.W = int(W_coh)
+        self.hist: Dict[int, int] = {}
+        self.total = 0
+        self.n_rebuilds = 0
+        self._k: Dict[int, int] = {}  # window event -> indegree
+        self._queue: Deque[Tuple[int, int]] = deque()  # (created_at, eid) of unexpired events
+        self._pinned: Set[int] = set()  # events older than the window kept as frontiers
+        self._t: Optional[int] = None
+        self._seen = 0
+        self._dirty = True
+
+    def __len__(self) -> int:
+        return len(self._k)
+
+    def _bin_add(self, k: int) -> None:
+        self.hist[k] = self.hist.get(k, 0) + 1
+        self.total += k
+
+    def _bin_remove(self, k: int) -> None:
+        c = self.hist[k] - 1
+        if c:
+            self.hist[k] = c
+        else:
+            del self.hist[k]
+        self.total -= k
+
+    def _drop(self, eid: int) -> None:
+        self._bin_remove(self._k.pop(eid))
+
+    def _sync_nodes(self) -> None:
+        core = self.core
+        n = core.n_nodes
+        if self._seen < n:
+            ids = np.arange(max(self._seen, core.base), n, dtype=np.int64)
+            ids = ids[core.alive_of(ids)]
+            queue = self._queue
+            for eid, c, k in zip(ids.tolist(), core.created_at_of(ids).tolist(), core.indeg_of(ids).tolist()):
+                if queue and c < queue[-1][0]:
+                    self._dirty = True  # created out of time order: expiry needs a rebuild
+                queue.append((c, eid))
+                self._k[eid] = k
+                self._bin_add(k)
+            self._seen = n
+
+    def add_edges(self, pairs: Iterable[Tuple[int, int]]) -> None:
+        """Register edges just added to the graph (re-reads the indegree of each target)."""
+        if self._dirty:
+            return
+        self._sync_nodes()
+        members = self._k
+        dst = [int(v) for _, v in pairs if int(v) in members]
+        if not dst:
+            return
+        for v, k in zip(dst, self.core.indeg_of(np.array(dst, dtype=np.int64)).tolist()):
+            old = members[v]
+            if k != old:
+                self._bin_remove(old)
+                self._bin_add(k)
+                members[v] = k
+
+    def rebuild(self, t: int, frontiers: Iterable[int]) -> None:
+        core = self.core
+        cutoff = int(t) - self.W
+        recent = core.ids_created_since(cutoff)
+        self.hist, self.total, self._k = {}, 0, {}
+        created = core.created_at_of(recent)
+        order = np.argsort(created, kind="stable")
+        self._queue = deque(zip(created[order].tolist(), recent[order].tolist()))
+        for eid, k in zip(recent.tolist(), core.indeg_of(recent).tolist()):
+            self._k[eid] = k
+            self._bin_add(k)
+        self._pinned = set()
+        self._seen = core.n_nodes
+        self._dirty = False
+        self._pin(frontiers)
+        self._t = int(t)
+        self.n_rebuilds += 1
+
+    def _pin(self, frontiers: Iterable[int]) -> None:
+        """Frontiers outside the window stay in it while they are frontiers."""
+        old = [int(e) for e in frontiers if int(e) not in self._k]
+        if old:
+            arr = np.array(old, dtype=np.int64)
+            arr = arr[self.core.alive_of(arr)]
+            for eid, k in zip(arr.tolist(), self.core.indeg_of(arr).tolist()):
+                self._k[eid] = k
+                self._bin_add(k)
+                self._pinned.add(eid)
+
+    def query(self, t: int, frontiers: Iterable[int]) -> int:
+        """Bring the histogram to V_active(t) for these frontiers; returns |V_active(t)|."""
+        frontiers = list(frontiers)
+        t = int(t)
+        if not self._dirty and self._t is not None and t >= self._t:
+            self._sync_nodes()
+        if self._dirty or self._t is None or t < self._t:
+            self.rebuild(t, frontiers)
+            return len(self._k)
+        cutoff = t - self.W
+        fset = {int(e) for e in frontiers}
+        queue = self._queue
+        while queue and queue[0][0] < cutoff:
+            eid = queue.popleft()[1]
+            if eid in fset:
+                self._pinned.add(eid)
+            else:
+                self._drop(eid)
+        for eid in [e for e in self._pinned if e not in fset]:
+            self._pinned.discard(eid)
+            self._drop(eid)
+        self._pin(frontiers)
+        self._t = t
+        return len(self._k)
+
+    # ---- junction statistics (current histogram) ----
+    def s_junc_w(self, beta: float = 1.5) -> float:
+        n = len(self._k)
+        if n == 0:
+            return 0.0
+        b = float(beta)
+        hist = self.hist
+        s = 0.0
+        # ascending indegree: the sum does not depend on the order the bins were created in
+        for k in sorted(hist):
+            if k >= 2:
+                s += hist[k] * (1.0 if k == 2 else float(k) ** b)
+        return s / float(n)
+
+    def max_indegree(self) -> int:
+        return max(self.hist) if self.hist else 0
+
+    def hubshare(self) -> float:
+        if not self.hist or self.total <= 0:
+            return 0.0
+        return self.max_indegree() / float(self.total)
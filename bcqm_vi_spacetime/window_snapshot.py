@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+"""
+window_snapshot.py (BCQM VI)
+
+One-pass view of the active window at a sampling tick, shared by the timeseries records and the
+end-of-run observables of run_single_v_glue.
+
+WindowSnapshot(g, t, W_coh, frontiers, histories) takes V_active once and reads, on first use and
+at most once each:
+- from the graph's memoized view of V_active (g.view, component_view.py): the indegree array of
+  the active events (set order), the undirected window adjacency, component labels and the
+  largest component, and the CSR views of the largest component (ball growth / spectral
+  dimension kernels) and of the whole window (triangle counts for the clustering coefficient),
+- the N x N thread-history overlap matrix (Jaccard overlap of the last W_coh events per thread,
+  read from the incrementally maintained ThreadHistories counts).
+Direct EventGraph calls on the same active set at the same graph version share that view.
+S_perc, S_junc_w, hubshare, max_indegree, clustering, ball growth / spectral dimension and the
+bundle statistics for any number of w* thresholds are then read from these, so one sample costs
+one adjacency build and one overlap matrix instead of one per observable (and per w*).
+Values are identical to the per-call EventGraph methods and _bundles_from_histories.
+
+Bundles at every threshold come from one sweep (bundle_sweep): the pairwise overlaps are sorted
+once and merged from high to low with a union-find, which yields the whole step curve
+F_max(w*) / N_bund(w*) plus the full bundle statistics at any requested thresholds.
+Curve format (islands.F_max_curve):
+  {"w": [w_1 > w_2 > ... > w_K], "F_max": [K + 1 values], "N_bund": [K + 1 values]}
+Bundles link thread pairs with overlap > w*, so at threshold w* the value is entry
+k = #{b in w : b > w*}; entry 0 (w* >= w_1) is all singletons. A final breakpoint at 0.0 covers
+w* < 0, where every pair is linked.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from .csr_geometry import CSRGraph
+from .event_graph import Adjacency, EventGraph, _hubshare_of, _s_junc_of
+from .thread_histories import ThreadHistories
+
+
+def _bundle_stats(sizes: List[int], N: int) -> Dict[str, Any]:
+    sizes = sorted(sizes, reverse=True)
+    fmax = (sizes[0] / float(N)) if sizes else 0.0
+    histo: Dict[str, int] = {}
+    for sz in sizes:
+        histo[str(sz)] = histo.get(str(sz), 0) + 1
+    return {"F_max": fmax, "bundle_sizes": sizes, "bundle_hist": histo}
+
+
+def sweep_pairs(N: int, pi: np.ndarray, pj: np.ndarray, pv: np.ndarray,
+                queries: Sequence[float] = ()) -> Tuple[Dict[str, List], Dict[float, Dict[str, Any]]]:
+    """
+    Union-find sweep over thread pairs (pi[k], pj[k]) with overlap pv[k] > 0, high to low.
+    Returns (curve, {w: bundle stats at w for w in queries}); see the module docstring.
+    """
+    parent = list(range(N))
+    size = [1] * N
+
+    def find(x: int) -> int:
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    order = np.argsort(-pv, kind="stable")
+    vs = pv[order].tolist()
+    us = pi[order].tolist()
+    ws = pj[order].tolist()
+    qs = sorted(set(float(w) for w in queries), reverse=True)
+    by_w: Dict[float, Dict[str, Any]] = {}
+    best = 1 if N else 0
+    n_bund = N
+    curve: Dict[str, List] = {"w": [], "F_max": [best / float(N) if N else 0.0], "N_bund": [n_bund]}
+
+    def record(v: float) -> None:
+        # queries w >= v do not link pairs with overlap v (links need overlap > w)
+        while qs and qs[0] >= v:
+            by_w[qs.pop(0)] = _bundle_stats([size[r] for r in range(N) if parent[r] == r], N)
+
+    k = 0
+    while k < len(vs):
+        v = vs[k]
+        record(v)
+        merged = False
+        while k < len(vs) and vs[k] == v:
+            ru, rv = find(us[k]), find(ws[k])
+            k += 1
+            if ru != rv:
+                if size[ru] < size[rv]:
+                    ru, rv = rv, ru
+                parent[rv] = ru
+                size[ru] += size[rv]
+                best = max(best, size[ru])
+                n_bund -= 1
+                merged = True
+        if merged:
+            curve["w"].append(float(v))
+            curve["F_max"].append(best / float(N))
+            curve["N_bund"].append(n_bund)
+    # pairs with zero overlap link only below w* = 0
+    record(0.0)
+    if n_bund > 1:
+        root = find(0)
+        for r in range(N):
+            parent[r] = root
+        size[root] = N
+        curve["w"].append(0.0)
+        curve["F_max"].append(1.0)
+        curve["N_bund"].append(1)
+    record(float("-inf"))
+    return curve, by_w
+
+
+def bundle_sweep(ov: np.ndarray, queries: Sequence[float] = ()) -> Tuple[Dict[str, List], Dict[float, Dict[str, Any]]]:
+    """sweep_pairs over the upper triangle of an N x N overlap matrix."""
+    N = int(ov.shape[0])
+    pi, pj = np.triu_indices(N, k=1)
+    pv = ov[pi, pj]
+    keep = pv > 0
+    return sweep_pairs(N, pi[keep], pj[keep], pv[keep], queries)
+
+
+def bundles_from_overlap(ov: np.ndarray, w_star: float) -> Dict[str, Any]:
+    """Bundles = connected components of the thread graph with edges where overlap > w_star."""
+    return bundle_sweep(ov, (w_star,))[1][float(w_star)]
+
+
+def curve_at(curve: Dict[str, List], w_star: float) -> Tuple[float, int]:
+    """(F_max, N_bund) of a bundle curve at threshold w_star."""
+    k = sum(1 for b in curve["w"] if b > w_star)
+    return curve["F_max"][k], curve["N_bund"][k]
+
+
+class WindowSnapshot:
+    def __init__(self, g: EventGraph, t: int, W_coh: int, frontiers: List[int],
+                 histories: Optional[ThreadHistories] = None) -> None:
+        self.g = g
+        self.t = int(t)
+        self.active: Set[int] = g.v_active(t, W_coh, frontiers)
+        self.histories = histories
+        self.view = g.view(self.active)
+        self._overlap: Optional[np.ndarray] = None
+        self._sweeps: Dict[Tuple[float, ...], Tuple[Dict[str, List], Dict[float, Dict[str, Any]]]] = {}
+
+    # ---- event window ----
+    @property
+    def indeg(self) -> np.ndarray:
+        return self.view.indeg
+
+    @property
+    def adj(self) -> Adjacency:
+        return self.view.adj
+
+    @property
+    def labels(self) -> Dict[int, int]:
+        return self.view.labels
+
+    @property
+    def largest_component(self) -> Set[int]:
+        return self.view.largest_component
+
+    @property
+    def csr(self) -> CSRGraph:
+        return self.view.csr
+
+    @property
+    def window_csr(self) -> CSRGraph:
+        return self.view.window_csr
+
+    def s_perc(self) -> float:
+        if not self.active:
+            return 0.0
+        return len(self.largest_component) / float(len(self.active))
+
+    def s_junc_w(self, beta: float = 1.5) -> float:
+        return _s_junc_of(self.indeg, beta)
+
+    def hubshare(self) -> float:
+        return _hubshare_of(self.indeg)
+
+    def max_indegree(self) -> int:
+        return int(self.indeg.max()) if self.indeg.size else 0
+
+    def clustering(self, sample: Optional[int] = 500) -> float:
+        if sample is not None and len(self.active) > sample:
+            return self.g.clustering_coeff(self.active, sample=sample, adj=self.adj)
+        return self.g.clustering_coeff(self.active, sample=sample, csr=self.window_csr)
+
+    def ball_growth_profile(self, **kwargs) -> Dict[str, object]:
+        return self.g.ball_growth_profile(self.active, adj=self.adj, comp=self.largest_component, csr=self.csr,
+                                          **kwargs)
+
+    def estimate_spectral_dimension(self, **kwargs) -> Dict[str, object]:
+        if kwargs.get("method", "walk") != "walk":
+            kwargs["csr"] = self.csr
+        return self.g.estimate_spectral_dimension(self.active, adj=self.adj, comp=self.largest_component, **kwargs)
+
+    def spectral_density_kpm(self, **kwargs) -> Dict[str, object]:
+        return self.g.spectral_density_kpm(self.active, adj=self.adj, comp=self.largest_component, csr=self.csr,
+                                           **kwargs)
+
+    # ---- thread histories ----
+    @property
+    def overlap(self) -> np.ndarray:
+        if self._overlap is None:
+            self._overlap = self.histories.overlap() if self.histories is not None else np.zeros((0, 0))
+        return self._overlap
+
+    def bundle_sweep(self, queries: Sequence[float] = ()) -> Tuple[Dict[str, List], Dict[float, Dict[str, Any]]]:
+        key = tuple(sorted(set(float(w) for w in queries)))
+        if key not in self._sweeps:
+            h = self.histories
+            if h is None:
+                self._sweeps[key] = bundle_sweep(self.overlap, key)
+            else:
+                self._sweeps[key] = sweep_pairs(len(h), *h.pairs(), queries=key)
+        return self._sweeps[key]
+
+    def bundle_curve(self) -> Dict[str, List]:
+        return self.bundle_sweep()[0]
+
+    def bundles(self, w_star: float) -> Dict[str, Any]:
+        return self.bundle_sweep((w_star,))[1][float(w_star)]